@@ -3,13 +3,24 @@
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 from pathlib import Path
+import re
 
 from app.core.config import get_config
 from app.shared.services.session_service import SessionService
 from app.shared.services.storage_service import StorageService
 from app.shared.services.audio_service import AudioService
+from app.shared.services.feature_store_service import FeatureStoreService
+from app.shared.services.job_service import JobService
 from app.plugins.base.plugin_manager import PluginManager
-from app.core.exceptions import SessionNotFoundException, SessionExpiredException
+from app.core.exceptions import SessionNotFoundException, SessionExpiredException, PluginNotFoundException
+
+# Dateinamen von Segmenten, die bei Bedarf erzeugt werden können
+SEGMENT_FILENAME_PATTERN = re.compile(r'(?P<base>[A-Za-z0-9-]+)_segment_(?P<index>\d+)\.wav')
+WINDOW_FILENAME_PATTERN = re.compile(
+    r'(?P<base>[A-Za-z0-9-]+)_window_(?P<start>\d+)_(?P<end>\d+)_(?P<quality>[a-z]+)\.wav'
+)
+# Plugin, das die Segmente schneidet (Segment-Länge und Analyse-Fenster)
+AUDIO_FEEDBACK_PLUGIN = "audio-feedback"
 
 def create_app(config_name: str = None):
     """Factory Function zur App-Erstellung.
@@ -48,10 +59,25 @@ def create_app(config_name: str = None):
     storage_service = StorageService(
         base_path=str(app.config['UPLOAD_FOLDER'])
     )
+    # Datei-Hashes nur so lange merken wie die Session lebt
+    session_service.add_cleanup_listener(storage_service.forget_session)
     
     audio_service = AudioService(
-        target_sr=app.config['AUDIO_TARGET_SR']
+        target_sr=app.config['AUDIO_TARGET_SR'],
+        stream_block_sec=app.config['AUDIO_STREAM_BLOCK_SEC']
+    )
+    
+    feature_store = FeatureStoreService(
+        base_path=str(app.config['FEATURE_STORE_PATH']),
+        max_bytes=app.config['FEATURE_STORE_MAX_MB'] * 1024 * 1024,
+        compact_interval=app.config['FEATURE_STORE_COMPACT_INTERVAL']
+    )
+    
+    job_service = JobService(
+        max_workers=app.config['JOB_WORKERS']
     )
+    # Jobs leben nur so lange wie ihre Session
+    session_service.add_cleanup_listener(job_service.purge_session)
     
     print(f"✅ Services initialisiert")
     
@@ -60,6 +86,8 @@ def create_app(config_name: str = None):
         'session_service': session_service,
         'storage_service': storage_service,
         'audio_service': audio_service,
+        'feature_store': feature_store,
+        'job_service': job_service,
         'config': config_class
     }
     
@@ -76,21 +104,25 @@ def create_app(config_name: str = None):
     app.plugin_manager = plugin_manager
     app.session_service = session_service
     app.storage_service = storage_service
+    app.audio_service = audio_service
+    app.feature_store = feature_store
+    app.job_service = job_service
     
     # Core API Routes registrieren
-    register_core_routes(app, session_service, storage_service, plugin_manager)
+    register_core_routes(app, session_service, storage_service, audio_service, plugin_manager)
     
     print(f"✅ MuDiKo KI Assistant bereit!")
     
     return app
 
-def register_core_routes(app, session_service, storage_service, plugin_manager):
+def register_core_routes(app, session_service, storage_service, audio_service, plugin_manager):
     """Registriert Core-API-Routes.
     
     Args:
         app: Flask app
         session_service: SessionService instance
         storage_service: StorageService instance
+        audio_service: AudioService instance
         plugin_manager: PluginManager instance
     """
     
@@ -143,6 +175,47 @@ def register_core_routes(app, session_service, storage_service, plugin_manager):
         success = session_service.end_session(session_id)
         return jsonify({"success": success})
     
+    def _export_segment_on_demand(session, filename: str):
+        """Erzeugt eine angefragte Segment-Datei lazy.
+        
+        Raster-Segmente heißen <rolle>_segment_<i>.wav, zugeordnete Fenster
+        <rolle>_window_<start>_<ende>_<stufe>.wav. Segment-Länge und
+        Analyse-Fenster kommen aus dem AudioFeedbackService, der die
+        Segmente auch für die Analyse schneidet.
+        
+        Args:
+            session: Session der Anfrage
+            filename: Angefragter Dateiname
+            
+        Returns:
+            Path zur Segment-Datei oder None
+        """
+        match = SEGMENT_FILENAME_PATTERN.fullmatch(filename) or WINDOW_FILENAME_PATTERN.fullmatch(filename)
+        if not match:
+            return None
+        
+        try:
+            feedback_service = plugin_manager.get_plugin(AUDIO_FEEDBACK_PLUGIN).feedback_service
+        except PluginNotFoundException:
+            return None
+        
+        base_filename = match.group('base')
+        source = next(
+            (f for f in storage_service.list_files(session.session_id) if f.startswith(f"{base_filename}.")),
+            None
+        )
+        if not source:
+            return None
+        
+        if match.re is WINDOW_FILENAME_PATTERN:
+            return feedback_service.export_window(
+                session.path, session.path / source, filename,
+                int(match.group('start')), int(match.group('end')), match.group('quality')
+            )
+        return feedback_service.export_segment(
+            session.path, session.path / source, base_filename, int(match.group('index'))
+        )
+    
     @app.route('/api/audio/<filename>')
     def serve_audio(filename):
         """Serviert Audio-Dateien (mit Session-Check)."""
@@ -164,6 +237,10 @@ def register_core_routes(app, session_service, storage_service, plugin_manager):
                 # Prüfe auch im segments Unterordner
                 file_path = storage_service.get_file_path(session_id, f"segments/{filename}")
             
+            if not file_path:
+                # Segmente werden erst bei Wiedergabe aus dem Original erzeugt
+                file_path = _export_segment_on_demand(session, filename)
+            
             if not file_path:
                 return jsonify({
                     "success": False, 
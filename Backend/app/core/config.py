@@ -27,6 +27,21 @@ class Config:
     AUDIO_TARGET_SR = 22050
     AUDIO_TARGET_LENGTH = 60
     AUDIO_SEGMENT_LENGTH = 8
+    AUDIO_STREAM_BLOCK_SEC = float(os.getenv('AUDIO_STREAM_BLOCK_SEC', '10'))  # Blockgröße der Streaming-Dekodierung
+    
+    # Parallele Segment-Analyse (Worker-Prozesse, <= 1 = seriell)
+    ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', str(os.cpu_count() or 1)))
+    
+    # Parallele Analyzer/Comparators innerhalb einer Analyse (Threads, <= 1 = seriell)
+    ANALYSIS_THREADS = int(os.getenv('ANALYSIS_THREADS', str(min(4, os.cpu_count() or 1))))
+    
+    # Asynchrone Analyse-Jobs (gleichzeitig laufende Jobs)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    
+    # Persistenter Feature Store (dekodiertes Audio + Segment-Features, überlebt Neustarts)
+    FEATURE_STORE_PATH = Path(os.getenv('FEATURE_STORE_PATH', str(UPLOAD_FOLDER / "feature_store")))
+    FEATURE_STORE_MAX_MB = int(os.getenv('FEATURE_STORE_MAX_MB', '2048'))
+    FEATURE_STORE_COMPACT_INTERVAL = int(os.getenv('FEATURE_STORE_COMPACT_INTERVAL', '3600'))  # 1 Stunde
     
     @classmethod
     def load_plugin_config(cls, plugin_name: str) -> dict:
@@ -54,6 +69,8 @@ class TestingConfig(Config):
     """Test-Konfiguration."""
     TESTING = True
     DEBUG = True
+    ANALYSIS_WORKERS = 1
+    ANALYSIS_THREADS = 1
 
 def get_config():
     """Gibt die Config basierend auf Environment zurück."""
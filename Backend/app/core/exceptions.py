@@ -16,6 +16,14 @@ class InvalidFileFormatException(MuDiKoException):
     """Ungültiges Dateiformat."""
     pass
 
+class AudioLimitExceededException(MuDiKoException):
+    """Audio-Datei überschreitet die erlaubten Grenzen (z.B. Dauer)."""
+    pass
+
+class InvalidQualityTierException(MuDiKoException):
+    """Unbekannte Qualitätsstufe für die Analyse."""
+    pass
+
 class PluginNotFoundException(MuDiKoException):
     """Plugin wurde nicht gefunden."""
     pass
@@ -23,3 +31,11 @@ class PluginNotFoundException(MuDiKoException):
 class PluginInitializationException(MuDiKoException):
     """Fehler beim Initialisieren eines Plugins."""
     pass
+
+class JobNotFoundException(MuDiKoException):
+    """Job wurde nicht gefunden."""
+    pass
+
+class JobCancelledException(MuDiKoException):
+    """Job wurde abgebrochen."""
+    pass
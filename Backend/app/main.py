@@ -5,7 +5,10 @@ Plugin-basierte Musikanalyse-Anwendung für Audio- und MIDI-Feedback.
 
 from app.core.app_factory import create_app
 
-app = create_app()
+# Worker-Prozesse der Segment-Analyse (spawn) importieren dieses Modul als
+# __mp_main__ und dürfen keine eigene App starten
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
     # Server auf allen Interfaces (0.0.0.0) und Port 5000 starten
@@ -0,0 +1,192 @@
+# Analysis Cache - Sessionübergreifender Cache für Dekodierung und Features
+#
+# Einträge werden über den SHA-256 des Uploads plus Pipeline-/Analyzer-Version
+# und Sample-Rate adressiert. Lädt eine zweite Session dieselbe Referenz hoch,
+# werden Dekodierung und Referenz-Features aus dem Cache bedient.
+#
+# Optional dient ein FeatureStoreService als persistente zweite Ebene:
+# Einträge überleben damit Neustarts, Treffer werden in den Speicher geholt.
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+class AnalysisCache:
+    """Thread-sicherer LRU-Cache mit Größenbeschränkung in Bytes."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, store=None):
+        """Initialisiert den Cache.
+
+        Args:
+            max_bytes: Maximale (geschätzte) Größe aller Einträge
+            store: Optionaler FeatureStoreService (persistente Ebene)
+        """
+        self.max_bytes = max_bytes
+        self.store = store
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Gibt einen Eintrag zurück (oder None) und markiert ihn als zuletzt genutzt.
+
+        Args:
+            key: Cache-Schlüssel
+
+        Returns:
+            Gecachter Wert oder None
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._load_from_store(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._put_memory(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Speichert einen Eintrag und verdrängt bei Bedarf die ältesten.
+
+        Arrays werden schreibgeschützt, da sie zwischen Sessions geteilt werden.
+
+        Args:
+            key: Cache-Schlüssel
+            value: Zu cachender Wert
+        """
+        if isinstance(value, np.ndarray) and value.flags.writeable:
+            value.flags.writeable = False
+
+        self._put_memory(key, value)
+        self._save_to_store(key, value)
+
+    def _put_memory(self, key: Hashable, value: Any):
+        """Legt einen Eintrag im Speicher ab (LRU-Verdrängung nach Bytes)."""
+        size = self._estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+
+    def clear(self):
+        """Leert den Cache."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    @staticmethod
+    def _store_key(key: Hashable) -> str:
+        """Serialisiert einen (Tuple-)Schlüssel für den Feature Store."""
+        return json.dumps(key, default=str, separators=(',', ':'))
+
+    def _load_from_store(self, key: Hashable) -> Optional[Any]:
+        """Lädt einen Eintrag aus dem Feature Store (Arrays: 'audio'-Schlüssel)."""
+        if self.store is None:
+            return None
+        try:
+            if self._is_array_key(key):
+                return self.store.get_array(self._store_key(key))
+            return self.store.get_features(self._store_key(key))
+        except Exception as e:
+            print(f"⚠️ Feature Store nicht lesbar: {e}")
+            return None
+
+    def _save_to_store(self, key: Hashable, value: Any):
+        """Schreibt einen Eintrag in den Feature Store."""
+        if self.store is None:
+            return
+        try:
+            if isinstance(value, np.ndarray):
+                self.store.put_array(self._store_key(key), value)
+            elif isinstance(value, dict):
+                self.store.put_features(self._store_key(key), value)
+        except Exception as e:
+            print(f"⚠️ Feature Store nicht beschreibbar: {e}")
+
+    @staticmethod
+    def _is_array_key(key: Hashable) -> bool:
+        return isinstance(key, tuple) and len(key) > 0 and key[0] == 'audio'
+
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        """Schätzt den Speicherbedarf eines Eintrags in Bytes."""
+        if isinstance(value, np.ndarray):
+            return int(value.nbytes)
+        if isinstance(value, dict):
+            # Feature-Dicts: grobe Schätzung pro Eintrag
+            return 128 * max(len(value), 1)
+        return 1024
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (f"AnalysisCache(entries={len(self._entries)}, bytes={self._total_bytes}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+class SessionAnalysisMemo:
+    """Analyse-Ergebnisse einer Session (lebt und stirbt mit der Session).
+
+    Anders als der AnalysisCache wird hier nichts verdrängt: Feature-
+    Einträge pro Rolle und fertige Segment-Ergebnisse bleiben erhalten,
+    solange die Session existiert. Schlüssel enthalten Datei-Hash und
+    Pipeline-Version, sodass eine neu hochgeladene Schüler-Datei die
+    Referenz-Einträge weiterverwendet.
+    """
+
+    def __init__(self):
+        """Initialisiert einen leeren Memo."""
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Gibt einen Eintrag zurück (oder None).
+
+        Args:
+            key: Memo-Schlüssel
+
+        Returns:
+            Gespeicherter Wert oder None
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Hashable, value: Any):
+        """Speichert einen Eintrag.
+
+        Args:
+            key: Memo-Schlüssel
+            value: Zu speichernder Wert
+        """
+        with self._lock:
+            self._entries[key] = value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"SessionAnalysisMemo(entries={len(self._entries)})"
@@ -2,7 +2,9 @@
 
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from ..features import FeatureContext, BatchFeatureContext
 
 class BaseAnalyzer(ABC):
     """Abstract Base Class für Audio Feature Analyzer.
@@ -11,6 +13,13 @@ class BaseAnalyzer(ABC):
     Audio-Features und folgt dem Single Responsibility Principle.
     """
     
+    # Version der Analyse-Logik (Teil der Cache-Schlüssel, bei Änderungen erhöhen)
+    version = "1"
+    
+    # Mindest-Sample-Rate, die der Analyzer benötigt (None = volle Rate). Der
+    # Analyzer erhält die passende Stufe der Signal-Pyramide.
+    analysis_rate: Optional[int] = None
+    
     def __init__(self, target_sr: int = 22050):
         """Initialisiert den Analyzer.
         
@@ -20,17 +29,72 @@ class BaseAnalyzer(ABC):
         self.target_sr = target_sr
     
     @abstractmethod
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert Audio-Daten und extrahiert Features.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit analysierten Features
         """
         pass
     
+    def analyze_batch(self, audio_batch: Tuple[np.ndarray, int],
+                      contexts: Optional[List[FeatureContext]] = None,
+                      steps: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Analysiert mehrere gleich lange Signale (z.B. alle Segmente einer Aufnahme).
+        
+        Die Frame-Repräsentationen werden über einen BatchFeatureContext für
+        alle Zeilen gemeinsam berechnet; die Auswertung pro Zeile übernimmt
+        analyze(). Analyzer mit eigener Batch-Auswertung überschreiben diese
+        Methode.
+        
+        Args:
+            audio_batch: Tuple von (Audio-Matrix Signale x Samples, sample_rate)
+            contexts: Optionale FeatureContexts pro Zeile (z.B. BatchFeatureContext.rows())
+            steps: Auszuführende Teilschritte (None = alle)
+            
+        Returns:
+            Liste mit Feature-Dicts pro Zeile
+        """
+        y, sr = audio_batch
+        if contexts is None:
+            contexts = BatchFeatureContext(y, sr).rows()
+        return [self.analyze((context.y, sr), context, steps) for context in contexts]
+    
+    def _get_context(self, audio_data: Tuple[np.ndarray, int],
+                     context: Optional[FeatureContext] = None) -> FeatureContext:
+        """Gibt den geteilten FeatureContext zurück oder erstellt einen lokalen.
+        
+        Args:
+            audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext der Pipeline
+            
+        Returns:
+            FeatureContext für das Signal (Pyramiden-Stufe zu analysis_rate)
+        """
+        if context is None:
+            context = FeatureContext.from_audio_data(audio_data)
+        return context.at_rate(self.analysis_rate)
+    
+    @staticmethod
+    def _wants(step: str, steps: Optional[Set[str]]) -> bool:
+        """Prüft ob ein Teilschritt ausgeführt werden soll.
+        
+        Args:
+            step: Name des Teilschritts (siehe FeatureRegistry)
+            steps: Angeforderte Teilschritte (None = alle)
+            
+        Returns:
+            True wenn der Schritt berechnet werden soll
+        """
+        return steps is None or step in steps
+    
     def get_feature_names(self) -> list:
         """Gibt die Namen der extrahierten Features zurück.
         
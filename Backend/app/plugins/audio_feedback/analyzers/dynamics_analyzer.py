@@ -2,60 +2,70 @@
 
 import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_analyzer import BaseAnalyzer
+from ..features import FeatureContext, threshold_attack_frames
 
 class DynamicsAnalyzer(BaseAnalyzer):
     """Analyzer für Lautstärke und Dynamik-Features."""
     
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    # RMS-Verläufe und Pausen hängen kaum vom oberen Frequenzband ab
+    analysis_rate = 11025
+    
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert Lautstärke und Dynamik.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Dynamik-Features
         """
-        y, sr = audio_data
-        n_fft = min(2048, len(y))
+        ctx = self._get_context(audio_data, context)
+        y, sr = ctx.audio_data
+        n_fft = min(ctx.n_fft, len(y))
         
         results = {}
         
         # Gesamtlänge
-        results['length'] = len(y) / sr
+        if self._wants('length', steps):
+            results['length'] = len(y) / sr
         
         # Lautstärke (RMS)
-        loudness_data = self._analyze_loudness(y, n_fft)
-        results.update(loudness_data)
+        if self._wants('loudness', steps):
+            results.update(self._analyze_loudness(ctx, n_fft))
         
         # Dynamik-Bereich
-        dynamics_data = self._analyze_dynamics(y, n_fft)
-        results.update(dynamics_data)
+        if self._wants('dynamics', steps):
+            results.update(self._analyze_dynamics(ctx, n_fft))
         
         # Stille-Analyse
-        silences_data = self._analyze_silences(y, sr)
-        results.update(silences_data)
+        if self._wants('silences', steps):
+            results.update(self._analyze_silences(y, sr, ctx.n_fft, ctx.hop_length))
         
         # Attack Time
-        attack_data = self._analyze_attack_time(y, sr)
-        results.update(attack_data)
+        if self._wants('attack_time', steps):
+            results.update(self._analyze_attack_time(ctx))
         
         return results
     
-    def _analyze_loudness(self, y: np.ndarray, n_fft: int) -> Dict[str, float]:
+    def _analyze_loudness(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Lautstärke (RMS)."""
-        rms = librosa.feature.rms(y=y, frame_length=n_fft)[0]
+        rms = ctx.stats('rms', frame_length=n_fft)
         
         return {
-            "mean_rms": float(np.mean(rms)),
-            "max_rms": float(np.max(rms)),
-            "min_rms": float(np.min(rms))
+            "mean_rms": rms.mean(),
+            "max_rms": rms.max(),
+            "min_rms": rms.min()
         }
     
-    def _analyze_dynamics(self, y: np.ndarray, n_fft: int) -> Dict[str, float]:
+    def _analyze_dynamics(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Dynamik-Bereich."""
-        rms = librosa.feature.rms(y=y, frame_length=n_fft)[0]
+        rms = ctx.rms(frame_length=n_fft)
         rms_db = librosa.amplitude_to_db(rms, ref=np.max)
         
         return {
@@ -63,9 +73,12 @@ class DynamicsAnalyzer(BaseAnalyzer):
             "dynamic_std_db": float(np.std(rms_db))
         }
     
-    def _analyze_silences(self, y: np.ndarray, sr: int, top_db: int = 30) -> Dict[str, Any]:
-        """Analysiert Pausen/Stille."""
-        intervals = librosa.effects.split(y, top_db=top_db)
+    def _analyze_silences(self, y: np.ndarray, sr: int, frame_length: int = 2048,
+                          hop_length: int = 512, top_db: int = 30) -> Dict[str, Any]:
+        """Analysiert Pausen/Stille (Frames im Zeitraster der Pyramiden-Stufe)."""
+        intervals = librosa.effects.split(
+            y, top_db=top_db, frame_length=frame_length, hop_length=hop_length
+        )
         total_duration = len(y) / sr
         music_duration = sum((end - start) for start, end in intervals) / sr
         silence_duration = total_duration - music_duration
@@ -85,24 +98,17 @@ class DynamicsAnalyzer(BaseAnalyzer):
             "longest_silence": float(longest_silence),
         }
     
-    def _analyze_attack_time(self, y: np.ndarray, sr: int, threshold: float = 0.2) -> Dict[str, float]:
+    def _analyze_attack_time(self, ctx: FeatureContext, threshold: float = 0.2) -> Dict[str, float]:
         """Analysiert Attack Time (Anschlag-Geschwindigkeit)."""
-        rms = librosa.feature.rms(y=y)[0]
+        sr = ctx.sr
+        rms = ctx.rms()
         max_rms = np.max(rms)
         threshold_value = threshold * max_rms
         
-        attack_times = []
-        for i in range(len(rms) - 1):
-            if rms[i] < threshold_value and rms[i + 1] >= threshold_value:
-                # Finde Peak nach Threshold-Überschreitung
-                peak_idx = i + 1
-                while peak_idx < len(rms) - 1 and rms[peak_idx + 1] > rms[peak_idx]:
-                    peak_idx += 1
-                
-                attack_time = (peak_idx - i) * (512 / sr)  # hop_length default = 512
-                attack_times.append(attack_time)
+        # Schwellen-Überschreitungen und folgende Peaks ohne Frame-Schleife
+        attack_times = threshold_attack_frames(rms, threshold_value) * (ctx.hop_length / sr)
         
-        if attack_times:
+        if len(attack_times):
             return {
                 "mean_attack_time": float(np.mean(attack_times)),
                 "min_attack_time": float(np.min(attack_times)),
@@ -1,58 +1,62 @@
 # Pitch Analyzer - Tonhöhen-Analyse
 
-import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from collections import Counter
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_analyzer import BaseAnalyzer
+from ..features import (
+    FeatureContext, KEY_NAMES, CHORD_NAMES, best_chord_indices, autocorrelation, first_local_maximum
+)
 
 class PitchAnalyzer(BaseAnalyzer):
     """Analyzer für Tonhöhen-bezogene Features."""
     
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    # YIN und Chroma (C1-B7) brauchen keine Obertöne über 5 kHz
+    analysis_rate = 11025
+    
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert Tonhöhe und harmonische Features.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Pitch-Features
         """
-        y, sr = audio_data
+        ctx = self._get_context(audio_data, context)
         
         results = {}
         
         # Grundtonhöhe (Pitch)
-        pitch_data = self._analyze_pitch(y, sr)
-        results.update(pitch_data)
+        if self._wants('pitch', steps):
+            results.update(self._analyze_pitch(ctx))
         
         # Tonart-Erkennung (Chroma Key)
-        key_data = self._analyze_chroma_key(y, sr)
-        results.update(key_data)
+        if self._wants('chroma_key', steps):
+            results.update(self._analyze_chroma_key(ctx))
         
         # Akkord-Histogramm
-        chord_data = self._analyze_chord_histogram(y, sr)
-        results.update(chord_data)
+        if self._wants('chord_histogram', steps):
+            results.update(self._analyze_chord_histogram(ctx))
         
         # Vibrato-Analyse
-        vibrato_data = self._analyze_vibrato(y, sr)
-        results.update(vibrato_data)
+        if self._wants('vibrato', steps):
+            results.update(self._analyze_vibrato(ctx))
         
         return results
     
-    def _analyze_pitch(self, y: np.ndarray, sr: int) -> Dict[str, float]:
-        """Analysiert die Grundtonhöhe."""
-        pitches = librosa.yin(
-            y, 
-            fmin=librosa.note_to_hz("C2"), 
-            fmax=librosa.note_to_hz("C7"), 
-            sr=sr
-        )
-        valid_pitches = pitches[pitches > 0]
-        
-        if len(valid_pitches) > 0:
-            mean_pitch = float(np.mean(valid_pitches))
-            min_pitch = float(np.min(valid_pitches))
-            max_pitch = float(np.max(valid_pitches))
+    def _analyze_pitch(self, ctx: FeatureContext) -> Dict[str, float]:
+        """Analysiert die Grundtonhöhe (YIN-Bereich aus dem Pitch-Profil des Kontexts)."""
+        pitch_stats = ctx.stats('yin', only_positive=True)
+        
+        if pitch_stats.count > 0:
+            mean_pitch = pitch_stats.mean()
+            min_pitch = pitch_stats.min()
+            max_pitch = pitch_stats.max()
         else:
             mean_pitch = min_pitch = max_pitch = 0.0
         
@@ -62,87 +66,43 @@ class PitchAnalyzer(BaseAnalyzer):
             "max_pitch": max_pitch,
         }
     
-    def _analyze_chroma_key(self, y: np.ndarray, sr: int) -> Dict[str, str]:
+    def _analyze_chroma_key(self, ctx: FeatureContext) -> Dict[str, str]:
         """Analysiert die Tonart."""
-        chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-        chroma_sums = np.sum(chroma, axis=1)
+        chroma_sums = ctx.stats('chroma').sum()
         key_idx = np.argmax(chroma_sums)
-        key_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-        key = key_names[key_idx]
         
-        return {"estimated_key": key}
+        return {"estimated_key": KEY_NAMES[key_idx]}
     
-    def _analyze_chord_histogram(self, y: np.ndarray, sr: int) -> Dict[str, Any]:
+    def _analyze_chord_histogram(self, ctx: FeatureContext) -> Dict[str, Any]:
         """Analysiert Akkord-Verteilung."""
-        chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-        
-        # Akkord-Templates (Dur und Moll)
-        major_template = np.array([1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0])
-        minor_template = np.array([1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0])
+        chroma = ctx.chroma()
         
-        num_frames = chroma.shape[1]
-        chord_sequence = []
-        
-        for frame_idx in range(num_frames):
-            chroma_frame = chroma[:, frame_idx]
-            best_corr = -1
-            best_chord = "Unknown"
-            
-            for root in range(12):
-                # Rotiere Templates
-                major_rot = np.roll(major_template, root)
-                minor_rot = np.roll(minor_template, root)
-                
-                # Korrelation
-                corr_major = np.corrcoef(chroma_frame, major_rot)[0, 1]
-                corr_minor = np.corrcoef(chroma_frame, minor_rot)[0, 1]
-                
-                if corr_major > best_corr:
-                    best_corr = corr_major
-                    key_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-                    best_chord = key_names[root] + "_major"
-                
-                if corr_minor > best_corr:
-                    best_corr = corr_minor
-                    key_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-                    best_chord = key_names[root] + "_minor"
-            
-            chord_sequence.append(best_chord)
+        # Korrelation aller Frames mit den 24 Dur-/Moll-Templates in einem Matrixprodukt
+        # (Index -1 = konstanter Frame ohne definierte Korrelation -> "Unknown")
+        names = CHORD_NAMES + ["Unknown"]
+        chord_sequence = [names[idx] for idx in best_chord_indices(chroma)]
         
         # Häufigste Akkorde
-        from collections import Counter
         chord_counts = Counter(chord_sequence)
         most_common = chord_counts.most_common(3)
         
         return {
             "dominant_chord": most_common[0][0] if most_common else "Unknown",
-            "chord_variety": len(set(chord_sequence))
+            "chord_variety": len(chord_counts)
         }
     
-    def _analyze_vibrato(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def _analyze_vibrato(self, ctx: FeatureContext) -> Dict[str, float]:
         """Analysiert Vibrato."""
-        pitches = librosa.yin(
-            y, 
-            fmin=librosa.note_to_hz("C2"), 
-            fmax=librosa.note_to_hz("C7"), 
-            sr=sr
-        )
+        pitches = ctx.yin()
         valid_pitches = pitches[pitches > 0]
         
         if len(valid_pitches) > 10:
             # Vibrato als Standardabweichung der Tonhöhe
             vibrato_strength = float(np.std(valid_pitches))
-            # Vibrato-Rate (Periodizität)
-            autocorr = np.correlate(valid_pitches - np.mean(valid_pitches), 
-                                   valid_pitches - np.mean(valid_pitches), 
-                                   mode='full')
-            autocorr = autocorr[len(autocorr)//2:]
-            peaks = []
-            for i in range(1, len(autocorr)-1):
-                if autocorr[i] > autocorr[i-1] and autocorr[i] > autocorr[i+1]:
-                    peaks.append(i)
-            
-            vibrato_rate = float(peaks[0]) if peaks else 0.0
+            # Vibrato-Rate (Periodizität): erstes Maximum der Autokorrelation (FFT-basiert)
+            autocorr = autocorrelation(valid_pitches - np.mean(valid_pitches))
+            peak = first_local_maximum(autocorr)
+            vibrato_rate = float(peak) if peak > 0 else 0.0
         else:
             vibrato_strength = 0.0
             vibrato_rate = 0.0
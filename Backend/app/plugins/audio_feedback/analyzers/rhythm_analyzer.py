@@ -2,36 +2,41 @@
 
 import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_analyzer import BaseAnalyzer
+from ..features import FeatureContext
 
 class RhythmAnalyzer(BaseAnalyzer):
     """Analyzer für erweiterte Rhythmus-Features und Polyphonie."""
     
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert Rhythmus und Polyphonie.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Rhythmus-Features
         """
-        y, sr = audio_data
+        ctx = self._get_context(audio_data, context)
         
         results = {}
         
         # Polyphonie (Mehrstimmigkeit)
-        polyphony_data = self._analyze_polyphony(y, sr)
-        results.update(polyphony_data)
+        if self._wants('polyphony', steps):
+            results.update(self._analyze_polyphony(ctx))
         
         return results
     
-    def _analyze_polyphony(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def _analyze_polyphony(self, ctx: FeatureContext) -> Dict[str, float]:
         """Analysiert Polyphonie/Mehrstimmigkeit."""
         # Spectral Complexity als Indikator für Polyphonie
-        n_fft = min(2048, len(y))
-        S = np.abs(librosa.stft(y, n_fft=n_fft))
+        n_fft = min(ctx.n_fft, len(ctx.y))
+        S = ctx.stft_magnitude(n_fft)
         
         # Anzahl aktiver Frequenzbänder pro Frame
         threshold = np.max(S) * 0.1  # 10% des Maximums
@@ -39,7 +44,7 @@ class RhythmAnalyzer(BaseAnalyzer):
         mean_active_bands = float(np.mean(active_bands))
         
         # Spectral Flatness (niedriger = mehr harmonische Struktur/Polyphonie)
-        flatness = librosa.feature.spectral_flatness(y=y, n_fft=n_fft)[0]
+        flatness = librosa.feature.spectral_flatness(S=S, n_fft=n_fft)[0]
         mean_flatness = float(np.mean(flatness))
         
         return {
@@ -1,85 +1,87 @@
 # Spectral Analyzer - Spektrale Feature-Analyse
 
-import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_analyzer import BaseAnalyzer
+from ..features import FeatureContext
 
 class SpectralAnalyzer(BaseAnalyzer):
     """Analyzer für spektrale Features (Klangfarbe, Frequenzverteilung)."""
     
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert spektrale Features.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit spektralen Features
         """
-        y, sr = audio_data
-        n_fft = min(2048, len(y))
+        ctx = self._get_context(audio_data, context)
+        n_fft = min(ctx.n_fft, len(ctx.y))
         
         results = {}
         
         # Spectral Centroid (Klangfarbe/Helligkeit)
-        centroid_data = self._analyze_spectral_centroid(y, sr, n_fft)
-        results.update(centroid_data)
+        if self._wants('centroid', steps):
+            results.update(self._analyze_spectral_centroid(ctx, n_fft))
         
         # Spectral Bandwidth (Frequenzbreite)
-        bandwidth_data = self._analyze_spectral_bandwidth(y, sr, n_fft)
-        results.update(bandwidth_data)
+        if self._wants('bandwidth', steps):
+            results.update(self._analyze_spectral_bandwidth(ctx, n_fft))
         
         # Spectral Rolloff (Hochfrequenz-Anteil)
-        rolloff_data = self._analyze_spectral_rolloff(y, sr, n_fft)
-        results.update(rolloff_data)
+        if self._wants('rolloff', steps):
+            results.update(self._analyze_spectral_rolloff(ctx, n_fft))
         
         # Zero Crossing Rate (Rauschanteil)
-        zcr_data = self._analyze_zero_crossing_rate(y, n_fft)
-        results.update(zcr_data)
+        if self._wants('zero_crossing_rate', steps):
+            results.update(self._analyze_zero_crossing_rate(ctx, n_fft))
         
         return results
     
-    def _analyze_spectral_centroid(self, y: np.ndarray, sr: int, n_fft: int) -> Dict[str, float]:
+    def _analyze_spectral_centroid(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Spectral Centroid (Klangfarbe)."""
-        centroids = librosa.feature.spectral_centroid(y=y, sr=sr, n_fft=n_fft)[0]
+        centroids = ctx.stats('spectral_centroid', n_fft=n_fft)
         
         return {
-            "mean_centroid": float(np.mean(centroids)),
-            "min_centroid": float(np.min(centroids)),
-            "max_centroid": float(np.max(centroids)),
+            "mean_centroid": centroids.mean(),
+            "min_centroid": centroids.min(),
+            "max_centroid": centroids.max(),
         }
     
-    def _analyze_spectral_bandwidth(self, y: np.ndarray, sr: int, n_fft: int) -> Dict[str, float]:
+    def _analyze_spectral_bandwidth(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Spectral Bandwidth."""
-        bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr, n_fft=n_fft)[0]
+        bandwidth = ctx.stats('spectral_bandwidth', n_fft=n_fft)
         
         return {
-            "mean_bandwidth": float(np.mean(bandwidth)),
-            "min_bandwidth": float(np.min(bandwidth)),
-            "max_bandwidth": float(np.max(bandwidth)),
+            "mean_bandwidth": bandwidth.mean(),
+            "min_bandwidth": bandwidth.min(),
+            "max_bandwidth": bandwidth.max(),
         }
     
-    def _analyze_spectral_rolloff(self, y: np.ndarray, sr: int, n_fft: int) -> Dict[str, float]:
+    def _analyze_spectral_rolloff(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Spectral Rolloff."""
-        rolloff = librosa.feature.spectral_rolloff(
-            y=y, sr=sr, roll_percent=0.85, n_fft=n_fft
-        )[0]
+        rolloff = ctx.stats('spectral_rolloff', n_fft=n_fft, roll_percent=0.85)
         
         return {
-            "mean_rolloff": float(np.mean(rolloff)),
-            "min_rolloff": float(np.min(rolloff)),
-            "max_rolloff": float(np.max(rolloff)),
+            "mean_rolloff": rolloff.mean(),
+            "min_rolloff": rolloff.min(),
+            "max_rolloff": rolloff.max(),
         }
     
-    def _analyze_zero_crossing_rate(self, y: np.ndarray, n_fft: int) -> Dict[str, float]:
+    def _analyze_zero_crossing_rate(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Zero Crossing Rate."""
-        zcr = librosa.feature.zero_crossing_rate(y, frame_length=n_fft)[0]
+        zcr = ctx.stats('zero_crossing_rate', frame_length=n_fft)
         
         return {
-            "mean_zcr": float(np.mean(zcr)),
-            "min_zcr": float(np.min(zcr)),
-            "max_zcr": float(np.max(zcr))
+            "mean_zcr": zcr.mean(),
+            "min_zcr": zcr.min(),
+            "max_zcr": zcr.max()
         }
     
     def get_feature_names(self) -> list:
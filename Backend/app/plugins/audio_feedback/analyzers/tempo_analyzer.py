@@ -2,51 +2,60 @@
 
 import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_analyzer import BaseAnalyzer
+from ..features import FeatureContext
 
 class TempoAnalyzer(BaseAnalyzer):
     """Analyzer für Tempo- und Rhythmus-bezogene Features."""
     
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    # Onset-Envelope und Beat-Tracking: Einsätze sind auch unter 5 kHz sichtbar
+    analysis_rate = 11025
+    
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert Tempo und Rhythmus.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Tempo-Features
         """
-        y, sr = audio_data
+        ctx = self._get_context(audio_data, context)
         
         results = {}
         
-        # Tempo (BPM)
-        tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-        results['tempo'] = float(tempo)
+        # Tempo (BPM) - Beat-Tracking auf der geteilten Onset-Envelope
+        if self._wants('tempo', steps):
+            results['tempo'] = ctx.tempo()
         
         # Rhythmus-Stabilität
-        rhythm_stability = self._analyze_rhythm_stability(y, sr)
-        if rhythm_stability:
-            results.update(rhythm_stability)
+        if self._wants('rhythm_stability', steps):
+            rhythm_stability = self._analyze_rhythm_stability(ctx)
+            if rhythm_stability:
+                results.update(rhythm_stability)
         
         # Onset Count (Anzahl Noteneinsätze)
-        onsets = librosa.onset.onset_detect(y=y, sr=sr)
-        results['onset_count'] = int(len(onsets))
+        if self._wants('onset_count', steps):
+            onsets = ctx.onset_frames()
+            results['onset_count'] = int(len(onsets))
         
         return results
     
-    def _analyze_rhythm_stability(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def _analyze_rhythm_stability(self, ctx: FeatureContext) -> Dict[str, float]:
         """Analysiert die Rhythmus-Stabilität.
         
         Args:
-            y: Audio-Array
-            sr: Sample-Rate
+            ctx: FeatureContext des Signals
             
         Returns:
             Dict mit Rhythmus-Stabilitäts-Metriken oder None
         """
-        onsets = librosa.onset.onset_detect(y=y, sr=sr, units="time")
+        onsets = librosa.frames_to_time(ctx.onset_frames(), sr=ctx.sr, hop_length=ctx.hop_length)
         if len(onsets) < 2:
             return None  # zu wenig Daten
         
@@ -1,9 +1,9 @@
 # Timbre Analyzer - Klangfarben-Analyse (MFCC, Timbre Consistency)
 
-import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_analyzer import BaseAnalyzer
+from ..features import FeatureContext, successive_frame_distances
 
 class TimbreAnalyzer(BaseAnalyzer):
     """Analyzer für Klangfarben-Features."""
@@ -18,35 +18,39 @@ class TimbreAnalyzer(BaseAnalyzer):
         super().__init__(target_sr)
         self.n_mfcc = n_mfcc
     
-    def analyze(self, audio_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def analyze(self, audio_data: Tuple[np.ndarray, int],
+                context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Analysiert Klangfarben-Features.
         
         Args:
             audio_data: Tuple von (audio_array, sample_rate)
+            context: Optionaler FeatureContext mit gecachten Zwischenergebnissen
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Timbre-Features
         """
-        y, sr = audio_data
-        n_fft = min(2048, len(y))
+        ctx = self._get_context(audio_data, context)
+        n_fft = min(ctx.n_fft, len(ctx.y))
         
         results = {}
         
         # MFCC (Mel-Frequency Cepstral Coefficients)
-        mfcc_data = self._analyze_mfcc(y, sr, n_fft)
-        results.update(mfcc_data)
+        if self._wants('mfcc', steps):
+            results.update(self._analyze_mfcc(ctx, n_fft))
         
         # Timbre Consistency
-        consistency_data = self._analyze_timbre_consistency(y, sr, n_fft)
-        results.update(consistency_data)
+        if self._wants('timbre_consistency', steps):
+            results.update(self._analyze_timbre_consistency(ctx, n_fft))
         
         return results
     
-    def _analyze_mfcc(self, y: np.ndarray, sr: int, n_fft: int) -> Dict[str, float]:
+    def _analyze_mfcc(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert MFCC-Features."""
-        mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=self.n_mfcc, n_fft=n_fft)
-        mfcc_means = np.mean(mfccs, axis=1)
-        mfcc_vars = np.var(mfccs, axis=1)
+        mfcc_stats = ctx.stats('mfcc', n_mfcc=self.n_mfcc, n_fft=n_fft)
+        mfcc_means = mfcc_stats.mean()
+        mfcc_vars = mfcc_stats.var()
         
         return {
             "mfcc_mean_1": float(mfcc_means[0]),
@@ -57,20 +61,17 @@ class TimbreAnalyzer(BaseAnalyzer):
             "mfcc_var_3": float(mfcc_vars[2]),
         }
     
-    def _analyze_timbre_consistency(self, y: np.ndarray, sr: int, n_fft: int) -> Dict[str, float]:
+    def _analyze_timbre_consistency(self, ctx: FeatureContext, n_fft: int) -> Dict[str, float]:
         """Analysiert Klangfarben-Konsistenz."""
-        mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=self.n_mfcc, n_fft=n_fft)
+        mfccs = ctx.mfcc(n_mfcc=self.n_mfcc, n_fft=n_fft)
         
         # Varianz über die Zeit (niedrig = konsistenter)
-        timbre_variance = float(np.mean(np.var(mfccs, axis=1)))
+        timbre_variance = float(np.mean(ctx.stats('mfcc', n_mfcc=self.n_mfcc, n_fft=n_fft).var()))
         
         # Durchschnittliche Distanz zwischen aufeinanderfolgenden Frames
-        frame_distances = []
-        for i in range(mfccs.shape[1] - 1):
-            dist = np.linalg.norm(mfccs[:, i+1] - mfccs[:, i])
-            frame_distances.append(dist)
+        frame_distances = successive_frame_distances(mfccs)
         
-        mean_frame_distance = float(np.mean(frame_distances)) if frame_distances else 0.0
+        mean_frame_distance = float(np.mean(frame_distances)) if len(frame_distances) else 0.0
         
         return {
             "timbre_variance": timbre_variance,
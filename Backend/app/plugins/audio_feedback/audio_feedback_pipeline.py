@@ -4,9 +4,9 @@
 # folgt dem Dependency Injection und Composition-over-Inheritance Prinzip.
 
 import os
-import librosa
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 import numpy as np
 
 # Import Analyzers
@@ -26,6 +26,22 @@ from .comparators import (
     EnergyComparator
 )
 
+from app.shared.services.audio_service import AudioService
+
+# Import Feature Context & Registry
+from .features import (
+    FeatureContext, SegmentFeatureContext, BatchFeatureContext, FEATURE_REGISTRY,
+    AnalysisQuality, QUALITY_TIERS, DEFAULT_QUALITY, PITCH_PROFILES, apply_pitch_profile, DTWSettings,
+    pyramid_factor
+)
+from .features.feature_registry import ANALYZER, COMPARATOR, AnalysisPlan
+
+# Einzige Zwischenrepräsentation, die vom Pitch-Profil abhängt
+PROFILE_INTERMEDIATE = 'yin'
+
+# Version der Analyse-Logik (Teil der Cache-Schlüssel, bei Änderungen erhöhen)
+PIPELINE_VERSION = "3"
+
 # Import Prompt Builder
 from .prompt_builder import PromptGenerator
 from .prompt_builder.report_config import ReportConfig
@@ -43,7 +59,15 @@ class AudioFeedbackPipeline:
         target_sr: int = 22050, 
         target_length: int = 30,
         report_variant: str = 'detailed',
-        report_config: Dict[str, Any] = None
+        report_config: Dict[str, Any] = None,
+        analysis_mode: str = 'segment',
+        segment_executor=None,
+        analysis_cache=None,
+        batch_size: int = 8,
+        task_executor=None,
+        quality: Optional[AnalysisQuality] = None,
+        pitch_profiles: Optional[Dict[str, Optional[str]]] = None,
+        dtw: Optional[DTWSettings] = None
     ):
         """Initialisiert die Pipeline mit allen Komponenten.
         
@@ -53,11 +77,41 @@ class AudioFeedbackPipeline:
             target_length: Maximale Audio-Länge in Sekunden
             report_variant: Report-Variante ('detailed', 'technical', 'selective')
             report_config: Optionale Config für Report-Generator
+            analysis_mode: 'segment' (jedes Segment eigenständig) oder 'global'
+                (Frame-Features einmal über die gesamte Aufnahme, pro Segment geschnitten)
+            segment_executor: Optionaler SegmentExecutor für parallele Segment-Analyse
+            analysis_cache: Optionaler sessionübergreifender AnalysisCache
+            batch_size: Anzahl Segmente, deren Features im Segment-Modus gemeinsam
+                (gestapelt) berechnet werden (1 = einzeln)
+            task_executor: Optionaler, geteilter ThreadPoolExecutor, auf dem unabhängige
+                Analyzer und Comparators parallel laufen (None = seriell)
+            quality: Qualitätsstufe (Sample-Rate, STFT-/YIN-Auflösung, Chroma-Verfahren,
+                Resampler); None = 'balanced'. Ihre Sample-Rate hat Vorrang vor target_sr.
+            pitch_profiles: Pitch-Profil pro Rolle ('referenz'/'schueler' -> Name aus
+                PITCH_PROFILES, None = weiter Standard-Bereich der Stufe)
+            dtw: DTW-Suchfenster und Obergrenze (None = Sakoe-Chiba-Band, 2 s)
         """
         self.upload_folder = upload_folder
-        self.target_sr = target_sr
+        self.quality = quality or QUALITY_TIERS[DEFAULT_QUALITY]
+        self.target_sr = self.quality.sample_rate or target_sr
+        
+        # YIN-Suchbereich pro Rolle (Instrument); übrige Parameter aus der Stufe
+        self.pitch_profiles = {
+            role: (pitch_profiles or {}).get(role) for role in ('referenz', 'schueler')
+        }
+        self.role_quality = {
+            role: apply_pitch_profile(self.quality, PITCH_PROFILES.get(name) if name else None, self.target_sr)
+            for role, name in self.pitch_profiles.items()
+        }
+        self.dtw = dtw or DTWSettings()
         self.target_length = target_length
         self.preprocessed_data = {}  # Cache
+        self.analysis_mode = analysis_mode
+        self.segment_executor = segment_executor
+        self.analysis_cache = analysis_cache
+        self.batch_size = max(1, int(batch_size or 1))
+        self.task_executor = task_executor
+        self.audio_service = AudioService(self.target_sr, resample_quality=self.quality.resample_quality)
         
         # Report-Generator Config
         self.report_variant = report_variant
@@ -65,21 +119,46 @@ class AudioFeedbackPipeline:
         
         # Initialisiere Analyzers (Dependency Injection)
         self.analyzers = {
-            'tempo': TempoAnalyzer(target_sr),
-            'pitch': PitchAnalyzer(target_sr),
-            'spectral': SpectralAnalyzer(target_sr),
-            'dynamics': DynamicsAnalyzer(target_sr),
-            'timbre': TimbreAnalyzer(target_sr),
-            'rhythm': RhythmAnalyzer(target_sr)
+            'tempo': TempoAnalyzer(self.target_sr),
+            'pitch': PitchAnalyzer(self.target_sr),
+            'spectral': SpectralAnalyzer(self.target_sr),
+            'dynamics': DynamicsAnalyzer(self.target_sr),
+            'timbre': TimbreAnalyzer(self.target_sr),
+            'rhythm': RhythmAnalyzer(self.target_sr)
         }
         
         # Initialisiere Comparators
         self.comparators = {
             'feature': FeatureComparator(),
-            'temporal': TemporalComparator(),
+            'temporal': TemporalComparator(dtw=self.dtw),
             'energy': EnergyComparator()
         }
         
+        # Analyse-Plan: nur die Abhängigkeitshülle der aktivierten Features berechnen
+        enabled_features = (self.report_config or {}).get('enabled_features')
+        self.analysis_plan = FEATURE_REGISTRY.resolve(enabled_features)
+        if not self.analysis_plan.is_full:
+            print(f"🎯 Analyse-Plan: {len(self.analysis_plan.features)} Features, "
+                  f"Zwischenschritte: {', '.join(sorted(self.analysis_plan.intermediates)) or '-'}")
+        # Nur die YIN-Schritte hängen vom Pitch-Profil ab; sie werden getrennt
+        # gecacht, damit ein Profilwechsel (Instrument erst nach der Vorab-Analyse
+        # bekannt) nur sie neu berechnet
+        self.base_plan, self.pitch_plan = FEATURE_REGISTRY.split(self.analysis_plan, PROFILE_INTERMEDIATE)
+        
+        # Pyramiden-Stufen pro Rolle; sie hängen über den YIN-Bereich vom Profil ab
+        # und sind Teil der profilunabhängigen Cache-Schlüssel
+        rates = {analyzer.analysis_rate for analyzer in self.analyzers.values()} | {
+            rate for comparator in self.comparators.values() for rate in comparator.analysis_rates.values()
+        }
+        rates = sorted(rate for rate in rates if rate is not None)
+        self.level_tokens = {
+            role: tuple(pyramid_factor(quality, self.target_sr, rate) for rate in rates)
+            for role, quality in self.role_quality.items()
+        }
+        
+        # Versionsschlüssel für den AnalysisCache
+        self.cache_version = self._build_cache_version()
+        
         # Initialisiere Prompt Generator mit Config
         config_obj = ReportConfig(**self.report_config) if self.report_config else None
         self.prompt_generator = PromptGenerator(
@@ -87,8 +166,38 @@ class AudioFeedbackPipeline:
             report_config=config_obj
         )
     
+    def _build_cache_version(self) -> str:
+        """Baut den Versionsschlüssel aus Pipeline-, Komponenten-Versionen, Qualitätsstufe, DTW und Analyse-Plan."""
+        components = [
+            f"{name}:{component.version}"
+            for name, component in list(self.analyzers.items()) + list(self.comparators.items())
+        ]
+        plan = self.analysis_plan
+        features = 'all' if plan.is_full else ','.join(sorted(plan.features))
+        return (f"{PIPELINE_VERSION}|{'|'.join(components)}|{self.quality.cache_token}|"
+                f"{self.dtw.cache_token}|{features}")
+    
+    def get_config(self) -> Dict[str, Any]:
+        """Gibt die Konstruktor-Parameter zurück (z.B. für Worker-Prozesse).
+        
+        Returns:
+            Dict, mit dem sich eine gleichwertige Pipeline erstellen lässt
+        """
+        return {
+            'upload_folder': self.upload_folder,
+            'target_sr': self.target_sr,
+            'target_length': self.target_length,
+            'report_variant': self.report_variant,
+            'report_config': self.report_config,
+            'analysis_mode': self.analysis_mode,
+            'batch_size': self.batch_size,
+            'quality': self.quality,
+            'pitch_profiles': self.pitch_profiles,
+            'dtw': self.dtw
+        }
+    
     def preprocess_audio(self, filename: str) -> Tuple[np.ndarray, int]:
-        """Lädt eine Audio-Datei.
+        """Lädt eine Audio-Datei (einmal dekodiert, danach als PCM-Datei gemappt).
         
         Args:
             filename: Dateiname
@@ -98,17 +207,19 @@ class AudioFeedbackPipeline:
         """
         # Suche im Upload-Ordner
         path = os.path.join(self.upload_folder, filename)
+        is_segment = False
         
         # Falls nicht gefunden, im segments Unterordner suchen
         if not os.path.exists(path):
             segments_path = os.path.join(self.upload_folder, "segments", filename)
             if os.path.exists(segments_path):
                 path = segments_path
+                is_segment = True
             else:
                 raise FileNotFoundError(f"Datei nicht gefunden: {filename}")
         
-        y, sr = librosa.load(path, sr=self.target_sr)
-        return y, sr
+        # Segment-WAVs liegen bereits in Ziel-SR vor: direkt lesen, keine PCM-Datei
+        return self.audio_service.load_audio(Path(path), sr=self.target_sr, persist=not is_segment)
     
     def analyze_all(self, referenz_fn: str, schueler_fn: str) -> Dict[str, Any]:
         """Führt vollständige Analyse durch.
@@ -124,58 +235,683 @@ class AudioFeedbackPipeline:
         ref_data = self.preprocess_audio(referenz_fn)
         sch_data = self.preprocess_audio(schueler_fn)
         
+        return self.analyze_pair(ref_data, sch_data)
+    
+    def analyze_pair(self, ref_data: Tuple[np.ndarray, int],
+                     sch_data: Tuple[np.ndarray, int],
+                     ref_context: Optional[FeatureContext] = None,
+                     sch_context: Optional[FeatureContext] = None) -> Dict[str, Any]:
+        """Führt vollständige Analyse auf bereits dekodierten Signalen durch.
+        
+        Args:
+            ref_data: Referenz-Audio als (audio_array, sample_rate)
+            sch_data: Schüler-Audio als (audio_array, sample_rate)
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            
+        Returns:
+            Dict mit allen Analyse-Ergebnissen
+        """
+        return self.merge_parts(*self.analyze_parts(ref_data, sch_data, ref_context, sch_context))
+    
+    def analyze_parts(self, ref_data: Tuple[np.ndarray, int],
+                      sch_data: Tuple[np.ndarray, int],
+                      ref_context: Optional[FeatureContext] = None,
+                      sch_context: Optional[FeatureContext] = None,
+                      ref_features: Optional[Dict[str, Any]] = None,
+                      sch_features: Optional[Dict[str, Any]] = None,
+                      comparison: Optional[Dict[str, Any]] = None,
+                      identical: bool = False,
+                      known_parts: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict, Dict, Dict]:
+        """Analysiert ein Signal-Paar getrennt nach Referenz, Schüler und Vergleich.
+        
+        Bereits bekannte Teile (z.B. aus dem AnalysisCache) werden nicht neu
+        berechnet. Bei identischen Signalen werden die Schüler-Features von
+        der Referenz übernommen und die Vergleiche kurzgeschlossen. Für Teile
+        in known_parts fehlen nur die vom Pitch-Profil abhängigen YIN-Schritte.
+        
+        Args:
+            ref_data: Referenz-Audio als (audio_array, sample_rate)
+            sch_data: Schüler-Audio als (audio_array, sample_rate)
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            ref_features: Bekannte Referenz-Features (ohne Präfix)
+            sch_features: Bekannte Schüler-Features (ohne Präfix)
+            comparison: Bekannte Vergleichsmetriken
+            identical: True wenn Referenz und Schüler inhaltsgleich sind
+            known_parts: Profilunabhängige Teile pro Teil-Name ('referenz', 'schueler',
+                'comparison'), die nur noch um die YIN-Schritte ergänzt werden
+            
+        Returns:
+            Tuple von (ref_features, sch_features, comparison)
+        """
+        known_parts = known_parts or {}
+        
+        # Ein FeatureContext pro Signal: STFT, MFCC, Chroma, RMS, Onsets und
+        # YIN werden nur einmal berechnet und von allen Komponenten geteilt
+        if ref_context is None:
+            ref_context = FeatureContext.from_audio_data(ref_data, self.role_quality['referenz'])
+        if sch_context is None:
+            sch_context = ref_context if identical else FeatureContext.from_audio_data(
+                sch_data, self.role_quality['schueler']
+            )
+        
+        # Analyzer beider Signale und Comparators sind voneinander unabhängig
+        # (nur Schritte aus dem Analyse-Plan) und laufen gemeinsam auf dem Thread-Pool
+        groups = {}
+        if ref_features is None:
+            groups['referenz'] = self._feature_calls(ref_data, ref_context, self._plan_for('referenz', known_parts))
+        if sch_features is None and not identical:
+            groups['schueler'] = self._feature_calls(sch_data, sch_context, self._plan_for('schueler', known_parts))
+        if comparison is None:
+            groups['comparison'] = self._comparison_calls(
+                ref_data, sch_data, ref_context, sch_context, identical, self._plan_for('comparison', known_parts)
+            )
+        results = {
+            name: self._complete_part(known_parts.get(name), self._merge_dicts(group))
+            for name, group in self._run_groups(groups).items()
+        }
+        
+        ref_features = results.get('referenz', ref_features)
+        if sch_features is None:
+            sch_features = dict(ref_features) if identical else results['schueler']
+        comparison = results.get('comparison', comparison)
+        
+        return ref_features, sch_features, comparison
+    
+    def analyze_parts_batch(self, ref_signals: List[np.ndarray], sch_signals: List[np.ndarray],
+                            known: List[Dict[str, Any]]) -> List[Tuple[Dict, Dict, Dict]]:
+        """Analysiert mehrere gleich lange Signal-Paare gemeinsam.
+        
+        Gegenstück zu analyze_parts(): STFT, Mel/MFCC, RMS, Spectral-Features,
+        Onset-Envelope und YIN werden pro Rolle mit einem Aufruf über alle
+        gestapelten Signale berechnet (BatchFeatureContext).
+        
+        Args:
+            ref_signals: Referenz-Signale (gleiche Länge, target_sr)
+            sch_signals: Schüler-Signale (gleiche Länge, target_sr)
+            known: Pro Paar die bereits bekannten Teile (ref_features,
+                sch_features, comparison, identical, known_parts; siehe analyze_parts)
+            
+        Returns:
+            Liste von (ref_features, sch_features, comparison) pro Paar
+        """
+        sr = self.target_sr
+        ref_batch = BatchFeatureContext.from_signals(ref_signals, sr, self.role_quality['referenz'])
+        if all(parts['identical'] for parts in known):
+            sch_batch = ref_batch
+        else:
+            sch_batch = BatchFeatureContext.from_signals(sch_signals, sr, self.role_quality['schueler'])
+        ref_contexts = ref_batch.rows()
+        sch_contexts = [
+            ref_contexts[i] if parts['identical'] else sch_batch.row(i)
+            for i, parts in enumerate(known)
+        ]
+        
+        ref_features = [parts['ref_features'] for parts in known]
+        sch_features = [parts['sch_features'] for parts in known]
+        comparisons = [parts['comparison'] for parts in known]
+        known_parts = [parts.get('known_parts') or {} for parts in known]
+        
+        # Fehlende Zeilen pro Teil; identische Schüler-Zeilen übernehmen die Referenz
+        ref_rows = [i for i, features in enumerate(ref_features) if features is None]
+        sch_rows = [i for i, features in enumerate(sch_features)
+                    if features is None and not known[i]['identical']]
+        comparison_rows = [i for i, comparison in enumerate(comparisons) if comparison is None]
+        
+        # Pro Teil getrennt: vollständig fehlende Zeilen und Zeilen, denen nur die YIN-Schritte fehlen
+        groups = {}
+        for only_pitch in (False, True):
+            plan = self.pitch_plan if only_pitch else None
+            rows = [i for i in ref_rows if ('referenz' in known_parts[i]) == only_pitch]
+            if rows:
+                groups[('referenz', only_pitch)] = (rows, self._feature_batch_calls(
+                    self._batch_rows((ref_batch.y, sr), rows), [ref_contexts[i] for i in rows], plan
+                ))
+            rows = [i for i in sch_rows if ('schueler' in known_parts[i]) == only_pitch]
+            if rows:
+                groups[('schueler', only_pitch)] = (rows, self._feature_batch_calls(
+                    self._batch_rows((sch_batch.y, sr), rows), [sch_contexts[i] for i in rows], plan
+                ))
+            rows = [i for i in comparison_rows if ('comparison' in known_parts[i]) == only_pitch]
+            if rows:
+                groups[('comparison', only_pitch)] = (rows, self._comparison_batch_calls(
+                    self._batch_rows((ref_batch.y, sr), rows),
+                    self._batch_rows((sch_batch.y, sr), rows),
+                    [ref_contexts[i] for i in rows], [sch_contexts[i] for i in rows],
+                    [known[i]['identical'] for i in rows], plan
+                ))
+        results = self._run_groups({group: calls for group, (_, calls) in groups.items()})
+        
+        targets = {'referenz': ref_features, 'schueler': sch_features, 'comparison': comparisons}
+        for (name, only_pitch), (rows, _) in groups.items():
+            for i, values in zip(rows, self._merge_rows(results[(name, only_pitch)], len(rows))):
+                targets[name][i] = self._complete_part(known_parts[i].get(name), values)
+        
+        for i in range(len(known)):
+            if sch_features[i] is None:
+                sch_features[i] = dict(ref_features[i])
+        
+        return list(zip(ref_features, sch_features, comparisons))
+    
+    # ------------------------------------------------------------------
+    # Analyse-Aufgaben (unabhängig, ggf. parallel auf dem Thread-Pool)
+    # ------------------------------------------------------------------
+    
+    def _plan_for(self, name: str, known_parts: Dict[str, Dict[str, Any]]) -> Optional[AnalysisPlan]:
+        """Plan eines Teils: nur YIN-Schritte, wenn der profilunabhängige Rest bekannt ist."""
+        return self.pitch_plan if name in known_parts else None
+    
+    @staticmethod
+    def _complete_part(known: Optional[Dict[str, Any]], computed: Dict[str, Any]) -> Dict[str, Any]:
+        """Ergänzt einen profilunabhängigen Teil um die berechneten YIN-Ergebnisse."""
+        if known is None:
+            return computed
+        return FEATURE_REGISTRY.ordered({**known, **computed})
+    
+    def _feature_calls(self, audio_data: Tuple[np.ndarray, int], context: FeatureContext,
+                       plan: Optional[AnalysisPlan] = None) -> List[Callable[[], Dict[str, Any]]]:
+        """Eine Aufgabe pro Analyzer des Plans (None = Analyse-Plan)."""
+        plan = plan or self.analysis_plan
+        return [
+            partial(analyzer.analyze, audio_data, context, plan.steps_for(ANALYZER, analyzer_name))
+            for analyzer_name, analyzer in self.analyzers.items()
+            if plan.includes(ANALYZER, analyzer_name)
+        ]
+    
+    def _comparison_calls(self, ref_data: Tuple[np.ndarray, int], sch_data: Tuple[np.ndarray, int],
+                          ref_context: FeatureContext, sch_context: FeatureContext,
+                          identical: bool, plan: Optional[AnalysisPlan] = None
+                          ) -> List[Callable[[], Dict[str, Any]]]:
+        """Eine Aufgabe pro Comparator des Plans (None = Analyse-Plan)."""
+        plan = plan or self.analysis_plan
+        return [
+            partial(self._compare_one, comparator, plan.steps_for(COMPARATOR, comparator_name),
+                    ref_data, sch_data, ref_context, sch_context, identical)
+            for comparator_name, comparator in self.comparators.items()
+            if plan.includes(COMPARATOR, comparator_name)
+        ]
+    
+    @staticmethod
+    def _compare_one(comparator, steps: Optional[Set[str]],
+                     ref_data: Tuple[np.ndarray, int], sch_data: Tuple[np.ndarray, int],
+                     ref_context: FeatureContext, sch_context: FeatureContext,
+                     identical: bool) -> Dict[str, Any]:
+        """Führt einen Comparator aus (kurzgeschlossen bei inhaltsgleichen Signalen)."""
+        comparison = comparator.compare_identical(steps) if identical else None
+        if comparison is None:
+            comparison = comparator.compare(ref_data, sch_data, ref_context, sch_context, steps)
+        return comparison
+    
+    def _feature_batch_calls(self, audio_batch: Tuple[np.ndarray, int], contexts: List[FeatureContext],
+                             plan: Optional[AnalysisPlan] = None) -> List[Callable[[], List[Dict[str, Any]]]]:
+        """Eine Batch-Aufgabe pro Analyzer des Plans (None = Analyse-Plan)."""
+        plan = plan or self.analysis_plan
+        return [
+            partial(analyzer.analyze_batch, audio_batch, contexts, plan.steps_for(ANALYZER, analyzer_name))
+            for analyzer_name, analyzer in self.analyzers.items()
+            if plan.includes(ANALYZER, analyzer_name)
+        ]
+    
+    def _comparison_batch_calls(self, ref_batch: Tuple[np.ndarray, int], sch_batch: Tuple[np.ndarray, int],
+                                ref_contexts: List[FeatureContext], sch_contexts: List[FeatureContext],
+                                identical: List[bool], plan: Optional[AnalysisPlan] = None
+                                ) -> List[Callable[[], List[Dict[str, Any]]]]:
+        """Eine Batch-Aufgabe pro Comparator des Plans (None = Analyse-Plan)."""
+        plan = plan or self.analysis_plan
+        return [
+            partial(self._compare_rows, comparator, plan.steps_for(COMPARATOR, comparator_name),
+                    ref_batch, sch_batch, ref_contexts, sch_contexts, identical)
+            for comparator_name, comparator in self.comparators.items()
+            if plan.includes(COMPARATOR, comparator_name)
+        ]
+    
+    def _compare_rows(self, comparator, steps: Optional[Set[str]],
+                      ref_batch: Tuple[np.ndarray, int], sch_batch: Tuple[np.ndarray, int],
+                      ref_contexts: List[FeatureContext], sch_contexts: List[FeatureContext],
+                      identical: List[bool]) -> List[Dict[str, Any]]:
+        """Führt einen Comparator für alle Paare aus (identische Paare kurzgeschlossen)."""
+        comparisons = [
+            comparator.compare_identical(steps) if is_identical else None
+            for is_identical in identical
+        ]
+        rows = [i for i, comparison in enumerate(comparisons) if comparison is None]
+        if rows:
+            computed = comparator.compare_batch(
+                self._batch_rows(ref_batch, rows), self._batch_rows(sch_batch, rows),
+                [ref_contexts[i] for i in rows], [sch_contexts[i] for i in rows], steps
+            )
+            for i, comparison in zip(rows, computed):
+                comparisons[i] = comparison
+        return comparisons
+    
+    def _run_concurrently(self, calls: List[Callable[[], Any]]) -> List[Any]:
+        """Führt unabhängige Aufgaben aus, mit Thread-Pool parallel.
+        
+        Die erste Aufgabe läuft im aufrufenden Thread, die übrigen auf dem
+        geteilten Thread-Pool. Gemeinsame Zwischenschritte werden über den
+        thread-sicheren FeatureContext nur einmal berechnet.
+        
+        Args:
+            calls: Aufgaben ohne Argumente
+            
+        Returns:
+            Ergebnisse in Reihenfolge der Aufgaben
+        """
+        if self.task_executor is None or len(calls) < 2:
+            return [call() for call in calls]
+        
+        futures = [self.task_executor.submit(call) for call in calls[1:]]
+        try:
+            first = calls[0]()
+            return [first] + [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    
+    def _run_groups(self, groups: Dict[str, List[Callable[[], Any]]]) -> Dict[str, List[Any]]:
+        """Führt die Aufgaben mehrerer Gruppen gemeinsam aus (siehe _run_concurrently).
+        
+        Returns:
+            Ergebnisse pro Gruppe in Reihenfolge ihrer Aufgaben
+        """
+        calls = [call for group in groups.values() for call in group]
+        results = iter(self._run_concurrently(calls))
+        return {name: [next(results) for _ in group] for name, group in groups.items()}
+    
+    @staticmethod
+    def _merge_dicts(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Führt die Ergebnisse der Komponenten zusammen (in Komponenten-Reihenfolge)."""
+        merged = {}
+        for result in results:
+            merged.update(result)
+        return merged
+    
+    @staticmethod
+    def _merge_rows(results: List[List[Dict[str, Any]]], num_rows: int) -> List[Dict[str, Any]]:
+        """Führt Batch-Ergebnisse der Komponenten pro Zeile zusammen."""
+        merged = [{} for _ in range(num_rows)]
+        for component_rows in results:
+            for row, result in zip(merged, component_rows):
+                row.update(result)
+        return merged
+    
+    @staticmethod
+    def _batch_rows(audio_batch: Tuple[np.ndarray, int], rows: List[int]) -> Tuple[np.ndarray, int]:
+        """Wählt Zeilen einer Audio-Matrix aus (ohne Kopie, wenn alle Zeilen gewählt sind)."""
+        y, sr = audio_batch
+        if len(rows) == len(y):
+            return y, sr
+        return y[rows], sr
+    
+    @staticmethod
+    def merge_parts(ref_features: Dict[str, Any], sch_features: Dict[str, Any],
+                    comparison: Dict[str, Any]) -> Dict[str, Any]:
+        """Führt Referenz-, Schüler- und Vergleichsergebnisse zusammen.
+        
+        Returns:
+            Dict mit referenz_*/schueler_* Features und Vergleichsmetriken
+        """
         results = {}
+        for prefix, features in [('referenz', ref_features), ('schueler', sch_features)]:
+            for feature_name, feature_value in features.items():
+                results[f"{prefix}_{feature_name}"] = feature_value
+        results.update(comparison)
+        return results
+    
+    def get_segment_view(self, audio: np.ndarray, segment: Dict) -> np.ndarray:
+        """Gibt ein Segment als View auf das dekodierte Signal zurück.
+        
+        Nur ein zu kurzes letztes Segment wird (als Kopie) auf die volle
+        Segment-Länge aufgefüllt, alle anderen Segmente teilen sich den
+        Speicher mit dem Original-Array.
+        
+        Args:
+            audio: Dekodiertes Audio-Array der gesamten Aufnahme
+            segment: Segment mit start_sample, end_sample und optional segment_samples
+            
+        Returns:
+            Audio-Array des Segments
+        """
+        view = audio[segment["start_sample"]:segment["end_sample"]]
+        segment_samples = segment.get("segment_samples")
+        if segment_samples and len(view) < segment_samples:
+            view = np.pad(view, (0, segment_samples - len(view)), mode='constant')
+        return view
+    
+    def _segment_cache_key(self, kind: str, file_hash: Optional[str], segment: Dict,
+                           role: str, pitch: bool = False) -> Optional[Tuple]:
+        """Cache-Schlüssel für die Features eines Segments (None ohne Hash).
+        
+        Nur der Schlüssel der YIN-Schritte (pitch=True) enthält das Pitch-Profil.
+        """
+        if file_hash is None:
+            return None
+        key = (
+            kind, file_hash, self.cache_version, self.target_sr, self.analysis_mode,
+            segment.get("start_sample"), segment.get("end_sample"), segment.get("segment_samples"),
+            self.level_tokens[role]
+        )
+        return key + ('pitch', self.pitch_profiles[role]) if pitch else key
+    
+    def _part_keys(self, name: str, ref_hash: Optional[str], sch_hash: Optional[str],
+                   ref_seg: Dict, sch_seg: Dict) -> Tuple[Optional[Tuple], Optional[Tuple]]:
+        """Cache-Schlüssel eines Teils ('referenz', 'schueler', 'comparison').
+        
+        Returns:
+            Tuple (Schlüssel der profilunabhängigen Schritte, Schlüssel der YIN-Schritte)
+        """
+        if name == 'comparison':
+            if ref_hash is None or sch_hash is None:
+                return None, None
+            return tuple(
+                (self._segment_cache_key('comparison', ref_hash, ref_seg, 'referenz', pitch),
+                 self._segment_cache_key('comparison', sch_hash, sch_seg, 'schueler', pitch))
+                for pitch in (False, True)
+            )
+        file_hash, segment = (ref_hash, ref_seg) if name == 'referenz' else (sch_hash, sch_seg)
+        return tuple(
+            self._segment_cache_key('features', file_hash, segment, name, pitch) for pitch in (False, True)
+        )
+    
+    def _cache_get_part(self, keys: Tuple[Optional[Tuple], Optional[Tuple]],
+                        memo=None, name: str = None) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Sucht einen Teil im Cache (profilunabhängige und YIN-Schritte getrennt).
+        
+        Returns:
+            Tuple (vollständiger Teil oder None, nur profilunabhängiger Teil oder None)
+        """
+        base_key, pitch_key = keys
+        base = self._cache_get(base_key, memo, name) if self.base_plan.features else {}
+        pitch = self._cache_get(pitch_key, memo, name) if self.pitch_plan.features else {}
+        if base is not None and pitch is not None:
+            return self._complete_part(base, pitch), None
+        return None, base
+    
+    def _cache_put_part(self, keys: Tuple[Optional[Tuple], Optional[Tuple]], value: Dict[str, Any],
+                        memo=None, name: str = None):
+        """Legt einen Teil getrennt nach profilunabhängigen und YIN-Schritten ab."""
+        base_key, pitch_key = keys
+        pitch_names = self.pitch_plan.features
+        if self.base_plan.features:
+            self._cache_put(base_key, {k: v for k, v in value.items() if k not in pitch_names}, memo, name)
+        if pitch_names:
+            self._cache_put(pitch_key, {k: v for k, v in value.items() if k in pitch_names}, memo, name)
+    
+    def _cache_get(self, key: Optional[Tuple], memo=None, role: str = None) -> Optional[Dict[str, Any]]:
+        """Sucht zuerst im Session-Memo (pro Rolle), dann im AnalysisCache."""
+        if key is None:
+            return None
+        if memo is not None:
+            value = memo.get((role, key))
+            if value is not None:
+                return value
+        if self.analysis_cache is None:
+            return None
+        value = self.analysis_cache.get(key)
+        if value is not None and memo is not None:
+            memo.put((role, key), value)
+        return value
+    
+    def _cache_put(self, key: Optional[Tuple], value: Dict[str, Any], memo=None, role: str = None):
+        if key is None:
+            return
+        if memo is not None:
+            memo.put((role, key), value)
+        if self.analysis_cache is not None:
+            self.analysis_cache.put(key, value)
+    
+    def _analyze_task(self, task: Dict[str, Any],
+                      ref_audio: Optional[np.ndarray], sch_audio: Optional[np.ndarray],
+                      ref_recording: Optional[FeatureContext],
+                      sch_recording: Optional[FeatureContext]) -> Tuple[Dict, Dict, Dict]:
+        """Berechnet die fehlenden Teile eines Segment-Paars (seriell)."""
+        ref_seg = task["ref_segment"]
+        sch_seg = task["sch_segment"]
+        known = {
+            'ref_features': task["ref_features"],
+            'sch_features': task["sch_features"],
+            'comparison': task["comparison"],
+            'identical': task["identical"],
+            'known_parts': task["known_parts"]
+        }
+        
+        if ref_recording is not None:
+            ref_ctx = SegmentFeatureContext(
+                ref_recording, ref_seg["start_sample"], ref_seg["end_sample"],
+                ref_seg.get("segment_samples")
+            )
+            sch_ctx = SegmentFeatureContext(
+                sch_recording, sch_seg["start_sample"], sch_seg["end_sample"],
+                sch_seg.get("segment_samples")
+            )
+            return self.analyze_parts(ref_ctx.audio_data, sch_ctx.audio_data, ref_ctx, sch_ctx, **known)
         
-        # 1. Feature-Extraktion für beide Dateien
-        for prefix, audio_data in [('referenz', ref_data), ('schueler', sch_data)]:
-            for analyzer_name, analyzer in self.analyzers.items():
-                features = analyzer.analyze(audio_data)
-                for feature_name, feature_value in features.items():
-                    results[f"{prefix}_{feature_name}"] = feature_value
+        if ref_audio is not None and sch_audio is not None:
+            return self.analyze_parts(
+                (self.get_segment_view(ref_audio, ref_seg), self.target_sr),
+                (self.get_segment_view(sch_audio, sch_seg), self.target_sr),
+                **known
+            )
         
-        # 2. Vergleichsanalysen
-        for comparator_name, comparator in self.comparators.items():
-            comparison = comparator.compare(ref_data, sch_data)
-            results.update(comparison)
+        return self.analyze_parts(
+            self.preprocess_audio(ref_seg["filename"]),
+            self.preprocess_audio(sch_seg["filename"]),
+            **known
+        )
+    
+    def analyze_task_batch(self, tasks: List[Dict[str, Any]],
+                           ref_audio: np.ndarray, sch_audio: np.ndarray) -> List[Tuple[Dict, Dict, Dict]]:
+        """Berechnet die fehlenden Teile mehrerer Segment-Paare gemeinsam.
         
+        Args:
+            tasks: Segment-Paare (ref_segment, sch_segment und bekannte Teile)
+            ref_audio: Dekodierte Referenz-Aufnahme
+            sch_audio: Dekodierte Schüler-Aufnahme
+            
+        Returns:
+            (ref_features, sch_features, comparison) pro Task in Reihenfolge
+        """
+        ref_views = [self.get_segment_view(ref_audio, task["ref_segment"]) for task in tasks]
+        sch_views = [self.get_segment_view(sch_audio, task["sch_segment"]) for task in tasks]
+        known = [
+            {
+                'ref_features': task["ref_features"],
+                'sch_features': task["sch_features"],
+                'comparison': task["comparison"],
+                'identical': task["identical"],
+                'known_parts': task["known_parts"]
+            }
+            for task in tasks
+        ]
+        
+        # Nur gleich lange Segmente lassen sich stapeln (gekürzte letzte Segmente separat)
+        groups = {}
+        for i, (ref_view, sch_view) in enumerate(zip(ref_views, sch_views)):
+            groups.setdefault((len(ref_view), len(sch_view)), []).append(i)
+        
+        results = [None] * len(tasks)
+        for rows in groups.values():
+            parts = self.analyze_parts_batch(
+                [ref_views[i] for i in rows], [sch_views[i] for i in rows], [known[i] for i in rows]
+            )
+            for i, row_parts in zip(rows, parts):
+                results[i] = row_parts
         return results
     
-    def analyze_segments(self, ref_segments: List[Dict], sch_segments: List[Dict]) -> List[Dict]:
+    def analyze_segments(self, ref_segments: List[Dict], sch_segments: List[Dict],
+                         ref_audio: Optional[np.ndarray] = None,
+                         sch_audio: Optional[np.ndarray] = None,
+                         ref_hash: Optional[str] = None,
+                         sch_hash: Optional[str] = None,
+                         progress_callback: Optional[Callable[[int, int], None]] = None,
+                         segment_callback: Optional[Callable[[Dict], None]] = None,
+                         memo=None) -> List[Dict]:
         """Analysiert Segment-Paare.
         
+        Werden die dekodierten Aufnahmen übergeben, arbeitet die Analyse auf
+        Views über start_sample/end_sample. Ohne Audio-Arrays werden die
+        Segmente wie bisher über ihren filename geladen.
+        
+        Im Modus 'global' werden die Frame-Features einmal über die gesamte
+        Aufnahme berechnet; Segment-Statistiken kommen dann aus Frame-Slices
+        und Präfixsummen (SegmentFeatureContext).
+        
+        Mit Datei-Hashes werden Segment-Features und Vergleiche im
+        AnalysisCache abgelegt bzw. daraus bedient. Gleiche Hashes für
+        Referenz und Schüler schließen den Vergleich kurz. Die YIN-Schritte
+        liegen unter eigenen Schlüsseln mit Pitch-Profil; bei anderem Profil
+        wird nur ihr Teil neu berechnet.
+        
         Args:
             ref_segments: Referenz-Segmente mit filename, start_sec, end_sec
+                (und start_sample, end_sample bei In-Memory-Analyse)
             sch_segments: Schüler-Segmente mit filename, start_sec, end_sec
+                (und start_sample, end_sample bei In-Memory-Analyse)
+            ref_audio: Optional dekodierte Referenz-Aufnahme (target_sr)
+            sch_audio: Optional dekodierte Schüler-Aufnahme (target_sr)
+            ref_hash: Optionaler SHA-256 der Referenz-Datei
+            sch_hash: Optionaler SHA-256 der Schüler-Datei
+            progress_callback: Optionaler Callback (erledigte Segmente, Gesamtanzahl)
+            segment_callback: Optionaler Callback mit jedem fertigen Segment-Ergebnis
+                (sobald es vorliegt, daher nicht zwingend in Segment-Reihenfolge)
+            memo: Optionales SessionAnalysisMemo (Features pro Rolle, vor dem Cache)
             
         Returns:
             Liste von Analyse-Ergebnissen pro Segment
         """
-        segment_results = []
-        max_segments = max(len(ref_segments), len(sch_segments))
+        in_memory = ref_audio is not None and sch_audio is not None
+        # Inhaltsgleich nur bei gleichem Hash und gleichem Pitch-Profil beider Rollen
+        identical_recordings = (
+            ref_hash is not None and ref_hash == sch_hash
+            and self.role_quality['referenz'] == self.role_quality['schueler']
+        )
         
-        for i in range(max_segments):
-            ref_seg = ref_segments[i] if i < len(ref_segments) else None
-            sch_seg = sch_segments[i] if i < len(sch_segments) else None
+        # 1. Bekannte Teile aus dem Cache holen
+        tasks = []
+        for i in range(min(len(ref_segments), len(sch_segments))):
+            ref_seg = ref_segments[i]
+            sch_seg = sch_segments[i]
             
-            if ref_seg and sch_seg:
-                # Analysiere Segment-Paar
-                analysis = self.analyze_all(ref_seg["filename"], sch_seg["filename"])
-                
-                segment_results.append({
-                    "segment": i + 1,
-                    "referenz_start": ref_seg["start_sec"],
-                    "referenz_end": ref_seg["end_sec"],
-                    "schueler_start": sch_seg["start_sec"],
-                    "schueler_end": sch_seg["end_sec"],
-                    "analysis": analysis
-                })
-        
-        return segment_results
-    
-    def analyze_and_generate_feedback(
+            # Pro Teil: vollständig aus dem Cache oder nur der profilunabhängige Rest
+            cache_keys, parts, known_parts = {}, {}, {}
+            for name in ('referenz', 'schueler', 'comparison'):
+                cache_keys[name] = self._part_keys(name, ref_hash, sch_hash, ref_seg, sch_seg)
+                parts[name], base = self._cache_get_part(cache_keys[name], memo, name)
+                if parts[name] is None and base is not None:
+                    known_parts[name] = base
+            
+            tasks.append({
+                "index": i,
+                "ref_segment": ref_seg,
+                "sch_segment": sch_seg,
+                "ref_features": parts['referenz'],
+                "sch_features": parts['schueler'],
+                "comparison": parts['comparison'],
+                "known_parts": known_parts,
+                "cache_keys": cache_keys,
+                "identical": identical_recordings and (
+                    ref_seg.get("start_sample"), ref_seg.get("end_sample")
+                ) == (sch_seg.get("start_sample"), sch_seg.get("end_sample")),
+                # Beide Seiten still (Stille-Erkennung im Service): nicht analysieren
+                "skipped": bool(ref_seg.get("silent") and sch_seg.get("silent"))
+            })
+        
+        pending = [
+            task for task in tasks
+            if not task["skipped"] and (
+                task["ref_features"] is None or task["sch_features"] is None or task["comparison"] is None
+            )
+        ]
+        
+        # 2. Fehlende Teile berechnen; fertige Segmente werden sofort gemeldet
+        done = 0
+        
+        def complete_task(task, parts=None):
+            nonlocal done
+            if parts is not None:
+                ref_features, sch_features, comparison = parts
+                task["ref_features"] = ref_features
+                task["sch_features"] = sch_features
+                task["comparison"] = comparison
+                for name, value in (('referenz', ref_features), ('schueler', sch_features),
+                                    ('comparison', comparison)):
+                    self._cache_put_part(task["cache_keys"][name], value, memo, name)
+            
+            task["result"] = self._build_segment_result(task)
+            done += 1
+            if segment_callback is not None:
+                segment_callback(task["result"])
+            if progress_callback is not None:
+                progress_callback(done, len(tasks))
+        
+        if progress_callback is not None:
+            progress_callback(done, len(tasks))
+        
+        # Aus dem Cache bediente und übersprungene Segmente zuerst
+        pending_indices = {task["index"] for task in pending}
+        for task in tasks:
+            if task["index"] not in pending_indices:
+                complete_task(task)
+        
+        ref_recording = sch_recording = None
+        if pending and in_memory and self.analysis_mode == 'global':
+            ref_recording = FeatureContext(ref_audio, self.target_sr, self.role_quality['referenz'])
+            sch_recording = FeatureContext(sch_audio, self.target_sr, self.role_quality['schueler'])
+        
+        if (in_memory and ref_recording is None and len(pending) > 1
+                and self.segment_executor is not None and self.segment_executor.enabled):
+            # Segment-Modus: Segment-Paare parallel im Prozess-Pool analysieren
+            # (Fertigstellungs-Reihenfolge, nicht Segment-Reihenfolge)
+            self.segment_executor.analyze_segments(
+                self.get_config(), ref_audio, sch_audio, pending,
+                on_task_done=lambda position, parts: complete_task(pending[position], parts),
+                batch_size=self.batch_size
+            )
+        elif in_memory and ref_recording is None and self.batch_size > 1:
+            # Segment-Modus seriell: gleich lange Segmente gestapelt analysieren
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                for task, parts in zip(batch, self.analyze_task_batch(batch, ref_audio, sch_audio)):
+                    complete_task(task, parts)
+        else:
+            for task in pending:
+                complete_task(task, self._analyze_task(task, ref_audio, sch_audio, ref_recording, sch_recording))
+        
+        # 3. Ergebnisse in Segment-Reihenfolge zurückgeben
+        return [task["result"] for task in tasks]
+    
+    def _build_segment_result(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Baut das Segment-Ergebnis aus den Teilen eines Tasks."""
+        ref_seg = task["ref_segment"]
+        sch_seg = task["sch_segment"]
+        result = {
+            "segment": task["index"] + 1,
+            "referenz_start": ref_seg["start_sec"],
+            "referenz_end": ref_seg["end_sec"],
+            "schueler_start": sch_seg["start_sec"],
+            "schueler_end": sch_seg["end_sec"],
+            "analysis": {} if task["skipped"] else self.merge_parts(
+                task["ref_features"], task["sch_features"], task["comparison"]
+            )
+        }
+        
+        # Markierungen der Stille-Erkennung für Report und Frontend
+        if ref_seg.get("silent") or sch_seg.get("silent"):
+            result["silence"] = {"referenz": bool(ref_seg.get("silent")), "schueler": bool(sch_seg.get("silent"))}
+        if task["skipped"]:
+            result["skipped"] = True
+        if ref_seg.get("trimmed") or sch_seg.get("trimmed"):
+            result["trimmed"] = True
+        # Globale Zuordnung (Service): Ähnlichkeit des Paars und bester Raster-Treffer
+        if sch_seg.get("alignment"):
+            result["alignment"] = sch_seg["alignment"]
+        return result
+    
+    def generate_feedback(
         self,
-        ref_segments: List[Dict],
-        sch_segments: List[Dict],
+        segment_results: List[Dict],
         language: str,
         referenz_instrument: str,
         schueler_instrument: str,
@@ -183,11 +919,10 @@ class AudioFeedbackPipeline:
         prompt_type: str = "contextual",
         use_simple_language: bool = False
     ) -> Dict[str, Any]:
-        """Hauptfunktion: Analysiert und generiert Feedback.
+        """Generiert den Feedback-Prompt aus bereits vorliegenden Segment-Ergebnissen.
         
         Args:
-            ref_segments: Referenz-Segmente
-            sch_segments: Schüler-Segmente
+            segment_results: Ergebnisse aus analyze_segments
             language: Sprache
             referenz_instrument: Referenz-Instrument
             schueler_instrument: Schüler-Instrument
@@ -198,11 +933,7 @@ class AudioFeedbackPipeline:
         Returns:
             Dict mit system_prompt und analysis_data
         """
-        # 1. Führe Segment-Analyse durch
-        segment_results = self.analyze_segments(ref_segments, sch_segments)
-        
-        # 2. Generiere Feedback-Prompt
-        result = self.prompt_generator.generate_feedback_prompt(
+        return self.prompt_generator.generate_feedback_prompt(
             segment_results,
             language,
             referenz_instrument,
@@ -211,5 +942,20 @@ class AudioFeedbackPipeline:
             prompt_type,
             use_simple_language
         )
+    
+    def with_report_sections(self, segment_callback: Optional[Callable[[Dict, str], None]]
+                             ) -> Optional[Callable[[Dict], None]]:
+        """Erweitert einen Segment-Callback um den gerenderten Report-Abschnitt.
         
-        return result
+        Args:
+            segment_callback: Callback (Segment-Ergebnis, Report-Abschnitt) oder None
+            
+        Returns:
+            Callback für analyze_segments oder None
+        """
+        if segment_callback is None:
+            return None
+        
+        def on_segment(segment_result):
+            segment_callback(segment_result, self.prompt_generator.render_segment_report(segment_result))
+        return on_segment
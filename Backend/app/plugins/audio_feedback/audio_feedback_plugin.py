@@ -37,6 +37,8 @@ class AudioFeedbackPlugin(MusicToolPlugin):
         self.session_service = app_context['session_service']
         self.storage_service = app_context['storage_service']
         self.audio_service = app_context['audio_service']
+        self.feature_store = app_context.get('feature_store')  # Optional: persistenter Cache
+        self.job_service = app_context['job_service']
         self.app_config = app_context['config']  # Flask App Config
         self.plugin_config = app_context.get('plugin_config', {})  # Plugin Config aus config.yaml
         
@@ -44,9 +46,15 @@ class AudioFeedbackPlugin(MusicToolPlugin):
         self.feedback_service = AudioFeedbackService(
             self.audio_service,
             self.storage_service,
-            plugin_config=self.plugin_config  # Plugin-Config weitergeben
+            plugin_config=self.plugin_config,  # Plugin-Config weitergeben
+            analysis_workers=getattr(self.app_config, 'ANALYSIS_WORKERS', 1),
+            feature_store=self.feature_store,
+            analysis_threads=getattr(self.app_config, 'ANALYSIS_THREADS', 1)
         )
         
+        # Pipeline (inkl. Session-Memo-Bezug) beim Beenden der Session freigeben
+        self.session_service.add_cleanup_listener(self.feedback_service.cleanup_session)
+        
         # Log welche Report-Variante verwendet wird
         report_variant = self.plugin_config.get('settings', {}).get('report_variant', 'detailed')
         print(f"🎵 Audio Feedback Plugin initialisiert (Report: {report_variant})")
@@ -61,7 +69,8 @@ class AudioFeedbackPlugin(MusicToolPlugin):
             self.feedback_service,
             self.session_service,
             self.storage_service,
-            self.audio_service
+            self.audio_service,
+            self.job_service
         )
     
     def get_frontend_routes(self):
@@ -89,7 +98,7 @@ class AudioFeedbackPlugin(MusicToolPlugin):
     
     def cleanup(self):
         """Cleanup beim Shutdown."""
-        # Cleanup für alle Session-Pipelines
+        # Cleanup für alle Session-Pipelines und den Prozess-Pool
         if hasattr(self, 'feedback_service'):
-            self.feedback_service.pipelines.clear()
+            self.feedback_service.shutdown()
 
@@ -4,9 +4,17 @@ from flask import Blueprint, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
 import os
 
-from app.core.exceptions import SessionNotFoundException, SessionExpiredException, InvalidFileFormatException
+from app.shared.utils.sse import (
+    format_sse_event, format_sse_comment, sse_response, to_jsonable, KEEPALIVE_INTERVAL_SEC
+)
+from .analysis_cache import SessionAnalysisMemo
+from .features import PITCH_PROFILES
+from app.core.exceptions import (
+    SessionNotFoundException, SessionExpiredException, InvalidFileFormatException, JobNotFoundException,
+    AudioLimitExceededException, InvalidQualityTierException
+)
 
-def create_routes(feedback_service, session_service, storage_service, audio_service) -> Blueprint:
+def create_routes(feedback_service, session_service, storage_service, audio_service, job_service) -> Blueprint:
     """Erstellt Blueprint mit allen Routes für Audio Feedback.
     
     Args:
@@ -14,6 +22,7 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
         session_service: SessionService instance
         storage_service: StorageService instance
         audio_service: AudioService instance
+        job_service: JobService instance für asynchrone Analysen
         
     Returns:
         Blueprint: Flask Blueprint mit allen Endpoints
@@ -21,6 +30,155 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
     
     bp = Blueprint('audio_feedback', __name__)
     
+    def segment_publisher(job):
+        """Callback, der fertige Segmente als Job-Event veröffentlicht."""
+        def publish(segment_result, report_section):
+            job.publish("segment", {
+                "segment": segment_result["segment"],
+                "analysis": segment_result,
+                "report_section": report_section
+            })
+        return publish
+    
+    def get_session_memo(session):
+        """Holt (oder erstellt) den Analyse-Memo der Session.
+        
+        Der Memo hält Features pro Rolle und fertige Segment-Ergebnisse,
+        sodass erneute /analyze-Aufrufe mit anderen Prompt-Parametern
+        keine Audio-Verarbeitung mehr auslösen.
+        """
+        memo = session.get_data('analysis_memo')
+        if memo is None:
+            memo = SessionAnalysisMemo()
+            session.set_data('analysis_memo', memo)
+        return memo
+    
+    def get_estimated_segments(session) -> int:
+        """Geschätzte Anzahl Segment-Paare laut Header-Probe beim Upload (0 = unbekannt)."""
+        audio_info = session.get_data('audio_info') or {}
+        estimates = [info.get("estimated_segments", 0) for info in audio_info.values()]
+        return min(estimates) if len(estimates) == 2 else 0
+    
+    def cancel_preanalysis(session):
+        """Bricht die Vorab-Analyse der Session ab (z.B. bevor ihre Dateien ersetzt werden)."""
+        previous = session.get_data('preanalysis')
+        if previous and previous.get('job_id'):
+            try:
+                job_service.get_job(previous['job_id'], session.session_id).cancel()
+            except JobNotFoundException:
+                pass
+    
+    def start_preanalysis(session, referenz_path, schueler_path):
+        """Startet Dekodierung, Segmentierung und Feature-Extraktion direkt nach dem Upload.
+        
+        Die Ergebnisse landen im Analyse-Memo der Session, /analyze muss
+        danach nur noch den Prompt rendern. Vorab analysiert wird mit der
+        Standard-Qualitätsstufe (analysis_quality) und, da die Instrumente
+        erst mit /analyze bekannt sind, mit dem weiten YIN-Bereich. Ergibt
+        das Instrument ein Pitch-Profil, berechnet /analyze nur die
+        YIN-Schritte neu; alle übrigen Features kommen aus dem Memo.
+        
+        Args:
+            session: Session der hochgeladenen Dateien
+            referenz_path: Pfad zur Referenz-Datei
+            schueler_path: Pfad zur Schüler-Datei
+            
+        Returns:
+            Job: Der Vorab-Analyse-Job
+        """
+        session_id = session.session_id
+        
+        # Vorherige Vorab-Analyse (alte Dateien) abbrechen
+        cancel_preanalysis(session)
+        
+        preanalysis = {
+            "referenz_hash": storage_service.get_file_hash(session_id, referenz_path.name),
+            "schueler_hash": storage_service.get_file_hash(session_id, schueler_path.name),
+            "quality": feedback_service.default_quality.name,
+            "pitch_profiles": feedback_service.get_pitch_profiles()
+        }
+        memo = get_session_memo(session)
+        
+        estimated_segments = get_estimated_segments(session)
+        
+        def run_preanalysis(job):
+            if estimated_segments:
+                job.set_progress(0, estimated_segments)
+            segment_results = feedback_service.analyze_files(
+                session_id,
+                str(session.path),
+                referenz_path,
+                schueler_path,
+                referenz_hash=preanalysis["referenz_hash"],
+                schueler_hash=preanalysis["schueler_hash"],
+                progress_callback=job.set_progress,
+                segment_callback=segment_publisher(job),
+                memo=memo
+            )
+            return {"segment_count": len(segment_results)}
+        
+        job = job_service.submit(session_id, "audio-preanalysis", run_preanalysis)
+        preanalysis["job_id"] = job.job_id
+        session.set_data('preanalysis', preanalysis)
+        return job
+    
+    def await_preanalysis(job, session, referenz_hash, schueler_hash, quality, pitch_profiles) -> bool:
+        """Wartet auf die Vorab-Analyse der Session und leitet ihre Events weiter.
+        
+        Args:
+            job: Laufender Analyse-Job (erhält Fortschritt und Segment-Events)
+            session: Session der Anfrage
+            referenz_hash: SHA-256 der aktuellen Referenz-Datei
+            schueler_hash: SHA-256 der aktuellen Schüler-Datei
+            quality: Angefragte Qualitätsstufe (nur dieselbe Stufe wird übernommen)
+            pitch_profiles: Pitch-Profile der Anfrage. Bei anderen Profilen wird
+                trotzdem gewartet (profilunabhängige Features landen im Memo),
+                aber nur der Fortschritt weitergeleitet
+            
+        Returns:
+            bool: True wenn die Vorab-Analyse abgeschlossen ist und ihre
+            Ergebnisse vollständig gelten (Segment-Events bereits weitergeleitet)
+        """
+        preanalysis = session.get_data('preanalysis') or {}
+        try:
+            pre_job = job_service.get_job(preanalysis.get('job_id'), session.session_id)
+        except JobNotFoundException:
+            return False
+        
+        # Andere Dateien oder Stufe: Vorab-Analyse ist nutzlos und würde
+        # mit der eigentlichen Analyse um Job-Worker und Prozess-Pool konkurrieren
+        if (
+            (preanalysis.get('referenz_hash'), preanalysis.get('schueler_hash')) != (referenz_hash, schueler_hash)
+            or preanalysis.get('quality') != quality.name
+        ):
+            pre_job.cancel()
+            return False
+        
+        # Anderes Pitch-Profil: Segment-Ergebnisse der Vorab-Analyse enthalten
+        # Tonhöhen aus dem weiten YIN-Bereich und werden nicht weitergeleitet
+        same_profiles = preanalysis.get('pitch_profiles') == pitch_profiles
+        
+        # Noch nicht gestartet: selbst analysieren, statt einen Worker wartend zu blockieren
+        if pre_job.cancel_if_queued():
+            return False
+        
+        # Event-Log weiterleiten (bei bereits fertiger Vorab-Analyse sofort)
+        after_id = 0
+        while True:
+            job.check_cancelled()
+            events = pre_job.wait_for_events(after_id, timeout=1.0)
+            for event in events:
+                after_id = event["id"]
+                if event["event"] == "progress":
+                    job.set_progress(event["data"]["done"], event["data"]["total"])
+                elif event["event"] == "segment" and same_profiles:
+                    job.publish("segment", event["data"])
+            
+            if pre_job.is_finished and not events:
+                break
+        
+        return same_profiles and pre_job.status == pre_job.COMPLETED
+    
     @bp.route('/upload', methods=['POST'])
     def upload_audio():
         """Upload von Referenz- und Schüler-Aufnahmen.
@@ -51,6 +209,8 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
                 session_id = session.session_id
         
         try:
+            # Laufende Vorab-Analyse der alten Dateien abbrechen, bevor sie gelöscht werden
+            cancel_preanalysis(session)
             
             # Lösche vorherige Dateien
             storage_service.delete_all_files(session_id)
@@ -87,6 +247,21 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
             referenz_path = storage_service.save_file(referenz_file, session_id, role="referenz")
             schueler_path = storage_service.save_file(schueler_file, session_id, role="schueler")
             
+            # Header prüfen (Dauer, Sample-Rate, Kanäle), bevor Analyse-Arbeit eingeplant wird
+            try:
+                audio_info = {
+                    "referenz": feedback_service.inspect_upload(referenz_path),
+                    "schueler": feedback_service.inspect_upload(schueler_path)
+                }
+            except (InvalidFileFormatException, AudioLimitExceededException):
+                storage_service.delete_all_files(session_id)
+                session.set_data('audio_info', None)
+                raise
+            session.set_data('audio_info', audio_info)
+            
+            # Analyse im Hintergrund starten, während der Nutzer den Wizard ausfüllt
+            preanalysis_job = start_preanalysis(session, referenz_path, schueler_path)
+            
             # Erstelle File-Map
             file_map = {
                 "referenz": referenz_path.name,
@@ -100,6 +275,8 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
                 "message": "Dateien erfolgreich hochgeladen",
                 "file_map": file_map,
                 "original_filenames": original_filenames,
+                "audio_info": audio_info,
+                "preanalysisJobId": preanalysis_job.job_id,
                 "sessionId": session_id
             })
         
@@ -108,7 +285,7 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
                 "error": str(e),
                 "success": False
             }), 401
-        except InvalidFileFormatException as e:
+        except (InvalidFileFormatException, AudioLimitExceededException) as e:
             return jsonify({
                 "error": str(e),
                 "success": False
@@ -176,7 +353,7 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
     
     @bp.route('/analyze', methods=['POST'])
     def generate_feedback():
-        """Generiert Audio-Feedback durch Analyse.
+        """Startet die Audio-Analyse als asynchronen Job.
         
         JSON Body:
             language: Sprache für Feedback
@@ -186,12 +363,14 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
             personalMessage: Persönliche Nachricht
             prompt_type: Art des Prompts (contextual/data_only)
             use_simple_language: Einfache Sprache verwenden
+            quality: Qualitätsstufe der Analyse (fast/balanced/accurate,
+                Standard: analysis_quality aus config.yaml)
             
         Headers:
             X-Session-ID: Session-ID
             
         Returns:
-            JSON Response mit Analyse-Ergebnissen
+            JSON Response (202) mit jobId; das Ergebnis liefert GET /jobs/<jobId>
         """
         # Extrahiere Parameter
         data = request.json or {}
@@ -216,6 +395,8 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
             personal_message = data.get("personalMessage", "").strip()
             prompt_type = data.get("prompt_type", "contextual")
             use_simple_language = data.get("use_simple_language", False)
+            quality = feedback_service.get_quality(data.get("quality") or None)
+            pitch_profiles = feedback_service.get_pitch_profiles(referenz_instrument, schueler_instrument)
             
             # Lade und validiere Dateien
             files = storage_service.list_files(session_id)
@@ -244,78 +425,102 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
                     "success": False
                 }), 400
             
-            # Segmentiere Audio-Dateien
-            segment_length_sec = 8
-            
-            ref_segment_files = audio_service.segment_and_save(
-                referenz_path,
-                session.path,
-                segment_length_sec,
-                base_filename="referenz"
-            )
-            
-            sch_segment_files = audio_service.segment_and_save(
-                schueler_path,
-                session.path,
-                segment_length_sec,
-                base_filename="schueler"
-            )
-            
-            # Konvertiere Segment-Dateipfade in das erwartete Format
-            # AudioFeedbackPipeline erwartet: [{"filename": str, "start_sec": float, "end_sec": float}, ...]
-            ref_segments = []
-            for idx, filepath in enumerate(ref_segment_files):
-                ref_segments.append({
-                    "filename": filepath,
-                    "start_sec": idx * segment_length_sec,
-                    "end_sec": (idx + 1) * segment_length_sec
-                })
-            
-            sch_segments = []
-            for idx, filepath in enumerate(sch_segment_files):
-                sch_segments.append({
-                    "filename": filepath,
-                    "start_sec": idx * segment_length_sec,
-                    "end_sec": (idx + 1) * segment_length_sec
-                })
-            
-            # Führe Analyse durch
-            result = feedback_service.analyze_recordings(
-                session_id=session_id,
-                session_path=session_path,
-                referenz_segments=ref_segments,
-                schueler_segments=sch_segments,
-                language=selected_language,
-                referenz_instrument=referenz_instrument,
-                schueler_instrument=schueler_instrument,
-                personal_message=personal_message,
-                prompt_type=prompt_type,
-                use_simple_language=use_simple_language
-            )
-            
-            # Hole Original-Dateinamen
-            original_filenames = session.get_data('original_filenames', {})
-            
-            # File-Map
-            file_map = {
-                "referenz": referenz_file,
-                "schueler": schueler_file
-            }
+            def run_analysis(job):
+                """Wartet auf die Vorab-Analyse (oder analysiert selbst) und rendert den Prompt."""
+                # Content-Hashes der Uploads (Schlüssel für Vorab-Analyse und Cache)
+                referenz_hash = storage_service.get_file_hash(session_id, referenz_file)
+                schueler_hash = storage_service.get_file_hash(session_id, schueler_file)
+                
+                # Fortschritt von Beginn an mit der Schätzung aus der Header-Probe
+                estimated_segments = get_estimated_segments(session)
+                if estimated_segments:
+                    job.set_progress(0, estimated_segments)
+                
+                preanalyzed = await_preanalysis(
+                    job, session, referenz_hash, schueler_hash, quality, pitch_profiles
+                )
+                
+                # Dekodiere einmalig, segmentiere im Speicher und analysiere
+                # (Fortschritt = analysierte Segmente). Liegen die Ergebnisse im
+                # Session-Memo, wird keine Audio-Verarbeitung mehr ausgeführt.
+                segment_results = feedback_service.analyze_files(
+                    session_id,
+                    session_path,
+                    referenz_path,
+                    schueler_path,
+                    referenz_hash=referenz_hash,
+                    schueler_hash=schueler_hash,
+                    progress_callback=job.set_progress,
+                    segment_callback=None if preanalyzed else segment_publisher(job),
+                    memo=get_session_memo(session),
+                    quality=quality,
+                    pitch_profiles=pitch_profiles
+                )
+                
+                result = feedback_service.render_feedback(
+                    session_id=session_id,
+                    session_path=session_path,
+                    segment_results=segment_results,
+                    language=selected_language,
+                    referenz_instrument=referenz_instrument,
+                    schueler_instrument=schueler_instrument,
+                    personal_message=personal_message,
+                    prompt_type=prompt_type,
+                    use_simple_language=use_simple_language,
+                    quality=quality
+                )
+                
+                # Analyse-Fenster melden (wurde eine Aufnahme gekürzt?)
+                audio_info = session.get_data('audio_info') or {}
+                analysis_window = {
+                    role: audio_info[role]["analysis_window"] if role in audio_info
+                    else feedback_service.get_analysis_window(path)
+                    for role, path in (("referenz", referenz_path), ("schueler", schueler_path))
+                }
+                for role, window in analysis_window.items():
+                    if window["truncated"]:
+                        print(f"✂️ {role}: nur {window['analyzed_duration_sec']}s von "
+                              f"{window['source_duration_sec']:.1f}s analysiert")
+                
+                return {
+                    "system_prompt": result['system_prompt'],
+                    "analysis_data": result['analysis_data'],
+                    "analysis_window": analysis_window,
+                    "truncated": any(window["truncated"] for window in analysis_window.values()),
+                    "quality": quality.to_dict(),
+                    "pitch_profiles": {
+                        role: PITCH_PROFILES[name].to_dict() if name else None
+                        for role, name in pitch_profiles.items()
+                    },
+                    "file_map": {
+                        "referenz": referenz_file,
+                        "schueler": schueler_file
+                    },
+                    "original_filenames": session.get_data('original_filenames', {}),
+                    "sessionId": session_id
+                }
+            
+            # Analyse asynchron starten, Ergebnis über GET /jobs/<jobId>
+            # bzw. live per SSE über GET /jobs/<jobId>/events
+            job = job_service.submit(session_id, "audio-feedback", run_analysis)
             
             return jsonify({
                 "success": True,
-                "system_prompt": result['system_prompt'],
-                "analysis_data": result['analysis_data'],
-                "file_map": file_map,
-                "original_filenames": original_filenames,
+                "jobId": job.job_id,
+                "status": job.status,
                 "sessionId": session_id
-            })
+            }), 202
         
         except (SessionNotFoundException, SessionExpiredException) as e:
             return jsonify({
                 "error": str(e),
                 "success": False
             }), 401
+        except InvalidQualityTierException as e:
+            return jsonify({
+                "error": str(e),
+                "success": False
+            }), 400
         except Exception as e:
             print(f"Fehler bei der Feedback-Generierung: {str(e)}")
             import traceback
@@ -325,6 +530,102 @@ def create_routes(feedback_service, session_service, storage_service, audio_serv
                 "success": False
             }), 500
     
+    @bp.route('/jobs/<job_id>', methods=['GET'])
+    def get_job(job_id):
+        """Gibt Status, Fortschritt und ggf. Ergebnis eines Analyse-Jobs zurück.
+        
+        Headers:
+            X-Session-ID: Session-ID
+            
+        Returns:
+            JSON Response mit status (queued/running/completed/failed/cancelled),
+            progress (done/total Segmente) und result bei Abschluss
+        """
+        session_id = request.headers.get("X-Session-ID") or request.args.get("sessionId")
+        if not session_id:
+            return jsonify({
+                "error": "sessionId fehlt",
+                "success": False
+            }), 400
+        
+        try:
+            session_service.get_session(session_id)
+            job = job_service.get_job(job_id, session_id)
+            
+            return jsonify(to_jsonable({
+                "success": True,
+                **job.to_dict()
+            }))
+        
+        except (SessionNotFoundException, SessionExpiredException) as e:
+            return jsonify({
+                "error": str(e),
+                "success": False
+            }), 401
+        except JobNotFoundException as e:
+            return jsonify({
+                "error": str(e),
+                "success": False
+            }), 404
+    
+    @bp.route('/jobs/<job_id>/events', methods=['GET'])
+    def stream_job_events(job_id):
+        """Streamt Fortschritt und fertige Segmente eines Analyse-Jobs (Server-Sent Events).
+        
+        Events:
+            running: Job wurde gestartet
+            progress: {done, total} analysierte Segmente
+            segment: {segment, analysis, report_section} sobald ein Segment fertig ist
+            completed / failed / cancelled: Endzustand (completed enthält result)
+            
+        Query/Headers:
+            sessionId / X-Session-ID: Session-ID (EventSource kann keine Header setzen)
+            Last-Event-ID: Fortsetzen nach Reconnect
+            
+        Returns:
+            text/event-stream Response
+        """
+        session_id = request.headers.get("X-Session-ID") or request.args.get("sessionId")
+        if not session_id:
+            return jsonify({
+                "error": "sessionId fehlt",
+                "success": False
+            }), 400
+        
+        try:
+            session_service.get_session(session_id)
+            job = job_service.get_job(job_id, session_id)
+        except (SessionNotFoundException, SessionExpiredException) as e:
+            return jsonify({
+                "error": str(e),
+                "success": False
+            }), 401
+        except JobNotFoundException as e:
+            return jsonify({
+                "error": str(e),
+                "success": False
+            }), 404
+        
+        try:
+            last_event_id = int(request.headers.get("Last-Event-ID", 0))
+        except ValueError:
+            last_event_id = 0
+        
+        def generate():
+            after_id = last_event_id
+            while True:
+                events = job.wait_for_events(after_id, timeout=KEEPALIVE_INTERVAL_SEC)
+                for event in events:
+                    yield format_sse_event(event["data"], event=event["event"], event_id=event["id"])
+                    after_id = event["id"]
+                
+                if job.is_finished and not events:
+                    break
+                if not events:
+                    yield format_sse_comment()
+        
+        return sse_response(generate())
+    
     @bp.route('/session/cleanup', methods=['POST'])
     def cleanup_session():
         """Beendet eine Session und löscht alle zugehörigen Daten.
@@ -1,89 +1,644 @@
 """Audio Feedback Service - Geschäftslogik für Audio-Analyse und Feedback-Generierung."""
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
+import numpy as np
+import math
 import os
 
 from .audio_feedback_pipeline import AudioFeedbackPipeline
+from .segment_executor import SegmentExecutor
+from .analysis_cache import AnalysisCache, SessionAnalysisMemo
+from .features import (
+    AnalysisQuality, QUALITY_TIERS, DEFAULT_QUALITY, resolve_quality, find_pitch_profile,
+    resolve_dtw_settings, FeatureContext, alignment_features, align_recordings, segment_similarity
+)
+from app.core.exceptions import AudioLimitExceededException, InvalidQualityTierException
+from app.shared.services.audio_service import AudioService
 
 class AudioFeedbackService:
     """Service für Audio Feedback Analyse und Prompt-Generierung."""
     
-    def __init__(self, audio_service, storage_service, plugin_config: Dict[str, Any] = None):
+    def __init__(self, audio_service, storage_service, plugin_config: Dict[str, Any] = None,
+                 analysis_workers: int = 1, feature_store=None, analysis_threads: int = 1):
         """Initialisiert den Audio Feedback Service.
         
         Args:
             audio_service: AudioService instance für Audio-Operationen
             storage_service: StorageService instance für Dateizugriff
             plugin_config: Plugin-Konfiguration aus config.yaml
+            analysis_workers: Anzahl Worker-Prozesse für die Segment-Analyse
+            feature_store: Optionaler FeatureStoreService (persistente Cache-Ebene)
+            analysis_threads: Threads für parallele Analyzer/Comparators innerhalb
+                einer Analyse (<= 1 = seriell)
         """
         self.audio_service = audio_service
         self.storage_service = storage_service
-        self.pipelines = {}  # Cache für Pipelines pro Session
+        self.pipelines = {}  # Cache für Pipelines pro (Session, Qualitätsstufe)
         
         # Report-Generator Config aus Plugin-Config
         self.plugin_config = plugin_config or {}
         settings = self.plugin_config.get('settings', {})
         self.report_variant = settings.get('report_variant', 'detailed')
         self.report_config = settings.get('report_config', {})
+        
+        # Audio-Verarbeitung
+        self.target_sr = settings.get('default_sample_rate', 22050)
+        self.target_length = settings.get('target_length_sec', 60) or None  # 0 = unbegrenzt
+        self.analysis_offset = settings.get('analysis_offset_sec', 0) or 0.0
+        self.max_upload_duration = settings.get('max_upload_duration_sec', 3600) or None
+        self.segment_length_sec = settings.get('segment_length_sec', 8)
+        self.analysis_mode = settings.get('analysis_mode', 'segment')
+        self.analysis_batch_size = settings.get('analysis_batch_size', 8)
+        
+        # Qualitätsstufen (fast / balanced / accurate), pro Anfrage wählbar
+        quality_overrides = settings.get('quality_tiers') or {}
+        self.quality_tiers: Dict[str, AnalysisQuality] = {}
+        for name in QUALITY_TIERS:
+            quality = resolve_quality(name, quality_overrides)
+            if quality.sample_rate is None:
+                quality = replace(quality, sample_rate=self.target_sr)
+            self.quality_tiers[name] = quality
+        self.default_quality = self.get_quality(settings.get('analysis_quality', DEFAULT_QUALITY))
+        self._tier_audio_services: Dict[str, AudioService] = {}
+        
+        # YIN-Suchbereich nach Instrument (sonst weiter Bereich C2-C7)
+        self.instrument_pitch_profiles = settings.get('instrument_pitch_profiles', True)
+        
+        # DTW im TemporalComparator (Suchfenster mit fester Obergrenze)
+        self.dtw_settings = resolve_dtw_settings({
+            'mode': settings.get('dtw_mode'),
+            'band_sec': settings.get('dtw_band_sec'),
+            'max_slope': settings.get('dtw_max_slope'),
+            'max_cells': settings.get('dtw_max_cells')
+        })
+        
+        # Globale Zuordnung Schüler -> Referenz vor der Segment-Analyse
+        self.segment_alignment = settings.get('segment_alignment', True)
+        self.alignment_step_sec = settings.get('alignment_step_sec', 0.2)
+        self.alignment_dtw = resolve_dtw_settings({
+            'mode': settings.get('alignment_dtw_mode', 'multiscale'),
+            'band_sec': settings.get('alignment_band_sec', 4.0),
+            'max_slope': settings.get('dtw_max_slope'),
+            'max_cells': settings.get('dtw_max_cells')
+        })
+        
+        # Stille-Erkennung (RMS-Gate über die gesamte Aufnahme)
+        self.skip_silent_segments = settings.get('skip_silent_segments', True)
+        self.silence_top_db = settings.get('silence_top_db', 50)
+        self.silence_floor_db = settings.get('silence_floor_db', -60)
+        self.min_active_sec = settings.get('min_active_sec', 0.5)
+        
+        # Persistenter Prozess-Pool, geteilt von allen Session-Pipelines
+        self.segment_executor = SegmentExecutor(analysis_workers)
+        
+        # Geteilter Thread-Pool für unabhängige Analyzer/Comparators (FFT, BLAS und
+        # YIN geben den GIL frei; kein zusätzlicher Speicher wie beim Prozess-Pool)
+        self.task_executor = None
+        if analysis_threads > 1:
+            self.task_executor = ThreadPoolExecutor(
+                max_workers=analysis_threads, thread_name_prefix="AnalysisTask"
+            )
+        
+        # Sessionübergreifender Cache (Dekodierung + Segment-Features nach Content-Hash),
+        # persistiert im Feature Store
+        self.analysis_cache = AnalysisCache(
+            max_bytes=settings.get('analysis_cache_mb', 256) * 1024 * 1024,
+            store=feature_store
+        )
     
-    def get_pipeline(self, session_id: str, session_path: str) -> AudioFeedbackPipeline:
-        """Holt oder erstellt eine Pipeline für eine Session.
+    def get_quality(self, name: Optional[str] = None) -> AnalysisQuality:
+        """Gibt den Parametersatz einer Qualitätsstufe zurück.
+        
+        Args:
+            name: Name der Stufe ('fast', 'balanced', 'accurate'; None = Standard aus der Config)
+            
+        Returns:
+            AnalysisQuality: Parametersatz der Stufe
+            
+        Raises:
+            InvalidQualityTierException: Bei unbekannter Stufe
+        """
+        if name is None:
+            return self.default_quality
+        quality = self.quality_tiers.get(str(name).strip().lower())
+        if quality is None:
+            raise InvalidQualityTierException(
+                f"Unbekannte Qualitätsstufe '{name}' (erlaubt: {', '.join(self.quality_tiers)})"
+            )
+        return quality
+    
+    def get_pitch_profiles(self, referenz_instrument: Optional[str] = None,
+                           schueler_instrument: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """Ordnet den Instrument-Angaben ihre Pitch-Profile zu.
+        
+        Args:
+            referenz_instrument: Instrument der Referenz
+            schueler_instrument: Instrument des Schülers
+            
+        Returns:
+            Dict: Rolle ('referenz'/'schueler') -> Profilname (None = weiter Standard-Bereich)
+        """
+        profiles = {}
+        for role, instrument in (('referenz', referenz_instrument), ('schueler', schueler_instrument)):
+            profile = find_pitch_profile(instrument) if self.instrument_pitch_profiles else None
+            profiles[role] = profile.name if profile else None
+        return profiles
+    
+    def _audio_service_for(self, quality: AnalysisQuality):
+        """AudioService, der mit dem Resampler der Qualitätsstufe dekodiert."""
+        if quality.resample_quality == getattr(self.audio_service, 'resample_quality', 'HQ'):
+            return self.audio_service
+        if quality.name not in self._tier_audio_services:
+            self._tier_audio_services[quality.name] = AudioService(
+                quality.sample_rate,
+                stream_block_sec=self.audio_service.stream_block_sec,
+                resample_quality=quality.resample_quality
+            )
+        return self._tier_audio_services[quality.name]
+    
+    def get_pipeline(self, session_id: str, session_path: str,
+                     quality: Optional[AnalysisQuality] = None,
+                     pitch_profiles: Optional[Dict[str, Optional[str]]] = None) -> AudioFeedbackPipeline:
+        """Holt oder erstellt eine Pipeline für eine Session, Qualitätsstufe und Pitch-Profile.
         
         Args:
             session_id: Session-ID
             session_path: Pfad zum Session-Ordner
+            quality: Qualitätsstufe (None = Standard aus der Config)
+            pitch_profiles: Pitch-Profil pro Rolle (None = weiter Standard-Bereich)
             
         Returns:
             AudioFeedbackPipeline: Pipeline-Instanz
         """
-        if session_id not in self.pipelines:
-            self.pipelines[session_id] = AudioFeedbackPipeline(
+        quality = quality or self.default_quality
+        pitch_profiles = pitch_profiles or {}
+        key = (session_id, quality.name, pitch_profiles.get('referenz'), pitch_profiles.get('schueler'))
+        if key not in self.pipelines:
+            self.pipelines[key] = AudioFeedbackPipeline(
                 upload_folder=session_path,
-                target_sr=22050,
-                target_length=60,
+                target_sr=quality.sample_rate,
+                target_length=self.target_length,
                 report_variant=self.report_variant,
-                report_config=self.report_config
+                report_config=self.report_config,
+                analysis_mode=self.analysis_mode,
+                segment_executor=self.segment_executor,
+                analysis_cache=self.analysis_cache,
+                batch_size=self.analysis_batch_size,
+                task_executor=self.task_executor,
+                quality=quality,
+                pitch_profiles=pitch_profiles,
+                dtw=self.dtw_settings
+            )
+        return self.pipelines[key]
+    
+    def get_content_key(self, file_hash: Optional[str]) -> Optional[str]:
+        """Schlüssel für den analysierten Inhalt einer Datei (Hash + Analyse-Fenster).
+        
+        Args:
+            file_hash: SHA-256 der Datei
+            
+        Returns:
+            Optional[str]: Hash, bei aktivem Analyse-Fenster um das Fenster ergänzt
+        """
+        if not file_hash or not (self.analysis_offset or self.target_length):
+            return file_hash
+        return f"{file_hash}@{self.analysis_offset:g}+{self.target_length or 0:g}"
+    
+    def inspect_upload(self, file_path: Path) -> Dict[str, Any]:
+        """Prüft eine hochgeladene Aufnahme anhand ihres Headers, bevor Arbeit eingeplant wird.
+        
+        Args:
+            file_path: Pfad zur hochgeladenen Datei
+            
+        Returns:
+            Dict: Header-Daten (duration_sec, sample_rate, channels, format),
+            analysis_window (siehe get_analysis_window) und estimated_segments
+            
+        Raises:
+            InvalidFileFormatException: Wenn die Datei beschädigt ist oder keine Audiospur hat
+            AudioLimitExceededException: Wenn die Aufnahme länger als erlaubt ist
+        """
+        info = self.audio_service.probe_audio(file_path)
+        if self.max_upload_duration and info["duration_sec"] > self.max_upload_duration:
+            raise AudioLimitExceededException(
+                f"Aufnahme zu lang: {Path(file_path).name} dauert {info['duration_sec'] / 60:.1f} min "
+                f"(erlaubt sind höchstens {self.max_upload_duration / 60:.0f} min)"
             )
-        return self.pipelines[session_id]
+        
+        window = self.get_analysis_window(file_path, source_duration=info["duration_sec"])
+        info["analysis_window"] = window
+        info["estimated_segments"] = max(
+            math.ceil(window["analyzed_duration_sec"] / self.segment_length_sec), 1
+        )
+        return info
     
-    def analyze_recordings(
+    def get_analysis_window(self, file_path: Path, source_duration: Optional[float] = None) -> Dict[str, Any]:
+        """Beschreibt das Analyse-Fenster einer Aufnahme (für die API-Antwort).
+        
+        Args:
+            file_path: Pfad zur hochgeladenen Datei
+            source_duration: Bereits bekannte Dauer (z.B. aus inspect_upload),
+                sonst wird der Header gelesen
+            
+        Returns:
+            Dict: offset_sec, max_duration_sec, source_duration_sec,
+            analyzed_duration_sec und truncated (True wenn Audio außerhalb
+            des Fensters ignoriert wurde)
+        """
+        if source_duration is None:
+            source_duration = self.audio_service.get_file_duration(file_path)
+        window = {
+            "offset_sec": self.analysis_offset,
+            "max_duration_sec": self.target_length,
+            "source_duration_sec": source_duration,
+            "analyzed_duration_sec": None,
+            "truncated": False
+        }
+        if source_duration is not None:
+            analyzed = max(source_duration - self.analysis_offset, 0.0)
+            if self.target_length:
+                analyzed = min(analyzed, self.target_length)
+            window["analyzed_duration_sec"] = round(analyzed, 3)
+            window["truncated"] = analyzed < source_duration - 0.01
+        return window
+    
+    def export_segment(self, session_path: Path, source_path: Path, base_filename: str,
+                       segment_index: int) -> Optional[Path]:
+        """Erzeugt die Wiedergabe-Datei eines Segments (lazy, siehe app_factory).
+        
+        Segment-Länge und Analyse-Fenster stammen aus derselben Config wie
+        load_segments, damit die Wiedergabe genau das analysierte Segment zeigt.
+        
+        Args:
+            session_path: Session-Verzeichnis (Segmente landen in segments/)
+            source_path: Pfad zur hochgeladenen Original-Datei
+            base_filename: Basis-Name der Segmente (z.B. 'referenz')
+            segment_index: Index des Segments (0-basiert)
+            
+        Returns:
+            Pfad zur Segment-Datei oder None wenn der Index ungültig ist
+        """
+        return self.audio_service.export_segment(
+            source_path,
+            session_path,
+            segment_index,
+            self.segment_length_sec,
+            base_filename=base_filename,
+            offset=self.analysis_offset,
+            duration=self.target_length
+        )
+    
+    @staticmethod
+    def window_filename(base_filename: str, start_sample: int, end_sample: int,
+                        quality: AnalysisQuality) -> str:
+        """Dateiname eines zugeordneten Fensters (<rolle>_window_<start>_<ende>_<stufe>.wav).
+        
+        Die Samples beziehen sich auf die Sample-Rate der Qualitätsstufe,
+        daher gehört die Stufe zum Namen.
+        """
+        return f"{base_filename}_window_{start_sample}_{end_sample}_{quality.name}.wav"
+    
+    def export_window(self, session_path: Path, source_path: Path, filename: str,
+                      start_sample: int, end_sample: int, quality_name: str) -> Optional[Path]:
+        """Erzeugt die Wiedergabe-Datei eines zugeordneten Fensters (lazy, siehe app_factory).
+        
+        Dekodiert wird wie in load_segments (Sample-Rate und Resampler der
+        Stufe, Analyse-Fenster aus der Config), sodass die Datei genau die
+        analysierten Samples enthält.
+        
+        Args:
+            session_path: Session-Verzeichnis (Dateien landen in segments/)
+            source_path: Pfad zur hochgeladenen Original-Datei
+            filename: Angefragter Dateiname (aus window_filename)
+            start_sample: Erstes Sample des Fensters
+            end_sample: Sample nach dem Ende des Fensters
+            quality_name: Qualitätsstufe, mit der das Fenster geschnitten wurde
+            
+        Returns:
+            Pfad zur Datei oder None wenn Stufe oder Fenster ungültig sind
+        """
+        quality = self.quality_tiers.get(quality_name)
+        if quality is None:
+            return None
+        return self._audio_service_for(quality).export_window(
+            source_path,
+            session_path,
+            filename,
+            start_sample,
+            end_sample,
+            sr=quality.sample_rate,
+            offset=self.analysis_offset,
+            duration=self.target_length
+        )
+    
+    def _alignment_token(self) -> str:
+        """Kennung der Zuordnungs-Einstellungen für Ergebnis-Schlüssel."""
+        if not self.segment_alignment:
+            return "aligned:off"
+        return f"aligned:{self.alignment_step_sec}:{self.alignment_dtw.cache_token}"
+    
+    def load_segments(self, file_path: Path, base_filename: str,
+                      file_hash: Optional[str] = None,
+                      quality: Optional[AnalysisQuality] = None) -> Tuple[np.ndarray, List[Dict]]:
+        """Dekodiert eine Aufnahme einmalig und berechnet die Segment-Grenzen.
+        
+        Dekodiert wird nur das Analyse-Fenster (analysis_offset_sec,
+        target_length_sec); Samples dahinter werden nie gelesen.
+        Es werden keine Segment-Dateien geschrieben. Der Dateiname im
+        Segment verweist auf die Datei, die bei Bedarf für die Wiedergabe
+        erzeugt wird (siehe AudioService.export_segment).
+        
+        Args:
+            file_path: Pfad zur hochgeladenen Datei
+            base_filename: Basis-Name der Segmente (z.B. 'referenz')
+            file_hash: SHA-256 der Datei (aktiviert den Dekodier-Cache)
+            quality: Qualitätsstufe (Sample-Rate und Resampler; None = Standard)
+            
+        Returns:
+            Tuple von (audio_array, Segment-Liste)
+        """
+        quality = quality or self.default_quality
+        sr = quality.sample_rate
+        audio_service = self._audio_service_for(quality)
+        window = {"offset": self.analysis_offset, "duration": self.target_length}
+        content_key = self.get_content_key(file_hash)
+        cache_key = ('audio', content_key, sr, quality.resample_quality)
+        if audio_service.has_pcm(file_path, sr, **window):
+            # Bereits dekodiert: PCM-Datei read-only mappen
+            audio, _ = audio_service.load_audio(file_path, sr=sr, **window)
+        else:
+            audio = self.analysis_cache.get(cache_key) if content_key else None
+            if audio is None:
+                audio, _ = audio_service.load_audio(file_path, sr=sr, **window)
+                if content_key:
+                    self.analysis_cache.put(cache_key, audio)
+            else:
+                print(f"♻️ Dekodierung aus Cache: {base_filename} ({file_hash[:12]})")
+                # PCM-Datei anlegen, damit spätere Zugriffe (z.B. Segment-Export) nicht
+                # dekodieren und Worker die Session-Datei statt des Store-Blobs mappen
+                if audio_service.store_pcm(file_path, audio, sr, **window) is not None:
+                    audio, _ = audio_service.load_audio(file_path, sr=sr, **window)
+        segment_samples = self.segment_length_sec * sr
+        
+        segments = []
+        bounds = self.audio_service.get_segment_bounds(len(audio), sr, self.segment_length_sec)
+        for idx, (start, end) in enumerate(bounds):
+            segments.append({
+                "filename": f"{base_filename}_segment_{idx}.wav",
+                # Zeitangaben relativ zur Original-Datei
+                "start_sec": self.analysis_offset + idx * self.segment_length_sec,
+                "end_sec": self.analysis_offset + (idx + 1) * self.segment_length_sec,
+                "start_sample": start,
+                "end_sample": end,
+                "segment_samples": segment_samples
+            })
+        
+        if self.skip_silent_segments:
+            self.mark_silence(audio, segments, sr)
+        
+        return audio, segments
+    
+    def mark_silence(self, audio: np.ndarray, segments: List[Dict], sr: Optional[int] = None):
+        """Markiert stille Segmente und kürzt das letzte auf seine tatsächliche Länge.
+        
+        Ein günstiges RMS-Gate läuft einmal über die gesamte Aufnahme.
+        Segmente ohne (ausreichend) aktives Signal erhalten silent=True und
+        werden von der Pipeline nicht analysiert, wenn auch das Gegenstück
+        still ist. Das kürzere letzte Segment wird nicht mehr mit Nullen
+        aufgefüllt und endet mit dem letzten aktiven Block, damit Padding
+        und Raumrauschen am Ende Statistiken wie min_rms oder num_silences
+        nicht verfälschen.
+        
+        Args:
+            audio: Dekodierte Aufnahme
+            segments: Segmente aus load_segments (werden angepasst)
+            sr: Sample-Rate der Aufnahme (None = default_sample_rate)
+        """
+        sr = sr or self.target_sr
+        activity, block = self.audio_service.compute_activity(
+            audio, sr, top_db=self.silence_top_db, floor_db=self.silence_floor_db
+        )
+        min_active = int(self.min_active_sec * sr)
+        
+        for segment in segments:
+            start, end = segment["start_sample"], segment["end_sample"]
+            active = self.audio_service.get_active_range(activity, block, start, end)
+            if active is None or active[1] - active[0] < min_active:
+                segment["silent"] = True
+            elif end - start < segment["segment_samples"]:
+                # Letztes Segment: ohne Padding, bis zum Ende des aktiven Signals
+                segment["end_sample"] = active[1]
+                segment["segment_samples"] = None
+                segment["trimmed"] = True
+    
+    def align_segments(self, referenz_audio: np.ndarray, ref_segments: List[Dict],
+                       schueler_audio: np.ndarray, sch_segments: List[Dict],
+                       quality: Optional[AnalysisQuality] = None,
+                       base_filename: str = "schueler") -> List[Dict]:
+        """Schneidet die Schüler-Segmente passend zu den Referenz-Segmenten.
+        
+        Ein DTW-Durchlauf über beide Aufnahmen (grobe Chroma-/Onset-Features,
+        siehe features.alignment) liefert eine Zeit-Abbildung Referenz ->
+        Schüler. Jedes Referenz-Segment erhält das Schüler-Fenster gleicher
+        Länge ab dem abgebildeten Startzeitpunkt, damit Segment-Batches
+        gleich lang bleiben. Jedes Fenster erhält eine eigene Wiedergabe-Datei
+        mit seinen Sample-Grenzen im Namen (window_filename). Die N x M
+        Ähnlichkeitsmatrix (Referenz-Segmente x Schüler-Raster) wird pro
+        Segment als "alignment" mitgegeben.
+        
+        Args:
+            referenz_audio: Dekodierte Referenz-Aufnahme
+            ref_segments: Referenz-Segmente aus load_segments
+            schueler_audio: Dekodierte Schüler-Aufnahme
+            sch_segments: Schüler-Segmente aus load_segments (festes Raster)
+            quality: Qualitätsstufe beider Aufnahmen (None = Standard)
+            base_filename: Basis-Name der Wiedergabe-Dateien (siehe window_filename)
+            
+        Returns:
+            Schüler-Segmente, eines pro Referenz-Segment
+        """
+        quality = quality or self.default_quality
+        sr = quality.sample_rate
+        segment_samples = int(round(self.segment_length_sec * sr))
+        
+        ref_features, frame_sec = alignment_features(
+            FeatureContext(referenz_audio, sr, quality), self.alignment_step_sec
+        )
+        sch_features, _ = alignment_features(
+            FeatureContext(schueler_audio, sr, quality), self.alignment_step_sec
+        )
+        if ref_features.shape[1] < 2 or sch_features.shape[1] < 2:
+            return sch_segments
+        time_map = align_recordings(ref_features, sch_features, frame_sec, self.alignment_dtw)
+        
+        ref_starts = np.array([seg["start_sample"] for seg in ref_segments]) / sr
+        sch_starts = np.round(time_map.to_schueler(ref_starts) * sr).astype(np.int64)
+        sch_starts = np.clip(sch_starts, 0, max(len(schueler_audio) - 1, 0))
+        
+        # Ähnlichkeit aller Referenz-Segmente mit dem Schüler-Raster und den zugeordneten Fenstern
+        ref_bounds = np.array([[seg["start_sample"], seg["end_sample"]] for seg in ref_segments]) / sr
+        grid_bounds = np.array([[seg["start_sample"], seg["end_sample"]] for seg in sch_segments]) / sr
+        aligned_bounds = np.stack([sch_starts, sch_starts + segment_samples], axis=1) / sr
+        similarity = segment_similarity(ref_features, sch_features, frame_sec, ref_bounds, grid_bounds)
+        pair_similarity = np.diag(segment_similarity(
+            ref_features, sch_features, frame_sec, ref_bounds, aligned_bounds
+        ))
+        
+        aligned = []
+        for i, start in enumerate(sch_starts.tolist()):
+            aligned.append({
+                "start_sec": round(self.analysis_offset + start / sr, 3),
+                "start_sample": start,
+                "end_sample": min(start + segment_samples, len(schueler_audio)),
+                "segment_samples": segment_samples,
+                "alignment": {
+                    "similarity": round(float(pair_similarity[i]), 3),
+                    "best_match": int(np.argmax(similarity[i])) + 1,
+                    "best_similarity": round(float(np.max(similarity[i])), 3)
+                }
+            })
+        
+        if self.skip_silent_segments:
+            self.mark_silence(schueler_audio, aligned, sr)
+        
+        # Wiedergabe-Datei und Ende erst nach dem Kürzen durch mark_silence festlegen,
+        # damit beide genau das analysierte Fenster beschreiben
+        for segment in aligned:
+            segment["filename"] = self.window_filename(
+                base_filename, segment["start_sample"], segment["end_sample"], quality
+            )
+            segment["end_sec"] = round(self.analysis_offset + segment["end_sample"] / sr, 3)
+        
+        summary = time_map.summary()
+        print(f"🧭 Globale Zuordnung: Versatz {summary['start_offset_sec']:+.2f}s, "
+              f"Tempo-Verhältnis {summary['tempo_ratio']:.2f}")
+        return aligned
+    
+    def analyze_files(
+        self,
+        session_id: str,
+        session_path: str,
+        referenz_path: Path,
+        schueler_path: Path,
+        referenz_hash: Optional[str] = None,
+        schueler_hash: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        segment_callback: Optional[Callable[[Dict, str], None]] = None,
+        memo: Optional[SessionAnalysisMemo] = None,
+        quality: Optional[AnalysisQuality] = None,
+        pitch_profiles: Optional[Dict[str, Optional[str]]] = None
+    ) -> List[Dict]:
+        """Dekodiert, segmentiert und analysiert beide Aufnahmen (ohne Prompt).
+        
+        Wird für die Vorab-Analyse direkt nach dem Upload verwendet; der
+        Prompt entsteht später mit render_feedback.
+        
+        Args:
+            session_id: Session-ID
+            session_path: Pfad zum Session-Ordner
+            referenz_path: Pfad zur Referenz-Datei
+            schueler_path: Pfad zur Schüler-Datei
+            referenz_hash: SHA-256 der Referenz-Datei (Cache-Schlüssel)
+            schueler_hash: SHA-256 der Schüler-Datei (Cache-Schlüssel)
+            progress_callback: Optionaler Callback (erledigte Segmente, Gesamtanzahl)
+            segment_callback: Optionaler Callback (Segment-Ergebnis, Report-Abschnitt)
+            memo: Optionales SessionAnalysisMemo; bei unveränderten Dateien werden
+                die Segment-Ergebnisse ohne Audio-Verarbeitung zurückgegeben
+            quality: Qualitätsstufe (None = Standard aus der Config)
+            pitch_profiles: Pitch-Profil pro Rolle (siehe get_pitch_profiles;
+                None = weiter Standard-Bereich, z.B. in der Vorab-Analyse)
+            
+        Returns:
+            List[Dict]: Segment-Ergebnisse
+        """
+        quality = quality or self.default_quality
+        pipeline = self.get_pipeline(session_id, session_path, quality, pitch_profiles)
+        on_segment = pipeline.with_report_sections(segment_callback)
+        
+        # Cache-Schlüssel beziehen sich auf den analysierten Ausschnitt
+        referenz_key = self.get_content_key(referenz_hash)
+        schueler_key = self.get_content_key(schueler_hash)
+        
+        # Gleiche Dateien und Pipeline-Version -> nur noch Prompt rendern
+        results_key = None
+        if memo is not None and referenz_hash and schueler_hash:
+            results_key = (
+                'results', referenz_key, schueler_key, pipeline.cache_version,
+                pipeline.target_sr, self.segment_length_sec, self.analysis_mode,
+                pipeline.pitch_profiles['referenz'], pipeline.pitch_profiles['schueler'],
+                self._alignment_token()
+            )
+            segment_results = memo.get(results_key)
+            if segment_results is not None:
+                print(f"♻️ Segment-Ergebnisse aus Session-Memo ({len(segment_results)} Segmente)")
+                for segment_result in segment_results:
+                    if on_segment is not None:
+                        on_segment(segment_result)
+                if progress_callback is not None:
+                    progress_callback(len(segment_results), len(segment_results))
+                return segment_results
+        
+        referenz_audio, ref_segments = self.load_segments(
+            referenz_path, "referenz", file_hash=referenz_hash, quality=quality
+        )
+        schueler_audio, sch_segments = self.load_segments(
+            schueler_path, "schueler", file_hash=schueler_hash, quality=quality
+        )
+        if self.segment_alignment and ref_segments and sch_segments and not (
+            referenz_key is not None and referenz_key == schueler_key
+        ):
+            sch_segments = self.align_segments(
+                referenz_audio, ref_segments, schueler_audio, sch_segments, quality
+            )
+        
+        segment_results = pipeline.analyze_segments(
+            ref_segments, sch_segments, referenz_audio, schueler_audio, referenz_key, schueler_key,
+            progress_callback=progress_callback,
+            segment_callback=on_segment,
+            memo=memo
+        )
+        
+        if results_key is not None:
+            memo.put(results_key, segment_results)
+        return segment_results
+    
+    def render_feedback(
         self,
         session_id: str,
         session_path: str,
-        referenz_segments: List[str],
-        schueler_segments: List[str],
+        segment_results: List[Dict],
         language: str = "english",
         referenz_instrument: str = "keine Angabe",
         schueler_instrument: str = "keine Angabe",
         personal_message: str = "",
         prompt_type: str = "contextual",
-        use_simple_language: bool = False
+        use_simple_language: bool = False,
+        quality: Optional[AnalysisQuality] = None
     ) -> Dict[str, Any]:
-        """Führt vollständige Audio-Analyse durch.
+        """Erzeugt den Feedback-Prompt aus vorliegenden Segment-Ergebnissen.
         
         Args:
             session_id: Session-ID
             session_path: Pfad zum Session-Ordner
-            referenz_segments: Liste der Referenz-Segment-Dateinamen
-            schueler_segments: Liste der Schüler-Segment-Dateinamen
+            segment_results: Segment-Ergebnisse (z.B. aus der Vorab-Analyse)
             language: Sprache für Feedback
             referenz_instrument: Instrument der Referenz
             schueler_instrument: Instrument des Schülers
             personal_message: Persönliche Nachricht
             prompt_type: Art des Prompts
             use_simple_language: Einfache Sprache verwenden
+            quality: Qualitätsstufe der Segment-Ergebnisse (None = Standard)
             
         Returns:
-            Dict: Analyse-Ergebnisse mit system_prompt und analysis_data
+            Dict: system_prompt und analysis_data
         """
-        # Hole Pipeline für diese Session
-        pipeline = self.get_pipeline(session_id, session_path)
-        
-        # Führe Analyse durch
-        result = pipeline.analyze_and_generate_feedback(
-            referenz_segments,
-            schueler_segments,
+        pitch_profiles = self.get_pitch_profiles(referenz_instrument, schueler_instrument)
+        pipeline = self.get_pipeline(session_id, session_path, quality, pitch_profiles)
+        return pipeline.generate_feedback(
+            segment_results,
             language,
             referenz_instrument,
             schueler_instrument,
@@ -91,17 +646,22 @@ class AudioFeedbackService:
             prompt_type,
             use_simple_language
         )
-        
-        return result
     
     def cleanup_session(self, session_id: str):
-        """Entfernt Pipeline-Cache für eine Session.
+        """Entfernt die Pipelines einer Session (alle Qualitätsstufen und Profile).
         
         Args:
             session_id: Session-ID
         """
-        if session_id in self.pipelines:
-            del self.pipelines[session_id]
+        for key in [key for key in self.pipelines if key[0] == session_id]:
+            del self.pipelines[key]
+    
+    def shutdown(self):
+        """Beendet Prozess- und Thread-Pool und leert den Pipeline-Cache."""
+        self.segment_executor.shutdown()
+        if self.task_executor is not None:
+            self.task_executor.shutdown(wait=False, cancel_futures=True)
+        self.pipelines.clear()
     
     def get_language_name(self, language_code: str, custom_language: str = "") -> str:
         """Konvertiert Sprach-Code in Anzeigename.
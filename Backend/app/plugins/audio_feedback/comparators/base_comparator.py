@@ -2,7 +2,9 @@
 
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from ..features import FeatureContext, BatchFeatureContext
 
 class BaseComparator(ABC):
     """Abstract Base Class für Audio Comparators.
@@ -10,16 +12,131 @@ class BaseComparator(ABC):
     Comparators vergleichen Features zwischen Referenz- und Schüler-Aufnahmen.
     """
     
+    # Version der Vergleichs-Logik (Teil der Cache-Schlüssel, bei Änderungen erhöhen)
+    version = "1"
+    
+    # Ergebnisse pro Teilschritt für inhaltsgleiche Aufnahmen (None = immer berechnen)
+    identical_results: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    # Mindest-Sample-Rate pro Teilschritt (fehlende Schritte = volle Rate); der
+    # Schritt erhält die passende Stufe der Signal-Pyramide
+    analysis_rates: Dict[str, int] = {}
+    
     @abstractmethod
     def compare(self, ref_data: Tuple[np.ndarray, int], 
-                sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+                sch_data: Tuple[np.ndarray, int],
+                ref_context: Optional[FeatureContext] = None,
+                sch_context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Vergleicht zwei Audio-Aufnahmen.
         
         Args:
             ref_data: Referenz-Audio als (audio_array, sample_rate)
             sch_data: Schüler-Audio als (audio_array, sample_rate)
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Vergleichsmetriken
         """
         pass
+    
+    def compare_batch(self, ref_batch: Tuple[np.ndarray, int],
+                      sch_batch: Tuple[np.ndarray, int],
+                      ref_contexts: Optional[List[FeatureContext]] = None,
+                      sch_contexts: Optional[List[FeatureContext]] = None,
+                      steps: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Vergleicht Signal-Paare zeilenweise (z.B. alle Segment-Paare einer Aufnahme).
+        
+        Die Frame-Repräsentationen werden pro Rolle über einen
+        BatchFeatureContext gemeinsam berechnet; der Vergleich pro Paar
+        übernimmt compare().
+        
+        Args:
+            ref_batch: Referenz als (Audio-Matrix Signale x Samples, sample_rate)
+            sch_batch: Schüler als (Audio-Matrix Signale x Samples, sample_rate)
+            ref_contexts: Optionale FeatureContexts pro Referenz-Zeile
+            sch_contexts: Optionale FeatureContexts pro Schüler-Zeile
+            steps: Auszuführende Teilschritte (None = alle)
+            
+        Returns:
+            Liste mit Vergleichsmetriken pro Paar
+        """
+        ref_y, ref_sr = ref_batch
+        sch_y, sch_sr = sch_batch
+        if ref_contexts is None:
+            ref_contexts = BatchFeatureContext(ref_y, ref_sr).rows()
+        if sch_contexts is None:
+            sch_contexts = BatchFeatureContext(sch_y, sch_sr).rows()
+        return [
+            self.compare((ref_ctx.y, ref_sr), (sch_ctx.y, sch_sr), ref_ctx, sch_ctx, steps)
+            for ref_ctx, sch_ctx in zip(ref_contexts, sch_contexts)
+        ]
+    
+    def _get_contexts(self, ref_data: Tuple[np.ndarray, int],
+                      sch_data: Tuple[np.ndarray, int],
+                      ref_context: Optional[FeatureContext] = None,
+                      sch_context: Optional[FeatureContext] = None) -> Tuple[FeatureContext, FeatureContext]:
+        """Gibt die geteilten FeatureContexts zurück oder erstellt lokale.
+        
+        Args:
+            ref_data: Referenz-Audio
+            sch_data: Schüler-Audio
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            
+        Returns:
+            Tuple von (ref_context, sch_context)
+        """
+        if ref_context is None:
+            ref_context = FeatureContext.from_audio_data(ref_data)
+        if sch_context is None:
+            sch_context = FeatureContext.from_audio_data(sch_data)
+        return ref_context, sch_context
+    
+    def _contexts_at(self, step: str, ref_context: FeatureContext,
+                     sch_context: FeatureContext) -> Tuple[FeatureContext, FeatureContext]:
+        """Gibt die Pyramiden-Stufen beider Contexts für einen Teilschritt zurück.
+        
+        Args:
+            step: Name des Teilschritts
+            ref_context: FeatureContext der Referenz
+            sch_context: FeatureContext des Schülers
+            
+        Returns:
+            Tuple von (ref_context, sch_context) bei der Rate des Schritts
+        """
+        rate = self.analysis_rates.get(step)
+        return ref_context.at_rate(rate), sch_context.at_rate(rate)
+    
+    def compare_identical(self, steps: Optional[Set[str]] = None) -> Optional[Dict[str, Any]]:
+        """Gibt die Vergleichsmetriken für inhaltsgleiche Aufnahmen zurück.
+        
+        Args:
+            steps: Auszuführende Teilschritte (None = alle)
+            
+        Returns:
+            Dict mit Vergleichsmetriken oder None wenn berechnet werden muss
+        """
+        if self.identical_results is None:
+            return None
+        
+        results = {}
+        for step, values in self.identical_results.items():
+            if self._wants(step, steps):
+                results.update(values)
+        return results
+    
+    @staticmethod
+    def _wants(step: str, steps: Optional[Set[str]]) -> bool:
+        """Prüft ob ein Teilschritt ausgeführt werden soll.
+        
+        Args:
+            step: Name des Teilschritts (siehe FeatureRegistry)
+            steps: Angeforderte Teilschritte (None = alle)
+            
+        Returns:
+            True wenn der Schritt berechnet werden soll
+        """
+        return steps is None or step in steps
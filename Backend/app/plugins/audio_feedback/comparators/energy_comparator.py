@@ -1,56 +1,59 @@
 # Energy Comparator - Energie-Envelope-Vergleiche
 
-import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_comparator import BaseComparator
+from ..features import FeatureContext
 
 class EnergyComparator(BaseComparator):
     """Comparator für Energie- und Dynamik-Vergleiche."""
     
+    identical_results = {
+        'energy_envelope': {"energy_envelope_correlation": 1.0},
+    }
+    
+    # RMS-Envelope bei 11025 Hz (Signal-Pyramide)
+    analysis_rates = {'energy_envelope': 11025}
+    
     def compare(self, ref_data: Tuple[np.ndarray, int], 
-                sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+                sch_data: Tuple[np.ndarray, int],
+                ref_context: Optional[FeatureContext] = None,
+                sch_context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Vergleicht Energie-Envelopes zwischen Referenz und Schüler.
         
         Args:
             ref_data: Referenz-Audio
             sch_data: Schüler-Audio
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Energie-Vergleichsmetriken
         """
+        ref_ctx, sch_ctx = self._get_contexts(ref_data, sch_data, ref_context, sch_context)
+        
         results = {}
         
         # Energy Envelope Correlation
-        energy_corr = self._compare_energy_envelope(ref_data, sch_data)
-        results.update(energy_corr)
+        if self._wants('energy_envelope', steps):
+            results.update(self._compare_energy_envelope(
+                *self._contexts_at('energy_envelope', ref_ctx, sch_ctx)
+            ))
         
         return results
     
-    def _compare_energy_envelope(self, ref_data: Tuple[np.ndarray, int], 
-                                sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def _compare_energy_envelope(self, ref_ctx: FeatureContext, 
+                                sch_ctx: FeatureContext) -> Dict[str, Any]:
         """Vergleicht Energie-Envelopes."""
-        y_ref, sr_ref = ref_data
-        y_sch, sr_sch = sch_data
-        n_fft = min(2048, len(y_ref), len(y_sch))
+        n_fft = min(ref_ctx.n_fft, len(ref_ctx.y), len(sch_ctx.y))
         
         frame_length = n_fft
-        hop_length = min(512, frame_length // 2)
-        
-        energy_ref = librosa.feature.rms(
-            y=y_ref, frame_length=frame_length, hop_length=hop_length
-        )[0]
-        energy_sch = librosa.feature.rms(
-            y=y_sch, frame_length=frame_length, hop_length=hop_length
-        )[0]
-        
-        min_len = min(len(energy_ref), len(energy_sch))
-        if min_len < 2:
-            return {"energy_envelope_correlation": None}
-        
-        energy_ref = energy_ref[:min_len]
-        energy_sch = energy_sch[:min_len]
+        hop_length = min(ref_ctx.hop_length, frame_length // 2)
         
-        correlation = float(np.corrcoef(energy_ref, energy_sch)[0, 1])
+        correlation = ref_ctx.correlation(
+            sch_ctx, 'rms', frame_length=frame_length, hop_length=hop_length
+        )
         
         return {"energy_envelope_correlation": correlation}
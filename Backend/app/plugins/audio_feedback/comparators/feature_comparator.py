@@ -1,14 +1,22 @@
 # Feature Comparator - MFCC und Chroma-Vergleiche
 
-import librosa
 import numpy as np
 import scipy.spatial
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_comparator import BaseComparator
+from ..features import FeatureContext
 
 class FeatureComparator(BaseComparator):
     """Comparator für Feature-basierte Vergleiche (MFCC, Chroma)."""
     
+    identical_results = {
+        'mfcc': {"mfcc_distance": 0.0},
+        'chroma': {"chroma_similarity": 1.0},
+    }
+    
+    # Chroma wie im PitchAnalyzer bei 11025 Hz (geteilte Pyramiden-Stufe)
+    analysis_rates = {'chroma': 11025}
+    
     def __init__(self, n_mfcc: int = 13):
         """Initialisiert den Feature Comparator.
         
@@ -18,62 +26,56 @@ class FeatureComparator(BaseComparator):
         self.n_mfcc = n_mfcc
     
     def compare(self, ref_data: Tuple[np.ndarray, int], 
-                sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+                sch_data: Tuple[np.ndarray, int],
+                ref_context: Optional[FeatureContext] = None,
+                sch_context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Vergleicht Features zwischen Referenz und Schüler.
         
         Args:
             ref_data: Referenz-Audio
             sch_data: Schüler-Audio
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit Vergleichsmetriken
         """
+        ref_ctx, sch_ctx = self._get_contexts(ref_data, sch_data, ref_context, sch_context)
+        
         results = {}
         
         # MFCC Distance
-        mfcc_dist = self._compare_mfcc(ref_data, sch_data)
-        results.update(mfcc_dist)
+        if self._wants('mfcc', steps):
+            results.update(self._compare_mfcc(ref_ctx, sch_ctx))
         
         # Chroma Similarity
-        chroma_sim = self._compare_chroma(ref_data, sch_data)
-        results.update(chroma_sim)
+        if self._wants('chroma', steps):
+            results.update(self._compare_chroma(*self._contexts_at('chroma', ref_ctx, sch_ctx)))
         
         return results
     
-    def _compare_mfcc(self, ref_data: Tuple[np.ndarray, int], 
-                     sch_data: Tuple[np.ndarray, int]) -> Dict[str, float]:
+    def _compare_mfcc(self, ref_ctx: FeatureContext, 
+                     sch_ctx: FeatureContext) -> Dict[str, float]:
         """Vergleicht MFCC-Features."""
-        y_ref, sr_ref = ref_data
-        y_sch, sr_sch = sch_data
-        n_fft = min(2048, len(y_ref), len(y_sch))
+        n_fft = min(ref_ctx.n_fft, len(ref_ctx.y), len(sch_ctx.y))
         
-        mfcc_ref = np.mean(
-            librosa.feature.mfcc(y=y_ref, sr=sr_ref, n_mfcc=self.n_mfcc, n_fft=n_fft), 
-            axis=1
-        )
-        mfcc_sch = np.mean(
-            librosa.feature.mfcc(y=y_sch, sr=sr_sch, n_mfcc=self.n_mfcc, n_fft=n_fft), 
-            axis=1
-        )
+        mfcc_ref = ref_ctx.stats('mfcc', n_mfcc=self.n_mfcc, n_fft=n_fft).mean()
+        mfcc_sch = sch_ctx.stats('mfcc', n_mfcc=self.n_mfcc, n_fft=n_fft).mean()
         
         distance = float(scipy.spatial.distance.euclidean(mfcc_ref, mfcc_sch))
         
         return {"mfcc_distance": distance}
     
-    def _compare_chroma(self, ref_data: Tuple[np.ndarray, int], 
-                       sch_data: Tuple[np.ndarray, int]) -> Dict[str, float]:
+    def _compare_chroma(self, ref_ctx: FeatureContext, 
+                       sch_ctx: FeatureContext) -> Dict[str, float]:
         """Vergleicht Chroma-Features (harmonische Ähnlichkeit)."""
         from sklearn.metrics.pairwise import cosine_similarity
         
-        y_ref, sr_ref = ref_data
-        y_sch, sr_sch = sch_data
-        
-        chroma_ref = librosa.feature.chroma_cqt(y=y_ref, sr=sr_ref)
-        chroma_sch = librosa.feature.chroma_cqt(y=y_sch, sr=sr_sch)
-        
         # Mittelwert über die Zeit
-        chroma_ref_mean = np.mean(chroma_ref, axis=1).reshape(1, -1)
-        chroma_sch_mean = np.mean(chroma_sch, axis=1).reshape(1, -1)
+        chroma_ref_mean = ref_ctx.stats('chroma').mean().reshape(1, -1)
+        chroma_sch_mean = sch_ctx.stats('chroma').mean().reshape(1, -1)
         
         similarity = float(cosine_similarity(chroma_ref_mean, chroma_sch_mean)[0, 0])
         
@@ -1,109 +1,105 @@
 # Temporal Comparator - Zeit-basierte Vergleiche (DTW, RMS Correlation)
 
-import librosa
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from .base_comparator import BaseComparator
+from ..features import FeatureContext, DTWSettings, dtw_align
 
 class TemporalComparator(BaseComparator):
     """Comparator für zeitliche Vergleiche und Synchronisation."""
     
-    def __init__(self, n_mfcc: int = 13):
+    # 2: DTW im Suchfenster (features/dtw.py) statt unbeschränkt
+    version = "2"
+    
+    identical_results = {
+        'dtw': {"dtw_distance": 0.0},
+        'rms': {"rms_correlation": 1.0},
+        'pitch_contour': {"pitch_contour_correlation": 1.0},
+    }
+    
+    # RMS und YIN bei 11025 Hz, DTW über MFCC bei voller Rate
+    analysis_rates = {'rms': 11025, 'pitch_contour': 11025}
+    
+    def __init__(self, n_mfcc: int = 13, dtw: Optional[DTWSettings] = None):
         """Initialisiert den Temporal Comparator.
         
         Args:
             n_mfcc: Anzahl MFCC-Koeffizienten für DTW
+            dtw: Suchfenster und Obergrenze für DTW (None = Sakoe-Chiba-Band, 2 s)
         """
         self.n_mfcc = n_mfcc
+        self.dtw = dtw or DTWSettings()
     
     def compare(self, ref_data: Tuple[np.ndarray, int], 
-                sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+                sch_data: Tuple[np.ndarray, int],
+                ref_context: Optional[FeatureContext] = None,
+                sch_context: Optional[FeatureContext] = None,
+                steps: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Vergleicht zeitliche Aspekte zwischen Referenz und Schüler.
         
         Args:
             ref_data: Referenz-Audio
             sch_data: Schüler-Audio
+            ref_context: Optionaler FeatureContext der Referenz
+            sch_context: Optionaler FeatureContext des Schülers
+            steps: Auszuführende Teilschritte (None = alle)
             
         Returns:
             Dict mit zeitlichen Vergleichsmetriken
         """
+        ref_ctx, sch_ctx = self._get_contexts(ref_data, sch_data, ref_context, sch_context)
+        
         results = {}
         
         # DTW Distance (Dynamic Time Warping)
-        dtw_dist = self._compare_dtw(ref_data, sch_data)
-        results.update(dtw_dist)
+        if self._wants('dtw', steps):
+            results.update(self._compare_dtw(ref_ctx, sch_ctx))
         
         # RMS Correlation (Lautstärke-Synchronisation)
-        rms_corr = self._compare_rms(ref_data, sch_data)
-        results.update(rms_corr)
+        if self._wants('rms', steps):
+            results.update(self._compare_rms(*self._contexts_at('rms', ref_ctx, sch_ctx)))
         
         # Pitch Contour Similarity (Melodie-Verlauf)
-        pitch_sim = self._compare_pitch_contour(ref_data, sch_data)
-        results.update(pitch_sim)
+        if self._wants('pitch_contour', steps):
+            results.update(self._compare_pitch_contour(
+                *self._contexts_at('pitch_contour', ref_ctx, sch_ctx)
+            ))
         
         return results
     
-    def _compare_dtw(self, ref_data: Tuple[np.ndarray, int], 
-                    sch_data: Tuple[np.ndarray, int]) -> Dict[str, float]:
-        """Vergleicht mit Dynamic Time Warping."""
-        from librosa.sequence import dtw
+    def _compare_dtw(self, ref_ctx: FeatureContext, 
+                    sch_ctx: FeatureContext) -> Dict[str, float]:
+        """Vergleicht mit Dynamic Time Warping (im Suchfenster aus self.dtw)."""
+        n_fft = min(ref_ctx.n_fft, len(ref_ctx.y), len(sch_ctx.y))
         
-        y_ref, sr_ref = ref_data
-        y_sch, sr_sch = sch_data
-        n_fft = min(2048, len(y_ref), len(y_sch))
-        
-        mfcc_ref = librosa.feature.mfcc(y=y_ref, sr=sr_ref, n_mfcc=self.n_mfcc, n_fft=n_fft)
-        mfcc_sch = librosa.feature.mfcc(y=y_sch, sr=sr_sch, n_mfcc=self.n_mfcc, n_fft=n_fft)
+        mfcc_ref = ref_ctx.mfcc(n_mfcc=self.n_mfcc, n_fft=n_fft)
+        mfcc_sch = sch_ctx.mfcc(n_mfcc=self.n_mfcc, n_fft=n_fft)
         
         min_frames = min(mfcc_ref.shape[1], mfcc_sch.shape[1])
         mfcc_ref = mfcc_ref[:, :min_frames]
         mfcc_sch = mfcc_sch[:, :min_frames]
         
-        D, wp = dtw(X=mfcc_ref, Y=mfcc_sch, metric="euclidean")
-        dtw_dist = float(D[-1, -1])
+        radius = self.dtw.radius_frames(ref_ctx.sr, ref_ctx.hop_length)
+        dtw_dist, _ = dtw_align(mfcc_ref, mfcc_sch, self.dtw, radius)
         
         return {"dtw_distance": dtw_dist}
     
-    def _compare_rms(self, ref_data: Tuple[np.ndarray, int], 
-                    sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def _compare_rms(self, ref_ctx: FeatureContext, 
+                    sch_ctx: FeatureContext) -> Dict[str, Any]:
         """Vergleicht RMS (Lautstärke-Synchronisation)."""
-        y_ref, sr_ref = ref_data
-        y_sch, sr_sch = sch_data
-        n_fft = min(2048, len(y_ref), len(y_sch))
-        
-        rms_ref = librosa.feature.rms(y=y_ref, frame_length=n_fft)[0]
-        rms_sch = librosa.feature.rms(y=y_sch, frame_length=n_fft)[0]
-        
-        min_len = min(len(rms_ref), len(rms_sch))
-        rms_ref = rms_ref[:min_len]
-        rms_sch = rms_sch[:min_len]
+        n_fft = min(ref_ctx.n_fft, len(ref_ctx.y), len(sch_ctx.y))
         
-        if min_len > 1:
-            corr = float(np.corrcoef(rms_ref, rms_sch)[0, 1])
-        else:
-            corr = None
+        corr = ref_ctx.correlation(sch_ctx, 'rms', frame_length=n_fft)
         
         return {"rms_correlation": corr}
     
-    def _compare_pitch_contour(self, ref_data: Tuple[np.ndarray, int], 
-                               sch_data: Tuple[np.ndarray, int]) -> Dict[str, Any]:
+    def _compare_pitch_contour(self, ref_ctx: FeatureContext, 
+                               sch_ctx: FeatureContext) -> Dict[str, Any]:
         """Vergleicht Tonhöhen-Verläufe."""
-        y_ref, sr_ref = ref_data
-        y_sch, sr_sch = sch_data
-        
-        # Pitch contour mit YIN berechnen
-        pitch_ref = librosa.yin(
-            y_ref,
-            fmin=librosa.note_to_hz("C2"),
-            fmax=librosa.note_to_hz("C7"),
-            sr=sr_ref,
-        )
-        pitch_sch = librosa.yin(
-            y_sch,
-            fmin=librosa.note_to_hz("C2"),
-            fmax=librosa.note_to_hz("C7"),
-            sr=sr_sch,
-        )
+        # Pitch contour mit YIN (geteilt mit dem PitchAnalyzer; Suchbereich
+        # aus dem Pitch-Profil des jeweiligen Instruments)
+        pitch_ref = ref_ctx.yin()
+        pitch_sch = sch_ctx.yin()
         
         # Nur gültige (nicht-Null) Werte verwenden
         valid_ref = pitch_ref[pitch_ref > 0]
@@ -0,0 +1,57 @@
+# Audio Features - Gemeinsame Zwischenrepräsentationen für Analyzer und Comparators
+
+from .feature_context import FeatureContext
+from .quality import AnalysisQuality, QUALITY_TIERS, DEFAULT_QUALITY, resolve_quality
+from .pitch_profiles import PitchProfile, PITCH_PROFILES, find_pitch_profile, apply_pitch_profile
+from .signal_pyramid import pyramid_factor, decimate
+from .dtw import DTWSettings, DTW_MODES, resolve_dtw_settings, dtw_window, banded_dtw, dtw_align
+from .alignment import TimeMap, alignment_features, align_recordings, segment_similarity
+from .segment_context import SegmentFeatureContext
+from .batch_context import BatchFeatureContext, BatchRowContext
+from .frame_statistics import PrefixStatistics, WindowStats, WindowedCorrelation
+from .frame_kernels import (
+    KEY_NAMES, CHORD_NAMES, best_chord_indices, threshold_attack_frames,
+    autocorrelation, first_local_maximum, successive_frame_distances
+)
+from .feature_registry import FeatureRegistry, FeatureSpec, AnalysisPlan, FEATURE_REGISTRY
+
+__all__ = [
+    'FeatureContext',
+    'AnalysisQuality',
+    'QUALITY_TIERS',
+    'DEFAULT_QUALITY',
+    'resolve_quality',
+    'PitchProfile',
+    'PITCH_PROFILES',
+    'find_pitch_profile',
+    'apply_pitch_profile',
+    'pyramid_factor',
+    'decimate',
+    'DTWSettings',
+    'DTW_MODES',
+    'resolve_dtw_settings',
+    'dtw_window',
+    'banded_dtw',
+    'dtw_align',
+    'TimeMap',
+    'alignment_features',
+    'align_recordings',
+    'segment_similarity',
+    'SegmentFeatureContext',
+    'BatchFeatureContext',
+    'BatchRowContext',
+    'PrefixStatistics',
+    'WindowStats',
+    'WindowedCorrelation',
+    'KEY_NAMES',
+    'CHORD_NAMES',
+    'best_chord_indices',
+    'threshold_attack_frames',
+    'autocorrelation',
+    'first_local_maximum',
+    'successive_frame_distances',
+    'FeatureRegistry',
+    'FeatureSpec',
+    'AnalysisPlan',
+    'FEATURE_REGISTRY',
+]
@@ -0,0 +1,152 @@
+# Alignment - Globale Zuordnung von Schüler- und Referenz-Aufnahme
+#
+# Die Segment-Analyse vergleicht Segment i der Referenz mit Segment i des
+# Schülers. Beginnt der Schüler später oder spielt er in anderem Tempo,
+# vergleichen alle folgenden Segmente nicht zusammengehörige Stellen. Ein
+# einziger DTW-Durchlauf über beide Aufnahmen auf grob aufgelösten Features
+# (Chroma und Onset-Stärke bei 11025 Hz, ein Frame pro alignment_step_sec)
+# liefert eine Zeit-Abbildung Referenz -> Schüler, mit der die Segment-Paare
+# geschnitten werden. Aus denselben Features entsteht mit einem
+# Matrixprodukt die N x M Ähnlichkeitsmatrix aller Segmente.
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import librosa
+import numpy as np
+
+from .feature_context import FeatureContext
+from .dtw import DTWSettings, dtw_align
+
+# Sample-Rate der Alignment-Features (Stufe der Signal-Pyramide)
+ALIGNMENT_RATE = 11025
+
+@dataclass
+class TimeMap:
+    """Monotone Zeit-Abbildung von der Referenz auf den Schüler.
+
+    Attributes:
+        ref_times: Zeitpunkte der Referenz in Sekunden (aufsteigend)
+        sch_times: Zugeordnete Zeitpunkte des Schülers in Sekunden
+        cost: Akkumulierte DTW-Kosten des Pfads
+    """
+    ref_times: np.ndarray
+    sch_times: np.ndarray
+    cost: float
+
+    def to_schueler(self, seconds) -> np.ndarray:
+        """Bildet Referenz-Zeitpunkte (Sekunden) auf Schüler-Zeitpunkte ab."""
+        return np.interp(seconds, self.ref_times, self.sch_times)
+
+    def summary(self) -> Dict[str, float]:
+        """Kennzahlen der Zuordnung (Versatz am Anfang, mittleres Tempo-Verhältnis)."""
+        ref_span = float(self.ref_times[-1] - self.ref_times[0])
+        sch_span = float(self.sch_times[-1] - self.sch_times[0])
+        return {
+            "start_offset_sec": round(float(self.sch_times[0] - self.ref_times[0]), 3),
+            "tempo_ratio": round(ref_span / sch_span, 3) if sch_span > 0 else 1.0,
+            "cost": self.cost
+        }
+
+def alignment_features(context: FeatureContext, step_sec: float = 0.2) -> Tuple[np.ndarray, float]:
+    """Grobe Features für die globale Zuordnung (13 x Frames).
+
+    Zeilen 0-11: Chroma (pro Frame auf Länge 1 normiert), Zeile 12:
+    Onset-Stärke (auf das Maximum normiert). Berechnet auf der 11025-Hz-Stufe
+    der Signal-Pyramide mit einem Hop von step_sec.
+
+    Args:
+        context: FeatureContext der gesamten Aufnahme
+        step_sec: Zeitauflösung in Sekunden
+
+    Returns:
+        Tuple (Features, Frame-Dauer in Sekunden)
+    """
+    level = context.at_rate(ALIGNMENT_RATE)
+    hop_length = max(level.hop_length, int(round(step_sec * level.sr)))
+    # Fenster mindestens so lang wie der Hop, damit keine Samples übersprungen werden
+    n_fft = max(level.n_fft, 2 ** int(math.ceil(math.log2(hop_length))))
+    if len(level.y) < n_fft:
+        n_fft = hop_length = max(16, 2 ** int(math.log2(max(len(level.y), 1))))
+
+    chroma = level.chroma_stft(n_fft, hop_length)
+    onset = librosa.onset.onset_strength(
+        S=level.mel_db(n_fft, hop_length), sr=level.sr, hop_length=hop_length
+    )
+    chroma = chroma / np.maximum(np.linalg.norm(chroma, axis=0, keepdims=True), 1e-10)
+    onset = onset / max(float(np.max(onset)), 1e-10) if len(onset) else onset
+    frames = min(chroma.shape[1], len(onset))
+    features = np.vstack([chroma[:, :frames], onset[None, :frames]]).astype(np.float32)
+    return features, hop_length / level.sr
+
+def align_recordings(ref_features: np.ndarray, sch_features: np.ndarray, frame_sec: float,
+                     settings: DTWSettings) -> TimeMap:
+    """Globale Zuordnung per DTW im Suchfenster aus settings.
+
+    Der Pfad darf im Schüler später beginnen (offener Anfang): sonst müsste
+    ein früher Referenz-Frame den ganzen Vorlauf eines verspätet einsetzenden
+    Schülers aufnehmen, und sein gemittelter Zeitpunkt läge mitten im Vorlauf.
+
+    Args:
+        ref_features: alignment_features der Referenz
+        sch_features: alignment_features des Schülers
+        frame_sec: Frame-Dauer der Features in Sekunden
+        settings: DTW-Konfiguration (Modus, Radius in Sekunden, Obergrenze)
+
+    Returns:
+        TimeMap Referenz -> Schüler
+    """
+    radius = max(1, int(math.ceil(settings.band_sec / frame_sec)))
+    cost, path = dtw_align(ref_features, sch_features, settings, radius, return_path=True,
+                           open_begin=True)
+
+    # Pro Referenz-Frame der mittlere zugeordnete Schüler-Frame (monoton)
+    num_frames = ref_features.shape[1]
+    counts = np.bincount(path[:, 0], minlength=num_frames)
+    sums = np.bincount(path[:, 0], weights=path[:, 1], minlength=num_frames)
+    return TimeMap(
+        ref_times=np.arange(num_frames) * frame_sec,
+        sch_times=sums / np.maximum(counts, 1) * frame_sec,
+        cost=float(cost)
+    )
+
+def segment_means(features: np.ndarray, frame_sec: float, bounds_sec: np.ndarray) -> np.ndarray:
+    """Mittlere Features aller Segmente über Präfixsummen (Segmente x Dimensionen).
+
+    Args:
+        features: Feature-Matrix (Dimensionen x Frames)
+        frame_sec: Frame-Dauer in Sekunden
+        bounds_sec: (Segmente x 2) Start und Ende in Sekunden
+
+    Returns:
+        Mittelwerte pro Segment
+    """
+    num_frames = features.shape[1]
+    prefix = np.concatenate(
+        [np.zeros((features.shape[0], 1)), np.cumsum(features, axis=1, dtype=np.float64)], axis=1
+    )
+    bounds = np.asarray(bounds_sec, dtype=np.float64).reshape(-1, 2)
+    starts = np.clip(np.floor(bounds[:, 0] / frame_sec).astype(np.int64), 0, max(num_frames - 1, 0))
+    ends = np.clip(np.ceil(bounds[:, 1] / frame_sec).astype(np.int64), starts + 1, max(num_frames, 1))
+    return ((prefix[:, ends] - prefix[:, starts]) / (ends - starts)).T
+
+def segment_similarity(ref_features: np.ndarray, sch_features: np.ndarray, frame_sec: float,
+                       ref_bounds_sec: np.ndarray, sch_bounds_sec: np.ndarray) -> np.ndarray:
+    """N x M Kosinus-Ähnlichkeit aller Referenz- mit allen Schüler-Segmenten.
+
+    Args:
+        ref_features: alignment_features der Referenz
+        sch_features: alignment_features des Schülers
+        frame_sec: Frame-Dauer der Features in Sekunden
+        ref_bounds_sec: (N x 2) Segment-Grenzen der Referenz in Sekunden
+        sch_bounds_sec: (M x 2) Segment-Grenzen des Schülers in Sekunden
+
+    Returns:
+        Ähnlichkeitsmatrix (N x M)
+    """
+    ref_means = segment_means(ref_features, frame_sec, ref_bounds_sec)
+    sch_means = segment_means(sch_features, frame_sec, sch_bounds_sec)
+    ref_means /= np.maximum(np.linalg.norm(ref_means, axis=1, keepdims=True), 1e-10)
+    sch_means /= np.maximum(np.linalg.norm(sch_means, axis=1, keepdims=True), 1e-10)
+    return ref_means @ sch_means.T
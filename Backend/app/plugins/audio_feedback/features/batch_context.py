@@ -0,0 +1,311 @@
+# Batch Feature Context - Gemeinsame Berechnung über gestapelte Segmente
+#
+# Im Segment-Modus sind fast alle Segmente einer Aufnahme gleich lang; nur das
+# letzte ist kürzer (ohne Auffüllen). analyze_task_batch gruppiert die Segmente
+# nach Länge, jede Gruppe lässt sich zu einer Matrix (Segmente x Samples)
+# stapeln, über die librosa STFT, Mel/MFCC, RMS, Spectral-Features, Onset-
+# Envelope und YIN mit einem Aufruf für alle Segmente berechnet (führende
+# Batch-Dimension). Die Analyzer arbeiten unverändert auf Zeilen-Contexts,
+# deren Repräsentationen Views auf die Batch-Ergebnisse sind.
+
+import librosa
+import numpy as np
+from typing import Any, Callable, Hashable, List, Optional, Sequence
+
+from .feature_context import FeatureContext, MemoCache
+from .quality import AnalysisQuality, QUALITY_TIERS, DEFAULT_QUALITY
+from .signal_pyramid import decimate
+
+# Dynamikgrenze von librosa.power_to_db (top_db), pro Segment angewendet
+_TOP_DB = 80.0
+
+class BatchFeatureContext:
+    """Memoisierte Repräsentationen für einen Stapel gleich langer Signale.
+
+    Alle Repräsentationen haben die Batch-Dimension vorne, z.B. liefert
+    mfcc() ein Array (Segmente x n_mfcc x Frames). Die Ergebnisse pro Zeile
+    entsprechen denen eines eigenen FeatureContext für das Segment.
+
+    Example:
+        batch = BatchFeatureContext.from_signals([seg_a, seg_b, seg_c], sr)
+        contexts = batch.rows()           # FeatureContext pro Segment
+        contexts[1].mfcc()                # eine MFCC-Berechnung für alle drei
+    """
+
+    def __init__(self, y: np.ndarray, sr: int, quality: Optional[AnalysisQuality] = None):
+        """Initialisiert den Context für eine Signal-Matrix.
+
+        Args:
+            y: Audio-Matrix (Segmente x Samples)
+            sr: Sample-Rate
+            quality: Qualitätsstufe mit den Standard-Parametern (None = 'balanced')
+        """
+        if y.ndim != 2:
+            raise ValueError(f"Erwartet eine Matrix (Segmente x Samples), erhalten: {y.shape}")
+        self.y = y
+        self.sr = sr
+        self.quality = quality or QUALITY_TIERS[DEFAULT_QUALITY]
+        self._cache = MemoCache()
+
+    @classmethod
+    def from_signals(cls, signals: Sequence[np.ndarray], sr: int,
+                     quality: Optional[AnalysisQuality] = None) -> 'BatchFeatureContext':
+        """Stapelt gleich lange Signale zu einem Batch.
+
+        Args:
+            signals: Audio-Arrays gleicher Länge
+            sr: Sample-Rate
+            quality: Qualitätsstufe (None = 'balanced')
+
+        Returns:
+            Neuer BatchFeatureContext
+        """
+        return cls(np.stack(signals), sr, quality)
+
+    def __len__(self) -> int:
+        return self.y.shape[0]
+
+    def row(self, index: int) -> 'BatchRowContext':
+        """FeatureContext für ein Segment des Batches."""
+        return BatchRowContext(self, index)
+
+    def rows(self) -> List['BatchRowContext']:
+        """FeatureContexts für alle Segmente des Batches."""
+        return [self.row(i) for i in range(len(self))]
+
+    def _memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        return self._cache.get(key, compute)
+
+    def _level(self, factor: int) -> 'BatchFeatureContext':
+        """Pyramiden-Stufe aller Segmente (eine Dezimation pro Stufe, gecacht)."""
+        if factor == 1:
+            return self
+
+        def compute():
+            source = self._level(factor // 2)
+            return BatchFeatureContext(
+                decimate(source.y, source.sr, self.quality),
+                source.sr // 2,
+                self.quality.decimated(factor, self.sr)
+            )
+
+        return self._memoize(('level', factor), compute)
+
+    # ------------------------------------------------------------------
+    # Spektrale Repräsentationen (Segmente x ... x Frames)
+    # ------------------------------------------------------------------
+
+    def stft_magnitude(self, n_fft: Optional[int] = None,
+                       hop_length: Optional[int] = None) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('stft_magnitude', n_fft, hop_length),
+            lambda: np.abs(librosa.stft(self.y, n_fft=n_fft, hop_length=hop_length))
+        )
+
+    def power_spectrogram(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('power_spectrogram', n_fft, hop_length),
+            lambda: self.stft_magnitude(n_fft, hop_length) ** 2
+        )
+
+    def mel_spectrogram(self, n_fft: Optional[int] = None,
+                        hop_length: Optional[int] = None) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('mel_spectrogram', n_fft, hop_length),
+            lambda: librosa.feature.melspectrogram(
+                S=self.power_spectrogram(n_fft, hop_length),
+                sr=self.sr,
+                n_fft=n_fft,
+                hop_length=hop_length
+            )
+        )
+
+    def mel_db(self, n_fft: Optional[int] = None,
+               hop_length: Optional[int] = None) -> np.ndarray:
+        """Log-Mel-Spektrogramm in dB.
+
+        power_to_db begrenzt die Dynamik relativ zum Maximum des gesamten
+        Arrays. Damit jedes Segment wie einzeln analysiert begrenzt wird,
+        geschieht das hier pro Segment.
+        """
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+
+        def compute():
+            log_mel = librosa.power_to_db(self.mel_spectrogram(n_fft, hop_length), top_db=None)
+            return np.maximum(log_mel, log_mel.max(axis=(-2, -1), keepdims=True) - _TOP_DB)
+
+        return self._memoize(('mel_db', n_fft, hop_length), compute)
+
+    def mfcc(self, n_mfcc: int = 13, n_fft: Optional[int] = None,
+             hop_length: Optional[int] = None) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('mfcc', n_mfcc, n_fft, hop_length),
+            lambda: librosa.feature.mfcc(S=self.mel_db(n_fft, hop_length), n_mfcc=n_mfcc)
+        )
+
+    def spectral_centroid(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('spectral_centroid', n_fft, hop_length),
+            lambda: librosa.feature.spectral_centroid(
+                S=self.stft_magnitude(n_fft, hop_length), sr=self.sr, n_fft=n_fft
+            )[:, 0]
+        )
+
+    def spectral_bandwidth(self, n_fft: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('spectral_bandwidth', n_fft, hop_length),
+            lambda: librosa.feature.spectral_bandwidth(
+                S=self.stft_magnitude(n_fft, hop_length), sr=self.sr, n_fft=n_fft
+            )[:, 0]
+        )
+
+    def spectral_rolloff(self, n_fft: Optional[int] = None,
+                         hop_length: Optional[int] = None,
+                         roll_percent: float = 0.85) -> np.ndarray:
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('spectral_rolloff', n_fft, hop_length, roll_percent),
+            lambda: librosa.feature.spectral_rolloff(
+                S=self.stft_magnitude(n_fft, hop_length), sr=self.sr,
+                roll_percent=roll_percent, n_fft=n_fft
+            )[:, 0]
+        )
+
+    def zero_crossing_rate(self, frame_length: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        frame_length, hop_length = self.quality.frame_params(frame_length, hop_length)
+        return self._memoize(
+            ('zero_crossing_rate', frame_length, hop_length),
+            lambda: librosa.feature.zero_crossing_rate(
+                self.y, frame_length=frame_length, hop_length=hop_length
+            )[:, 0]
+        )
+
+    # ------------------------------------------------------------------
+    # Energie, Onsets und Tonhöhe
+    # ------------------------------------------------------------------
+
+    def rms(self, frame_length: Optional[int] = None,
+            hop_length: Optional[int] = None) -> np.ndarray:
+        frame_length, hop_length = self.quality.frame_params(frame_length, hop_length)
+        return self._memoize(
+            ('rms', frame_length, hop_length),
+            lambda: librosa.feature.rms(
+                y=self.y, frame_length=frame_length, hop_length=hop_length
+            )[:, 0]
+        )
+
+    def onset_envelope(self, hop_length: Optional[int] = None) -> np.ndarray:
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        return self._memoize(
+            ('onset_envelope', hop_length),
+            lambda: librosa.onset.onset_strength(
+                S=self.mel_db(None, hop_length),
+                sr=self.sr,
+                n_fft=self.quality.n_fft,
+                hop_length=hop_length
+            )
+        )
+
+    def yin(self, fmin: Optional[float] = None, fmax: Optional[float] = None,
+            frame_length: Optional[int] = None, hop_length: Optional[int] = None) -> np.ndarray:
+        fmin, fmax, frame_length, hop_length = self.quality.yin_params(fmin, fmax, frame_length, hop_length)
+        return self._memoize(
+            ('yin', float(fmin), float(fmax), frame_length, hop_length),
+            lambda: librosa.yin(
+                self.y,
+                fmin=fmin,
+                fmax=fmax,
+                sr=self.sr,
+                frame_length=frame_length,
+                hop_length=hop_length
+            )
+        )
+
+    def __repr__(self):
+        return (f"BatchFeatureContext(segments={len(self)}, samples={self.y.shape[1]}, "
+                f"sr={self.sr}, cached={len(self._cache)})")
+
+class BatchRowContext(FeatureContext):
+    """FeatureContext eines Segments innerhalb eines BatchFeatureContext.
+
+    Batch-fähige Repräsentationen sind Views auf die Zeile des Batches.
+    CQT-Chroma (Tuning-Schätzung pro Signal), Onset-Erkennung und Beat-Tracking
+    werden wie bisher pro Segment berechnet, nutzen aber die Onset-Envelope
+    des Batches. Pyramiden-Stufen sind Zeilen der dezimierten Batch-Stufen.
+    """
+
+    def __init__(self, batch: BatchFeatureContext, index: int):
+        """Initialisiert den Zeilen-Context.
+
+        Args:
+            batch: BatchFeatureContext aller Segmente
+            index: Zeile des Segments im Batch
+        """
+        super().__init__(batch.y[index], batch.sr, batch.quality)
+        self.batch = batch
+        self.index = index
+
+    def _build_level(self, factor: int) -> 'BatchRowContext':
+        """Stufe als Zeile der dezimierten Batch-Stufe."""
+        return self.batch._level(factor).row(self.index)
+
+    def stft_magnitude(self, n_fft: Optional[int] = None,
+                       hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.stft_magnitude(n_fft, hop_length)[self.index]
+
+    def power_spectrogram(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.power_spectrogram(n_fft, hop_length)[self.index]
+
+    def mel_spectrogram(self, n_fft: Optional[int] = None,
+                        hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.mel_spectrogram(n_fft, hop_length)[self.index]
+
+    def mel_db(self, n_fft: Optional[int] = None,
+               hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.mel_db(n_fft, hop_length)[self.index]
+
+    def mfcc(self, n_mfcc: int = 13, n_fft: Optional[int] = None,
+             hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.mfcc(n_mfcc, n_fft, hop_length)[self.index]
+
+    def spectral_centroid(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.spectral_centroid(n_fft, hop_length)[self.index]
+
+    def spectral_bandwidth(self, n_fft: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.spectral_bandwidth(n_fft, hop_length)[self.index]
+
+    def spectral_rolloff(self, n_fft: Optional[int] = None,
+                         hop_length: Optional[int] = None,
+                         roll_percent: float = 0.85) -> np.ndarray:
+        return self.batch.spectral_rolloff(n_fft, hop_length, roll_percent)[self.index]
+
+    def zero_crossing_rate(self, frame_length: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.zero_crossing_rate(frame_length, hop_length)[self.index]
+
+    def rms(self, frame_length: Optional[int] = None,
+            hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.rms(frame_length, hop_length)[self.index]
+
+    def onset_envelope(self, hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.onset_envelope(hop_length)[self.index]
+
+    def yin(self, fmin: Optional[float] = None, fmax: Optional[float] = None,
+            frame_length: Optional[int] = None, hop_length: Optional[int] = None) -> np.ndarray:
+        return self.batch.yin(fmin, fmax, frame_length, hop_length)[self.index]
+
+    def __repr__(self):
+        return f"BatchRowContext(index={self.index}, samples={len(self.y)}, sr={self.sr})"
@@ -0,0 +1,330 @@
+# DTW - Dynamic Time Warping mit Suchfenster (Sakoe-Chiba, Itakura, Multiskala)
+#
+# Unbeschränktes DTW (librosa.sequence.dtw) braucht Zeit und Speicher in
+# O(N·M). Hier wird die Kostenmatrix nur innerhalb eines Fensters berechnet,
+# das pro Zeile i einen zusammenhängenden Spaltenbereich [lo[i], hi[i])
+# erlaubt:
+#   - sakoe_chiba: Band mit festem Radius um die (gestreckte) Diagonale
+#   - itakura:     Parallelogramm mit maximaler Steigung max_slope
+#   - multiscale:  FastDTW-artig; der Pfad einer halb aufgelösten Stufe wird
+#                  auf die feinere Stufe projiziert und um den Radius erweitert
+#   - full:        gesamte Matrix
+# Mit open_begin darf der Pfad in einer beliebigen Spalte der ersten Zeile
+# beginnen (Subsequenz-DTW am Anfang), z.B. wenn die zweite Folge einen
+# Vorlauf hat, der keinem Frame der ersten entspricht.
+# Die Akkumulation läuft zeilenweise in float32; ohne Pfad wird nur die
+# vorherige Zeile gehalten (Speicher O(Bandbreite)). Jede Zeile wird mit
+# NumPy berechnet: der Schritt (i, j-1) -> (i, j) ist ein laufendes Minimum
+# über Präfixsummen der Zeilenkosten (np.minimum.accumulate).
+
+import math
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+DTW_MODES = ('full', 'sakoe_chiba', 'itakura', 'multiscale')
+DTW_METRICS = ('euclidean', 'cosine')
+
+# Schritte im Backtracking (pro Zelle als int8 gespeichert)
+_DIAGONAL, _UP, _LEFT = 0, 1, 2
+
+@dataclass(frozen=True)
+class DTWSettings:
+    """Konfiguration der DTW-Berechnung.
+
+    Attributes:
+        mode: 'full', 'sakoe_chiba', 'itakura' oder 'multiscale'
+        band_sec: Radius des Suchfensters in Sekunden (Sakoe-Chiba-Band bzw.
+            Erweiterung des projizierten Pfads bei multiscale)
+        max_slope: Maximale Steigung des Itakura-Parallelogramms
+        max_cells: Obergrenze der berechneten Zellen; größere Fenster werden
+            durch ein Sakoe-Chiba-Band mit passend kleinerem Radius ersetzt
+    """
+    mode: str = 'sakoe_chiba'
+    band_sec: float = 2.0
+    max_slope: float = 2.0
+    max_cells: int = 4_000_000
+
+    def radius_frames(self, sr: int, hop_length: int) -> int:
+        """Radius des Suchfensters in Frames."""
+        return max(1, int(math.ceil(self.band_sec * sr / hop_length)))
+
+    @property
+    def cache_token(self) -> str:
+        """Eindeutige Kennung aller Parameter (Teil der Cache-Schlüssel)."""
+        return f"{self.mode}|{self.band_sec}|{self.max_slope}|{self.max_cells}"
+
+def resolve_dtw_settings(values: Optional[Dict[str, Any]] = None) -> DTWSettings:
+    """Erstellt DTWSettings aus Config-Werten.
+
+    Args:
+        values: Dict mit mode, band_sec, max_slope, max_cells (fehlende = Standard)
+
+    Returns:
+        DTWSettings
+
+    Raises:
+        ValueError: Bei unbekanntem Modus oder ungültigen Grenzen
+    """
+    values = {key: value for key, value in (values or {}).items() if value is not None}
+    unknown = set(values) - {field.name for field in fields(DTWSettings)}
+    if unknown:
+        raise ValueError(f"Unbekannte DTW-Parameter: {', '.join(sorted(unknown))}")
+    settings = replace(DTWSettings(), **values)
+    if settings.mode not in DTW_MODES:
+        raise ValueError(f"Unbekannter DTW-Modus '{settings.mode}' (erlaubt: {', '.join(DTW_MODES)})")
+    if settings.band_sec <= 0 or settings.max_slope <= 1 or settings.max_cells <= 0:
+        raise ValueError("DTW: band_sec und max_cells müssen > 0 sein, max_slope > 1")
+    return settings
+
+# ----------------------------------------------------------------------
+# Suchfenster (lo, hi pro Zeile)
+# ----------------------------------------------------------------------
+
+def _connect(lo: np.ndarray, hi: np.ndarray, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Macht ein Fenster durchgängig von (0, 0) bis (N-1, M-1).
+
+    Jede Zeile erhält mindestens eine Zelle, und jede Zeile beginnt
+    spätestens eine Spalte rechts vom Ende der vorherigen Zeile (sonst
+    gäbe es keinen Übergang).
+    """
+    lo = np.clip(lo, 0, m - 1).astype(np.int64)
+    hi = np.clip(hi, 1, m).astype(np.int64)
+    lo[0], hi[-1] = 0, m
+    hi = np.maximum(hi, lo + 1)
+    # Ende ist monoton: spätere Zeilen dürfen nicht vor früheren enden
+    hi = np.maximum.accumulate(hi)
+    lo[1:] = np.minimum(lo[1:], hi[:-1])
+    # Anfang ist monoton (von hinten): frühere Zeilen dürfen nicht hinter späteren beginnen
+    lo = np.minimum.accumulate(lo[::-1])[::-1]
+    return lo, hi
+
+def window_cells(lo: np.ndarray, hi: np.ndarray) -> int:
+    """Anzahl der Zellen eines Fensters."""
+    return int(np.sum(hi - lo))
+
+def sakoe_chiba_window(n: int, m: int, radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Band mit Radius radius um die Diagonale von (0, 0) nach (N-1, M-1)."""
+    centers = np.round(np.arange(n) * ((m - 1) / max(n - 1, 1))).astype(np.int64)
+    return _connect(centers - radius, centers + radius + 1, m)
+
+def itakura_window(n: int, m: int, max_slope: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Itakura-Parallelogramm (lokale Steigung zwischen 1/max_slope und max_slope)."""
+    x = np.arange(n) / max(n - 1, 1)
+    lower = np.maximum(x / max_slope, 1 - max_slope * (1 - x))
+    upper = np.minimum(x * max_slope, 1 - (1 - x) / max_slope)
+    lo = np.ceil(lower * (m - 1) - 1e-9)
+    hi = np.floor(upper * (m - 1) + 1e-9) + 1
+    return _connect(lo, hi, m)
+
+def _coarsen(X: np.ndarray) -> np.ndarray:
+    """Halbiert die Frame-Auflösung (Mittelwert benachbarter Frames)."""
+    n = X.shape[1]
+    pairs = X[:, :n - n % 2].reshape(X.shape[0], -1, 2).mean(axis=2)
+    if n % 2:
+        pairs = np.concatenate([pairs, X[:, -1:]], axis=1)
+    return pairs
+
+def multiscale_window(X: np.ndarray, Y: np.ndarray, radius: int,
+                      metric: str = 'euclidean',
+                      open_begin: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """FastDTW-Fenster: projizierter Pfad der gröberen Stufe plus Radius.
+
+    Args:
+        X: Merkmale der ersten Folge (Dimensionen x N)
+        Y: Merkmale der zweiten Folge (Dimensionen x M)
+        radius: Erweiterung des projizierten Pfads in Frames
+        metric: Kostenmaß
+        open_begin: Pfade der gröberen Stufen mit offenem Anfang
+
+    Returns:
+        Tuple (lo, hi) pro Zeile
+    """
+    n, m = X.shape[1], Y.shape[1]
+    if min(n, m) <= radius + 2:
+        return _connect(np.zeros(n), np.full(n, m), m)
+
+    Xc, Yc = _coarsen(X), _coarsen(Y)
+    coarse_lo, coarse_hi = multiscale_window(Xc, Yc, radius, metric, open_begin)
+    _, path = banded_dtw(Xc, Yc, coarse_lo, coarse_hi, metric, return_path=True,
+                         open_begin=open_begin)
+
+    # Jede grobe Zelle (a, b) deckt die Zeilen 2a, 2a+1 und Spalten 2b, 2b+1 ab
+    lo = np.full(n, m, dtype=np.int64)
+    hi = np.zeros(n, dtype=np.int64)
+    for row_offset in (0, 1):
+        rows = np.minimum(2 * path[:, 0] + row_offset, n - 1)
+        np.minimum.at(lo, rows, 2 * path[:, 1])
+        np.maximum.at(hi, rows, np.minimum(2 * path[:, 1] + 2, m))
+    return _connect(lo - radius, hi + radius, m)
+
+def dtw_window(X: np.ndarray, Y: np.ndarray, settings: DTWSettings, radius: int,
+               metric: str = 'euclidean',
+               open_begin: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Suchfenster nach settings.mode mit garantierter Obergrenze.
+
+    Überschreitet das Fenster settings.max_cells, wird es durch ein
+    Sakoe-Chiba-Band ersetzt, dessen Radius so lange halbiert wird, bis die
+    Grenze eingehalten ist. Ein durchgängiges Fenster braucht mindestens
+    etwa N + M Zellen; die Zellenzahl ist also höchstens max(max_cells, N + M).
+
+    Args:
+        X: Merkmale der ersten Folge (Dimensionen x N)
+        Y: Merkmale der zweiten Folge (Dimensionen x M)
+        settings: DTW-Konfiguration
+        radius: Radius in Frames (siehe DTWSettings.radius_frames)
+        metric: Kostenmaß (für multiscale)
+        open_begin: Offener Anfang (für die Pfade von multiscale)
+
+    Returns:
+        Tuple (lo, hi) pro Zeile
+    """
+    n, m = X.shape[1], Y.shape[1]
+    if settings.mode == 'full':
+        lo, hi = _connect(np.zeros(n), np.full(n, m), m)
+    elif settings.mode == 'itakura':
+        lo, hi = itakura_window(n, m, settings.max_slope)
+    elif settings.mode == 'multiscale':
+        lo, hi = multiscale_window(X, Y, radius, metric, open_begin)
+    else:
+        lo, hi = sakoe_chiba_window(n, m, radius)
+
+    if window_cells(lo, hi) > settings.max_cells:
+        radius = min(radius, max(0, (settings.max_cells // max(n, 1) - 1) // 2))
+        lo, hi = sakoe_chiba_window(n, m, radius)
+        while window_cells(lo, hi) > settings.max_cells and radius > 0:
+            radius //= 2
+            lo, hi = sakoe_chiba_window(n, m, radius)
+    return lo, hi
+
+# ----------------------------------------------------------------------
+# Akkumulation
+# ----------------------------------------------------------------------
+
+def _prepare(X: np.ndarray, Y: np.ndarray, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Merkmale als float32; für 'cosine' auf Einheitslänge normiert."""
+    if metric not in DTW_METRICS:
+        raise ValueError(f"Unbekanntes DTW-Kostenmaß '{metric}' (erlaubt: {', '.join(DTW_METRICS)})")
+    X = np.asarray(X, dtype=np.float32)
+    Y = np.asarray(Y, dtype=np.float32)
+    if metric == 'cosine':
+        X = X / np.maximum(np.linalg.norm(X, axis=0, keepdims=True), 1e-10)
+        Y = Y / np.maximum(np.linalg.norm(Y, axis=0, keepdims=True), 1e-10)
+    return X, Y
+
+def banded_dtw(X: np.ndarray, Y: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+               metric: str = 'euclidean', return_path: bool = False,
+               open_begin: bool = False) -> Tuple[float, Optional[np.ndarray]]:
+    """DTW innerhalb eines Fensters (Schritte wie librosa: diagonal, hoch, links).
+
+    Args:
+        X: Merkmale der ersten Folge (Dimensionen x N)
+        Y: Merkmale der zweiten Folge (Dimensionen x M)
+        lo: Erste erlaubte Spalte pro Zeile
+        hi: Erste nicht mehr erlaubte Spalte pro Zeile
+        metric: 'euclidean' oder 'cosine' (1 - Kosinus-Ähnlichkeit)
+        return_path: Pfad berechnen (speichert einen int8-Schritt pro Fensterzelle)
+        open_begin: Pfad darf in jeder Spalte der ersten Zeile beginnen
+            (sonst nur bei (0, 0))
+
+    Returns:
+        Tuple (akkumulierte Kosten bei (N-1, M-1), Pfad als (K x 2) Array von
+        (i, j) vom Anfang zum Ende oder None)
+    """
+    X, Y = _prepare(X, Y, metric)
+    n = X.shape[1]
+
+    prev = np.empty(0, dtype=np.float32)
+    prev_lo = prev_hi = 0
+    steps = [] if return_path else None
+
+    for i in range(n):
+        row_lo, row_hi = int(lo[i]), int(hi[i])
+
+        # Zeilenkosten zu allen Spalten des Fensters
+        if metric == 'cosine':
+            cost = np.maximum(1.0 - X[:, i] @ Y[:, row_lo:row_hi], 0.0).astype(np.float32)
+        else:
+            diff = Y[:, row_lo:row_hi] - X[:, i, None]
+            cost = np.sqrt(np.einsum('ij,ij->j', diff, diff))
+
+        # Vorgänger aus der vorherigen Zeile: (i-1, j) und (i-1, j-1)
+        up = np.full(row_hi - row_lo, np.inf, dtype=np.float32)
+        diagonal = np.full(row_hi - row_lo, np.inf, dtype=np.float32)
+        if i == 0:
+            # Startzellen: nur (0, 0) oder bei offenem Anfang die ganze erste Zeile
+            if open_begin:
+                diagonal[:] = 0.0
+            else:
+                diagonal[0] = 0.0
+        else:
+            start, stop = max(row_lo, prev_lo), min(row_hi, prev_hi)
+            if start < stop:
+                up[start - row_lo:stop - row_lo] = prev[start - prev_lo:stop - prev_lo]
+            start, stop = max(row_lo, prev_lo + 1), min(row_hi, prev_hi + 1)
+            if start < stop:
+                diagonal[start - row_lo:stop - row_lo] = prev[start - 1 - prev_lo:stop - 1 - prev_lo]
+
+        from_previous = cost + np.minimum(diagonal, up)
+
+        # Schritte nach links: D[j] = min_k<=j (from_previous[k] + cost[k+1..j])
+        prefix = np.cumsum(cost, dtype=np.float32)
+        offsets = from_previous - prefix
+        running = np.minimum.accumulate(offsets)
+        from_left = offsets != running
+        row = np.where(from_left, prefix + running, from_previous).astype(np.float32)
+
+        if steps is not None:
+            step = np.where(diagonal <= up, _DIAGONAL, _UP).astype(np.int8)
+            step[from_left] = _LEFT
+            steps.append(step)
+
+        prev, prev_lo, prev_hi = row, row_lo, row_hi
+
+    distance = float(prev[-1])
+    if steps is None:
+        return distance, None
+    return distance, _backtrack(steps, lo, n - 1, int(hi[n - 1]) - 1)
+
+def _backtrack(steps, lo: np.ndarray, i: int, j: int) -> np.ndarray:
+    """Verfolgt den optimalen Pfad von (i, j) zurück bis zu seiner Startzelle in Zeile 0."""
+    path = [(i, j)]
+    while i > 0 or j > 0:
+        step = steps[i][j - int(lo[i])]
+        if i == 0 and step != _LEFT:
+            # Startzelle (offener Anfang)
+            break
+        if step == _LEFT:
+            j -= 1
+        elif step == _UP:
+            i -= 1
+        else:
+            i, j = i - 1, j - 1
+        path.append((i, j))
+    return np.array(path[::-1], dtype=np.int64)
+
+def dtw_align(X: np.ndarray, Y: np.ndarray, settings: Optional[DTWSettings] = None,
+              radius: int = 32, metric: str = 'euclidean',
+              return_path: bool = False,
+              open_begin: bool = False) -> Tuple[float, Optional[np.ndarray]]:
+    """DTW zweier Merkmalsfolgen mit dem Suchfenster aus settings.
+
+    Example:
+        distance, _ = dtw_align(mfcc_ref, mfcc_sch, DTWSettings('sakoe_chiba'), radius=40)
+
+    Args:
+        X: Merkmale der ersten Folge (Dimensionen x N)
+        Y: Merkmale der zweiten Folge (Dimensionen x M)
+        settings: DTW-Konfiguration (None = Standard)
+        radius: Radius des Suchfensters in Frames
+        metric: 'euclidean' oder 'cosine'
+        return_path: Optimalen Pfad mit zurückgeben
+        open_begin: Pfad darf in jeder Spalte der ersten Zeile beginnen
+
+    Returns:
+        Tuple (akkumulierte Kosten, Pfad oder None)
+    """
+    settings = settings or DTWSettings()
+    lo, hi = dtw_window(X, Y, settings, radius, metric, open_begin)
+    return banded_dtw(X, Y, lo, hi, metric, return_path, open_begin)
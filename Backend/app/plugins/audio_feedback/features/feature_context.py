@@ -0,0 +1,419 @@
+# Feature Context - Memoisierte Zwischenrepräsentationen pro Audiosignal
+#
+# Analyzer und Comparators benötigen zu großen Teilen dieselben Zwischenschritte
+# (STFT, Mel/MFCC, Chroma, RMS, Onset-Envelope, YIN). Der FeatureContext
+# berechnet jede Repräsentation genau einmal pro (Signal, Parameter) und stellt
+# sie allen Komponenten der Pipeline zur Verfügung. Analyzer und Comparators
+# dürfen dabei parallel in Threads laufen (MemoCache).
+
+import threading
+
+import librosa
+import numpy as np
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .frame_statistics import PrefixStatistics, WindowStats
+from .quality import AnalysisQuality, QUALITY_TIERS, DEFAULT_QUALITY
+from .signal_pyramid import pyramid_factor, decimate
+
+class MemoCache:
+    """Thread-sicherer Cache, der jeden Wert genau einmal berechnet.
+
+    Fragen mehrere Threads denselben Schlüssel an, rechnet nur der erste,
+    die anderen warten auf sein Ergebnis. Unterschiedliche Schlüssel werden
+    parallel berechnet (ein Lock pro Schlüssel). Da Repräsentationen nur von
+    anderen Repräsentationen abhängen (z.B. MFCC -> Mel -> STFT), entstehen
+    keine zyklischen Wartebeziehungen.
+    """
+
+    def __init__(self):
+        """Initialisiert einen leeren Cache."""
+        self._values: Dict[Hashable, Any] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Gibt den Wert zu key zurück und berechnet ihn bei Bedarf.
+
+        Args:
+            key: Eindeutiger Schlüssel
+            compute: Funktion zur Berechnung bei Cache-Miss
+
+        Returns:
+            Gecachter oder neu berechneter Wert
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._values:
+                self._values[key] = compute()
+        return self._values[key]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+class FeatureContext:
+    """Memoisierter Zugriff auf Zwischenrepräsentationen eines Audiosignals.
+
+    Jeder Context gehört zu genau einem Signal. Die erste Anfrage einer
+    Repräsentation berechnet sie, alle weiteren Anfragen mit denselben
+    Parametern erhalten das gecachte Ergebnis. Nicht angegebene Parameter
+    (n_fft, hop_length, YIN-Auflösung) kommen aus der Qualitätsstufe.
+
+    Example:
+        context = FeatureContext(y, sr)
+        mfcc = context.mfcc(n_mfcc=13)      # berechnet STFT, Mel und MFCC
+        onsets = context.onset_envelope()   # nutzt das gecachte Mel-Spektrogramm
+    """
+
+    def __init__(self, y: np.ndarray, sr: int, quality: Optional[AnalysisQuality] = None):
+        """Initialisiert den Context für ein Signal.
+
+        Args:
+            y: Audio-Array (mono)
+            sr: Sample-Rate
+            quality: Qualitätsstufe mit den Standard-Parametern (None = 'balanced')
+        """
+        self.y = y
+        self.sr = sr
+        self.quality = quality or QUALITY_TIERS[DEFAULT_QUALITY]
+        self._cache = MemoCache()
+
+    @classmethod
+    def from_audio_data(cls, audio_data: Tuple[np.ndarray, int],
+                        quality: Optional[AnalysisQuality] = None) -> 'FeatureContext':
+        """Erstellt einen Context aus einem (audio_array, sample_rate) Tupel.
+
+        Args:
+            audio_data: Tuple von (audio_array, sample_rate)
+            quality: Qualitätsstufe (None = 'balanced')
+
+        Returns:
+            Neuer FeatureContext
+        """
+        y, sr = audio_data
+        return cls(y, sr, quality)
+
+    @property
+    def audio_data(self) -> Tuple[np.ndarray, int]:
+        """Gibt das Signal als (audio_array, sample_rate) Tupel zurück."""
+        return self.y, self.sr
+
+    @property
+    def n_fft(self) -> int:
+        """FFT-Größe der Qualitätsstufe."""
+        return self.quality.n_fft
+
+    @property
+    def hop_length(self) -> int:
+        """Hop-Länge der Qualitätsstufe."""
+        return self.quality.hop_length
+
+    def _memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Berechnet einen Wert einmalig und cached ihn unter key.
+
+        Args:
+            key: Eindeutiger Schlüssel aus Repräsentation und Parametern
+            compute: Funktion zur Berechnung bei Cache-Miss
+
+        Returns:
+            Gecachter oder neu berechneter Wert
+        """
+        return self._cache.get(key, compute)
+
+    # ------------------------------------------------------------------
+    # Signal-Pyramide
+    # ------------------------------------------------------------------
+
+    def at_rate(self, rate: Optional[int] = None) -> 'FeatureContext':
+        """Context der niedrigsten Pyramiden-Stufe mit mindestens rate Hz.
+
+        Example:
+            low = context.at_rate(11025)   # bei 22050 Hz: einmal dezimiert
+            low.yin()                      # gleiches Zeitraster, halber Aufwand
+
+        Args:
+            rate: Benötigte Mindest-Sample-Rate (None = volle Rate)
+
+        Returns:
+            FeatureContext der Stufe (self bei voller Rate)
+        """
+        return self._level(pyramid_factor(self.quality, self.sr, rate))
+
+    def _level(self, factor: int) -> 'FeatureContext':
+        """Pyramiden-Stufe mit Dezimationsfaktor factor (gecacht)."""
+        if factor == 1:
+            return self
+        return self._memoize(('level', factor), lambda: self._build_level(factor))
+
+    def _build_level(self, factor: int) -> 'FeatureContext':
+        """Erzeugt eine Stufe mit einer Dezimation aus der vorherigen Stufe."""
+        source = self._level(factor // 2)
+        return FeatureContext(
+            decimate(source.y, source.sr, self.quality),
+            source.sr // 2,
+            self.quality.decimated(factor, self.sr)
+        )
+
+    # ------------------------------------------------------------------
+    # Spektrale Repräsentationen
+    # ------------------------------------------------------------------
+
+    def stft_magnitude(self, n_fft: Optional[int] = None,
+                       hop_length: Optional[int] = None) -> np.ndarray:
+        """Betragsspektrum der STFT."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('stft_magnitude', n_fft, hop_length),
+            lambda: np.abs(librosa.stft(self.y, n_fft=n_fft, hop_length=hop_length))
+        )
+
+    def power_spectrogram(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        """Leistungsspektrum (|STFT|²)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('power_spectrogram', n_fft, hop_length),
+            lambda: self.stft_magnitude(n_fft, hop_length) ** 2
+        )
+
+    def mel_spectrogram(self, n_fft: Optional[int] = None,
+                        hop_length: Optional[int] = None) -> np.ndarray:
+        """Mel-Spektrogramm (Leistung), abgeleitet aus dem gecachten Spektrum."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('mel_spectrogram', n_fft, hop_length),
+            lambda: librosa.feature.melspectrogram(
+                S=self.power_spectrogram(n_fft, hop_length),
+                sr=self.sr,
+                n_fft=n_fft,
+                hop_length=hop_length
+            )
+        )
+
+    def mel_db(self, n_fft: Optional[int] = None,
+               hop_length: Optional[int] = None) -> np.ndarray:
+        """Log-Mel-Spektrogramm in dB (Basis für MFCC und Onset-Envelope)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('mel_db', n_fft, hop_length),
+            lambda: librosa.power_to_db(self.mel_spectrogram(n_fft, hop_length))
+        )
+
+    def mfcc(self, n_mfcc: int = 13, n_fft: Optional[int] = None,
+             hop_length: Optional[int] = None) -> np.ndarray:
+        """MFCC-Matrix (n_mfcc x Frames)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('mfcc', n_mfcc, n_fft, hop_length),
+            lambda: librosa.feature.mfcc(S=self.mel_db(n_fft, hop_length), n_mfcc=n_mfcc)
+        )
+
+    def chroma(self, hop_length: Optional[int] = None) -> np.ndarray:
+        """Chromagramm (12 x Frames) nach dem Verfahren der Qualitätsstufe."""
+        if self.quality.chroma == 'stft':
+            return self.chroma_stft(hop_length=hop_length)
+        return self.chroma_cqt(hop_length)
+
+    def chroma_cqt(self, hop_length: Optional[int] = None) -> np.ndarray:
+        """CQT-basiertes Chromagramm (12 x Frames)."""
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        return self._memoize(
+            ('chroma_cqt', hop_length),
+            lambda: librosa.feature.chroma_cqt(y=self.y, sr=self.sr, hop_length=hop_length)
+        )
+
+    def chroma_stft(self, n_fft: Optional[int] = None,
+                    hop_length: Optional[int] = None) -> np.ndarray:
+        """STFT-basiertes Chromagramm aus dem gecachten Leistungsspektrum (12 x Frames)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('chroma_stft', n_fft, hop_length),
+            lambda: librosa.feature.chroma_stft(
+                S=self.power_spectrogram(n_fft, hop_length),
+                sr=self.sr,
+                n_fft=n_fft,
+                hop_length=hop_length
+            )
+        )
+
+    def spectral_centroid(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        """Spectral Centroid pro Frame (1-D)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('spectral_centroid', n_fft, hop_length),
+            lambda: librosa.feature.spectral_centroid(
+                S=self.stft_magnitude(n_fft, hop_length), sr=self.sr, n_fft=n_fft
+            )[0]
+        )
+
+    def spectral_bandwidth(self, n_fft: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        """Spectral Bandwidth pro Frame (1-D)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('spectral_bandwidth', n_fft, hop_length),
+            lambda: librosa.feature.spectral_bandwidth(
+                S=self.stft_magnitude(n_fft, hop_length), sr=self.sr, n_fft=n_fft
+            )[0]
+        )
+
+    def spectral_rolloff(self, n_fft: Optional[int] = None,
+                         hop_length: Optional[int] = None,
+                         roll_percent: float = 0.85) -> np.ndarray:
+        """Spectral Rolloff pro Frame (1-D)."""
+        n_fft, hop_length = self.quality.frame_params(n_fft, hop_length)
+        return self._memoize(
+            ('spectral_rolloff', n_fft, hop_length, roll_percent),
+            lambda: librosa.feature.spectral_rolloff(
+                S=self.stft_magnitude(n_fft, hop_length), sr=self.sr,
+                roll_percent=roll_percent, n_fft=n_fft
+            )[0]
+        )
+
+    def zero_crossing_rate(self, frame_length: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        """Zero Crossing Rate pro Frame (1-D)."""
+        frame_length, hop_length = self.quality.frame_params(frame_length, hop_length)
+        return self._memoize(
+            ('zero_crossing_rate', frame_length, hop_length),
+            lambda: librosa.feature.zero_crossing_rate(
+                self.y, frame_length=frame_length, hop_length=hop_length
+            )[0]
+        )
+
+    # ------------------------------------------------------------------
+    # Energie und Onsets
+    # ------------------------------------------------------------------
+
+    def rms(self, frame_length: Optional[int] = None,
+            hop_length: Optional[int] = None) -> np.ndarray:
+        """RMS-Verlauf (1-D, ein Wert pro Frame)."""
+        frame_length, hop_length = self.quality.frame_params(frame_length, hop_length)
+        return self._memoize(
+            ('rms', frame_length, hop_length),
+            lambda: librosa.feature.rms(
+                y=self.y, frame_length=frame_length, hop_length=hop_length
+            )[0]
+        )
+
+    def onset_envelope(self, hop_length: Optional[int] = None) -> np.ndarray:
+        """Onset-Strength-Envelope auf Basis des gecachten Log-Mel-Spektrogramms."""
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        return self._memoize(
+            ('onset_envelope', hop_length),
+            lambda: librosa.onset.onset_strength(
+                S=self.mel_db(None, hop_length),
+                sr=self.sr,
+                n_fft=self.quality.n_fft,
+                hop_length=hop_length
+            )
+        )
+
+    def onset_frames(self, hop_length: Optional[int] = None) -> np.ndarray:
+        """Frame-Indizes der erkannten Noteneinsätze."""
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        return self._memoize(
+            ('onset_frames', hop_length),
+            lambda: librosa.onset.onset_detect(
+                onset_envelope=self.onset_envelope(hop_length).copy(),
+                sr=self.sr,
+                hop_length=hop_length
+            )
+        )
+
+    def beat_track(self, hop_length: Optional[int] = None) -> Tuple[float, np.ndarray]:
+        """Beat-Tracking auf der gecachten Onset-Envelope: (tempo, beat_frames)."""
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        def compute():
+            tempo, beats = librosa.beat.beat_track(
+                onset_envelope=self.onset_envelope(hop_length), sr=self.sr, hop_length=hop_length
+            )
+            return float(np.atleast_1d(tempo)[0]), beats
+
+        return self._memoize(('beat_track', hop_length), compute)
+
+    def tempo(self, hop_length: Optional[int] = None) -> float:
+        """Tempo in BPM."""
+        return self.beat_track(hop_length)[0]
+
+    # ------------------------------------------------------------------
+    # Tonhöhe
+    # ------------------------------------------------------------------
+
+    def yin(self, fmin: Optional[float] = None, fmax: Optional[float] = None,
+            frame_length: Optional[int] = None, hop_length: Optional[int] = None) -> np.ndarray:
+        """Grundfrequenz-Verlauf (YIN) in Hz pro Frame."""
+        fmin, fmax, frame_length, hop_length = self.quality.yin_params(fmin, fmax, frame_length, hop_length)
+        return self._memoize(
+            ('yin', float(fmin), float(fmax), frame_length, hop_length),
+            lambda: librosa.yin(
+                self.y,
+                fmin=fmin,
+                fmax=fmax,
+                sr=self.sr,
+                frame_length=frame_length,
+                hop_length=hop_length
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Statistiken
+    # ------------------------------------------------------------------
+
+    def prefix_statistics(self, name: str, only_positive: bool = False,
+                          **params) -> PrefixStatistics:
+        """Präfixsummen über eine Frame-Repräsentation (einmalig pro Parameter).
+
+        Args:
+            name: Name der Repräsentation (z.B. 'rms', 'mfcc', 'yin')
+            only_positive: Nur Frames mit Wert > 0 berücksichtigen (z.B. Pitch)
+            **params: Parameter der Repräsentation
+
+        Returns:
+            PrefixStatistics über den gesamten Verlauf
+        """
+        def compute():
+            values = getattr(self, name)(**params)
+            return PrefixStatistics(values, valid=values > 0 if only_positive else None)
+
+        key = ('prefix_statistics', name, only_positive, tuple(sorted(params.items())))
+        return self._memoize(key, compute)
+
+    def stats(self, name: str, only_positive: bool = False, **params) -> WindowStats:
+        """Statistik (mean/min/max/std/var) einer Frame-Repräsentation.
+
+        Example:
+            rms = context.stats('rms', frame_length=2048)
+            rms.mean(), rms.max()
+        """
+        return self.prefix_statistics(name, only_positive, **params).window()
+
+    def correlation(self, other: 'FeatureContext', name: str, **params) -> Optional[float]:
+        """Korrelation einer Frame-Repräsentation mit der eines anderen Signals.
+
+        Beide Verläufe werden auf die gemeinsame Länge gekürzt.
+
+        Args:
+            other: FeatureContext des Vergleichssignals
+            name: Name der 1-D Repräsentation (z.B. 'rms')
+            **params: Parameter der Repräsentation
+
+        Returns:
+            Korrelationskoeffizient oder None bei weniger als 2 Frames
+        """
+        x = getattr(self, name)(**params)
+        y = getattr(other, name)(**params)
+        min_len = min(len(x), len(y))
+        if min_len < 2:
+            return None
+        return float(np.corrcoef(x[:min_len], y[:min_len])[0, 1])
+
+    def __repr__(self):
+        return f"FeatureContext(samples={len(self.y)}, sr={self.sr}, cached={len(self._cache)})"
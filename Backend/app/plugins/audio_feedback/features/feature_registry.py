@@ -0,0 +1,236 @@
+# Feature Registry - Abhängigkeiten zwischen Report-Features und Analyse-Schritten
+#
+# Jeder Output-Key (z.B. 'dtw_distance', 'mean_attack_time') ist genau einem
+# Teilschritt eines Analyzers oder Comparators zugeordnet. Aus den im Report
+# aktivierten Features wird ein AnalysisPlan abgeleitet, der nur die benötigten
+# Schritte ausführt. Nicht angeforderte Zwischenergebnisse (z.B. CQT-Chroma oder
+# YIN) werden dadurch vom lazy FeatureContext gar nicht erst berechnet.
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ANALYZER = 'analyzer'
+COMPARATOR = 'comparator'
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """Beschreibt, wie ein einzelnes Feature berechnet wird.
+
+    Attributes:
+        name: Output-Key ohne Rollen-Präfix (z.B. 'mean_pitch')
+        kind: 'analyzer' oder 'comparator'
+        component: Schlüssel der Komponente in der Pipeline (z.B. 'pitch')
+        step: Teilschritt innerhalb der Komponente (z.B. 'vibrato')
+        intermediates: Benötigte Zwischenrepräsentationen des FeatureContext
+    """
+    name: str
+    kind: str
+    component: str
+    step: str
+    intermediates: Tuple[str, ...] = ()
+
+@dataclass
+class AnalysisPlan:
+    """Auszuführende Analyse-Schritte pro Komponente.
+
+    Attributes:
+        analyzer_steps: Komponente -> Menge der Schritte (Analyzer)
+        comparator_steps: Komponente -> Menge der Schritte (Comparators)
+        features: Abgedeckte Feature-Namen
+        intermediates: Benötigte Zwischenrepräsentationen
+        is_full: True wenn alle Features berechnet werden
+    """
+    analyzer_steps: Dict[str, Set[str]] = field(default_factory=dict)
+    comparator_steps: Dict[str, Set[str]] = field(default_factory=dict)
+    features: Set[str] = field(default_factory=set)
+    intermediates: Set[str] = field(default_factory=set)
+    is_full: bool = False
+
+    def includes(self, kind: str, component: str) -> bool:
+        """Prüft ob eine Komponente überhaupt ausgeführt werden muss."""
+        if self.is_full:
+            return True
+        steps = self.analyzer_steps if kind == ANALYZER else self.comparator_steps
+        return component in steps
+
+    def steps_for(self, kind: str, component: str) -> Optional[Set[str]]:
+        """Gibt die Schritte einer Komponente zurück (None = alle Schritte)."""
+        if self.is_full:
+            return None
+        steps = self.analyzer_steps if kind == ANALYZER else self.comparator_steps
+        return steps.get(component, set())
+
+class FeatureRegistry:
+    """Registry aller Features mit ihren Analyse-Abhängigkeiten."""
+
+    def __init__(self):
+        """Initialisiert eine leere Registry."""
+        self._specs: Dict[str, FeatureSpec] = {}
+        # Rang des Schritts jedes Features (Registrierungs-Reihenfolge = Ausführungs-Reihenfolge)
+        self._step_ranks: Dict[Tuple[str, str, str], int] = {}
+
+    def register(self, kind: str, component: str, step: str,
+                 names: Iterable[str], intermediates: Iterable[str] = ()):
+        """Registriert alle Features eines Analyse-Schritts.
+
+        Args:
+            kind: 'analyzer' oder 'comparator'
+            component: Schlüssel der Komponente in der Pipeline
+            step: Name des Teilschritts
+            names: Output-Keys, die der Schritt liefert
+            intermediates: Benötigte Zwischenrepräsentationen
+        """
+        self._step_ranks.setdefault((kind, component, step), len(self._step_ranks))
+        for name in names:
+            self._specs[name] = FeatureSpec(
+                name=name,
+                kind=kind,
+                component=component,
+                step=step,
+                intermediates=tuple(intermediates)
+            )
+
+    def get(self, name: str) -> Optional[FeatureSpec]:
+        """Gibt die Spezifikation eines Features zurück (oder None)."""
+        return self._specs.get(name)
+
+    def names(self) -> List[str]:
+        """Gibt alle registrierten Feature-Namen zurück."""
+        return list(self._specs.keys())
+
+    def resolve(self, enabled_features: Optional[Iterable[str]] = None) -> AnalysisPlan:
+        """Berechnet die Abhängigkeitshülle der aktivierten Features.
+
+        Args:
+            enabled_features: Aktivierte Features (None = alle Features)
+
+        Returns:
+            AnalysisPlan mit den auszuführenden Schritten
+        """
+        if enabled_features is None:
+            return AnalysisPlan(
+                features=set(self._specs.keys()),
+                intermediates={i for spec in self._specs.values() for i in spec.intermediates},
+                is_full=True
+            )
+
+        plan = AnalysisPlan()
+        for name in enabled_features:
+            spec = self._specs.get(name)
+            if spec is None:
+                print(f"⚠️ Unbekanntes Feature in enabled_features: {name}")
+                continue
+
+            steps = plan.analyzer_steps if spec.kind == ANALYZER else plan.comparator_steps
+            steps.setdefault(spec.component, set()).add(spec.step)
+            plan.intermediates.update(spec.intermediates)
+
+        # Ein Schritt liefert immer alle seine Features
+        plan.features = {
+            spec.name for spec in self._specs.values()
+            if spec.step in (plan.analyzer_steps if spec.kind == ANALYZER
+                             else plan.comparator_steps).get(spec.component, set())
+        }
+        return plan
+
+    def split(self, plan: AnalysisPlan, intermediate: str) -> Tuple[AnalysisPlan, AnalysisPlan]:
+        """Teilt einen Plan nach einer Zwischenrepräsentation auf.
+
+        Ein Schritt liefert immer alle seine Features und benötigt für alle
+        dieselben Zwischenrepräsentationen, daher sind beide Teile disjunkt.
+
+        Args:
+            plan: Aufzuteilender Plan
+            intermediate: Zwischenrepräsentation (z.B. 'yin')
+
+        Returns:
+            Tuple (Plan ohne, Plan mit Schritten, die intermediate benötigen)
+        """
+        names = [name for name in plan.features if name in self._specs]
+        return (
+            self.resolve([name for name in names if intermediate not in self._specs[name].intermediates]),
+            self.resolve([name for name in names if intermediate in self._specs[name].intermediates])
+        )
+
+    def ordered(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Sortiert zusammengesetzte Ergebnisse in Ausführungs-Reihenfolge der Schritte.
+
+        Stabil innerhalb eines Schritts; nicht registrierte Keys folgen am Ende.
+        Damit ergeben aus Teilen zusammengesetzte Ergebnisse dieselbe
+        Reihenfolge (und denselben Report-Text) wie eine vollständige Berechnung.
+
+        Args:
+            values: Features oder Vergleichsmetriken (ohne Rollen-Präfix)
+
+        Returns:
+            Neues Dict in kanonischer Reihenfolge
+        """
+        def rank(name):
+            spec = self._specs.get(name)
+            if spec is None:
+                return len(self._step_ranks)
+            return self._step_ranks[(spec.kind, spec.component, spec.step)]
+        return dict(sorted(values.items(), key=lambda item: rank(item[0])))
+
+def _build_default_registry() -> FeatureRegistry:
+    """Erstellt die Registry für die Standard-Analyzer und -Comparators."""
+    registry = FeatureRegistry()
+
+    # Tempo & Rhythmus
+    registry.register(ANALYZER, 'tempo', 'tempo', ['tempo'], ['onset_envelope'])
+    registry.register(ANALYZER, 'tempo', 'rhythm_stability',
+                      ['rhythm_std_interval', 'rhythm_mean_interval'],
+                      ['onset_envelope', 'onset_frames'])
+    registry.register(ANALYZER, 'tempo', 'onset_count', ['onset_count'],
+                      ['onset_envelope', 'onset_frames'])
+
+    # Tonhöhe & Harmonie
+    registry.register(ANALYZER, 'pitch', 'pitch', ['mean_pitch', 'min_pitch', 'max_pitch'], ['yin'])
+    registry.register(ANALYZER, 'pitch', 'chroma_key', ['estimated_key'], ['chroma'])
+    registry.register(ANALYZER, 'pitch', 'chord_histogram',
+                      ['dominant_chord', 'chord_variety'], ['chroma'])
+    registry.register(ANALYZER, 'pitch', 'vibrato', ['vibrato_strength', 'vibrato_rate'], ['yin'])
+
+    # Spektrale Features
+    registry.register(ANALYZER, 'spectral', 'centroid',
+                      ['mean_centroid', 'min_centroid', 'max_centroid'], ['stft_magnitude'])
+    registry.register(ANALYZER, 'spectral', 'bandwidth',
+                      ['mean_bandwidth', 'min_bandwidth', 'max_bandwidth'], ['stft_magnitude'])
+    registry.register(ANALYZER, 'spectral', 'rolloff',
+                      ['mean_rolloff', 'min_rolloff', 'max_rolloff'], ['stft_magnitude'])
+    registry.register(ANALYZER, 'spectral', 'zero_crossing_rate',
+                      ['mean_zcr', 'min_zcr', 'max_zcr'])
+
+    # Lautstärke & Dynamik
+    registry.register(ANALYZER, 'dynamics', 'length', ['length'])
+    registry.register(ANALYZER, 'dynamics', 'loudness', ['mean_rms', 'max_rms', 'min_rms'], ['rms'])
+    registry.register(ANALYZER, 'dynamics', 'dynamics',
+                      ['dynamic_range_db', 'dynamic_std_db'], ['rms'])
+    registry.register(ANALYZER, 'dynamics', 'silences',
+                      ['num_silences', 'total_silence_duration', 'longest_silence'])
+    registry.register(ANALYZER, 'dynamics', 'attack_time',
+                      ['mean_attack_time', 'min_attack_time', 'max_attack_time'], ['rms'])
+
+    # Klangfarbe
+    registry.register(ANALYZER, 'timbre', 'mfcc',
+                      ['mfcc_mean_1', 'mfcc_mean_2', 'mfcc_mean_3',
+                       'mfcc_var_1', 'mfcc_var_2', 'mfcc_var_3'], ['mfcc'])
+    registry.register(ANALYZER, 'timbre', 'timbre_consistency',
+                      ['timbre_variance', 'timbre_frame_distance'], ['mfcc'])
+
+    # Polyphonie
+    registry.register(ANALYZER, 'rhythm', 'polyphony',
+                      ['polyphony_active_bands', 'polyphony_spectral_flatness'], ['stft_magnitude'])
+
+    # Vergleichsmetriken
+    registry.register(COMPARATOR, 'feature', 'mfcc', ['mfcc_distance'], ['mfcc'])
+    registry.register(COMPARATOR, 'feature', 'chroma', ['chroma_similarity'], ['chroma'])
+    registry.register(COMPARATOR, 'temporal', 'dtw', ['dtw_distance'], ['mfcc'])
+    registry.register(COMPARATOR, 'temporal', 'rms', ['rms_correlation'], ['rms'])
+    registry.register(COMPARATOR, 'temporal', 'pitch_contour', ['pitch_contour_correlation'], ['yin'])
+    registry.register(COMPARATOR, 'energy', 'energy_envelope', ['energy_envelope_correlation'], ['rms'])
+
+    return registry
+
+# Standard-Registry für die AudioFeedbackPipeline
+FEATURE_REGISTRY = _build_default_registry()
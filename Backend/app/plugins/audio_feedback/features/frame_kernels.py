@@ -0,0 +1,126 @@
+# Frame Kernels - Vektorisierte Berechnungen über Frame-Verläufe
+#
+# Ersetzen die Python-Schleifen pro Frame in den Analyzern durch
+# NumPy-Operationen über alle Frames gleichzeitig. Die Ergebnisse
+# entsprechen den früheren Schleifen (bis auf Gleitkomma-Rundung).
+
+import numpy as np
+from typing import List, Tuple
+
+KEY_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+_MAJOR_TEMPLATE = np.array([1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0], dtype=np.float64)
+_MINOR_TEMPLATE = np.array([1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0], dtype=np.float64)
+
+def _build_chord_templates() -> Tuple[np.ndarray, List[str]]:
+    """Baut die 24 zentrierten, normierten Akkord-Templates.
+
+    Reihenfolge wie in der früheren Schleife (C_major, C_minor, C#_major, ...),
+    damit argmax bei Gleichstand denselben Akkord wählt.
+    """
+    templates = []
+    names = []
+    for root in range(12):
+        for template, quality in ((_MAJOR_TEMPLATE, "major"), (_MINOR_TEMPLATE, "minor")):
+            rotated = np.roll(template, root)
+            centered = rotated - rotated.mean()
+            templates.append(centered / np.linalg.norm(centered))
+            names.append(f"{KEY_NAMES[root]}_{quality}")
+    return np.array(templates), names
+
+CHORD_TEMPLATES, CHORD_NAMES = _build_chord_templates()
+
+def best_chord_indices(chroma: np.ndarray) -> np.ndarray:
+    """Bestimmt pro Frame das am besten korrelierende Akkord-Template.
+
+    Pearson-Korrelation aller Frames mit allen 24 Templates als ein
+    Matrixprodukt (24 x 12) @ (12 x Frames).
+
+    Args:
+        chroma: Chromagramm (12 x Frames)
+
+    Returns:
+        np.ndarray: Index in CHORD_NAMES pro Frame, -1 wenn die Korrelation
+        undefiniert ist (konstanter Chroma-Frame)
+    """
+    chroma = np.asarray(chroma, dtype=np.float64)
+    if chroma.shape[1] == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    centered = chroma - chroma.mean(axis=0, keepdims=True)
+    norms = np.linalg.norm(centered, axis=0)
+    defined = norms > 0
+
+    correlations = CHORD_TEMPLATES @ (centered / np.where(defined, norms, 1.0))
+    indices = np.argmax(correlations, axis=0)
+    indices[~defined] = -1
+    return indices
+
+def threshold_attack_frames(envelope: np.ndarray, threshold: float) -> np.ndarray:
+    """Anzahl Frames vom Überschreiten einer Schwelle bis zum folgenden Peak.
+
+    Für jede Stelle i mit envelope[i] < threshold <= envelope[i + 1] wird
+    der erste Frame j > i gesucht, nach dem der Verlauf nicht mehr steigt.
+
+    Args:
+        envelope: Hüllkurve (z.B. RMS pro Frame)
+        threshold: Absolute Schwelle
+
+    Returns:
+        np.ndarray: j - i pro Schwellen-Überschreitung
+    """
+    envelope = np.asarray(envelope)
+    if len(envelope) < 2:
+        return np.zeros(0, dtype=np.int64)
+
+    crossings = np.flatnonzero((envelope[:-1] < threshold) & (envelope[1:] >= threshold))
+    # Frames, nach denen der Verlauf nicht mehr steigt (letzter Frame immer)
+    stops = np.append(np.flatnonzero(envelope[1:] <= envelope[:-1]), len(envelope) - 1)
+    peaks = stops[np.searchsorted(stops, crossings + 1)]
+    return peaks - crossings
+
+def autocorrelation(values: np.ndarray) -> np.ndarray:
+    """Autokorrelation für nicht-negative Lags über die FFT (O(n log n)).
+
+    Entspricht np.correlate(values, values, mode='full')[len(values) - 1:].
+
+    Args:
+        values: 1-D Signal
+
+    Returns:
+        np.ndarray: Autokorrelation für Lags 0 .. len(values) - 1
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.zeros(0)
+    n_fft = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(values, n_fft)
+    return np.fft.irfft(spectrum * np.conj(spectrum), n_fft)[:n]
+
+def first_local_maximum(values: np.ndarray) -> int:
+    """Index des ersten strikten lokalen Maximums (ohne Randpunkte).
+
+    Args:
+        values: 1-D Verlauf
+
+    Returns:
+        int: Index oder -1 wenn kein lokales Maximum existiert
+    """
+    values = np.asarray(values)
+    if len(values) < 3:
+        return -1
+    inner = values[1:-1]
+    peaks = np.flatnonzero((inner > values[:-2]) & (inner > values[2:]))
+    return int(peaks[0]) + 1 if len(peaks) else -1
+
+def successive_frame_distances(features: np.ndarray) -> np.ndarray:
+    """Euklidische Distanz zwischen aufeinanderfolgenden Frames.
+
+    Args:
+        features: Feature-Matrix (Koeffizienten x Frames)
+
+    Returns:
+        np.ndarray: Frames - 1 Distanzen
+    """
+    return np.linalg.norm(np.diff(features, axis=1), axis=0)
@@ -0,0 +1,206 @@
+# Frame Statistics - Fensterstatistiken über Frame-Features in O(1)
+#
+# Präfixsummen (Summe, Quadratsumme, Anzahl gültiger Frames) und Sparse Tables
+# (Minimum, Maximum) werden einmal pro Feature-Verlauf aufgebaut. Danach kostet
+# die Statistik eines beliebigen Frame-Fensters konstante Zeit, unabhängig von
+# Segment-Länge oder -Anzahl.
+
+import numpy as np
+from typing import List, Optional, Union
+
+ArrayOrFloat = Union[np.ndarray, float]
+
+class PrefixStatistics:
+    """Präfixsummen über einen Feature-Verlauf (1-D oder Zeilen x Frames).
+
+    Example:
+        prefix = PrefixStatistics(rms)
+        window = prefix.window(100, 444)
+        window.mean(), window.std(), window.max()
+    """
+
+    def __init__(self, values: np.ndarray, valid: Optional[np.ndarray] = None):
+        """Baut die Präfixsummen auf.
+
+        Args:
+            values: Feature-Verlauf, Frames entlang der letzten Achse
+            valid: Optionale Maske gültiger Frames (z.B. pitch > 0)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.is_matrix = values.ndim == 2
+        matrix = values if self.is_matrix else values[np.newaxis, :]
+
+        self.length = matrix.shape[1]
+        self._valid = np.ones(self.length, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+        self._values = matrix
+
+        masked = np.where(self._valid, matrix, 0.0)
+        zeros = np.zeros((matrix.shape[0], 1))
+        self._sum = np.concatenate([zeros, np.cumsum(masked, axis=1)], axis=1)
+        self._sq_sum = np.concatenate([zeros, np.cumsum(masked ** 2, axis=1)], axis=1)
+        self._count = np.concatenate([[0], np.cumsum(self._valid)])
+
+        # Sparse Tables werden erst bei der ersten Min/Max-Abfrage aufgebaut
+        self._min_table: Optional[List[np.ndarray]] = None
+        self._max_table: Optional[List[np.ndarray]] = None
+
+    def window(self, start: int = 0, end: Optional[int] = None) -> 'WindowStats':
+        """Gibt die Statistik des Frame-Fensters [start, end) zurück.
+
+        Args:
+            start: Erster Frame (inklusiv)
+            end: Letzter Frame (exklusiv, None = Ende)
+
+        Returns:
+            WindowStats für das Fenster
+        """
+        end = self.length if end is None else end
+        start = max(0, min(start, self.length))
+        end = max(start, min(end, self.length))
+        return WindowStats(self, start, end)
+
+    @staticmethod
+    def _build_sparse_table(values: np.ndarray, op) -> List[np.ndarray]:
+        """Baut eine Sparse Table (Ebene k deckt 2^k Frames ab)."""
+        table = [values]
+        span = 1
+        while span * 2 <= values.shape[1]:
+            prev = table[-1]
+            table.append(op(prev[:, :-span], prev[:, span:]))
+            span *= 2
+        return table
+
+    def _range_query(self, table: List[np.ndarray], op, start: int, end: int) -> np.ndarray:
+        """Min/Max-Abfrage auf [start, end) in O(1)."""
+        level = int(np.log2(end - start))
+        span = 1 << level
+        return op(table[level][:, start], table[level][:, end - span])
+
+    def _min(self, start: int, end: int) -> np.ndarray:
+        if self._min_table is None:
+            self._min_table = self._build_sparse_table(
+                np.where(self._valid, self._values, np.inf), np.minimum
+            )
+        return self._range_query(self._min_table, np.minimum, start, end)
+
+    def _max(self, start: int, end: int) -> np.ndarray:
+        if self._max_table is None:
+            self._max_table = self._build_sparse_table(
+                np.where(self._valid, self._values, -np.inf), np.maximum
+            )
+        return self._range_query(self._max_table, np.maximum, start, end)
+
+class WindowStats:
+    """Statistik eines Frame-Fensters (alle Abfragen in O(1)).
+
+    Bei 1-D Verläufen werden floats zurückgegeben, bei Matrizen ein Wert
+    pro Zeile. Leere Fenster liefern NaN (wie np.mean auf leeren Arrays).
+    """
+
+    def __init__(self, prefix: PrefixStatistics, start: int, end: int):
+        """Initialisiert das Fenster.
+
+        Args:
+            prefix: Zugrundeliegende Präfixsummen
+            start: Erster Frame (inklusiv)
+            end: Letzter Frame (exklusiv)
+        """
+        self._prefix = prefix
+        self.start = start
+        self.end = end
+
+    @property
+    def count(self) -> int:
+        """Anzahl gültiger Frames im Fenster."""
+        return int(self._prefix._count[self.end] - self._prefix._count[self.start])
+
+    def _result(self, values: np.ndarray) -> ArrayOrFloat:
+        return values if self._prefix.is_matrix else float(values[0])
+
+    def _empty(self) -> ArrayOrFloat:
+        return self._result(np.full(self._prefix._values.shape[0], np.nan))
+
+    def sum(self) -> ArrayOrFloat:
+        """Summe über das Fenster."""
+        return self._result(self._prefix._sum[:, self.end] - self._prefix._sum[:, self.start])
+
+    def mean(self) -> ArrayOrFloat:
+        """Mittelwert über das Fenster."""
+        if self.count == 0:
+            return self._empty()
+        total = self._prefix._sum[:, self.end] - self._prefix._sum[:, self.start]
+        return self._result(total / self.count)
+
+    def var(self) -> ArrayOrFloat:
+        """Varianz (ddof=0, wie np.var) über das Fenster."""
+        if self.count == 0:
+            return self._empty()
+        n = self.count
+        total = self._prefix._sum[:, self.end] - self._prefix._sum[:, self.start]
+        sq_total = self._prefix._sq_sum[:, self.end] - self._prefix._sq_sum[:, self.start]
+        variance = np.maximum(sq_total / n - (total / n) ** 2, 0.0)
+        return self._result(variance)
+
+    def std(self) -> ArrayOrFloat:
+        """Standardabweichung über das Fenster."""
+        return np.sqrt(self.var())
+
+    def min(self) -> ArrayOrFloat:
+        """Minimum über das Fenster."""
+        if self.count == 0:
+            return self._empty()
+        return self._result(self._prefix._min(self.start, self.end))
+
+    def max(self) -> ArrayOrFloat:
+        """Maximum über das Fenster."""
+        if self.count == 0:
+            return self._empty()
+        return self._result(self._prefix._max(self.start, self.end))
+
+class WindowedCorrelation:
+    """Pearson-Korrelation zweier frame-synchroner Verläufe pro Fenster in O(1)."""
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        """Baut die Präfixsummen für beide Verläufe auf.
+
+        Args:
+            x: Erster Verlauf (1-D)
+            y: Zweiter Verlauf (1-D), wird auf gemeinsame Länge gekürzt
+        """
+        self.length = min(len(x), len(y))
+        x = np.asarray(x[:self.length], dtype=np.float64)
+        y = np.asarray(y[:self.length], dtype=np.float64)
+
+        def prefix(values):
+            return np.concatenate([[0.0], np.cumsum(values)])
+
+        self._x = prefix(x)
+        self._y = prefix(y)
+        self._xx = prefix(x * x)
+        self._yy = prefix(y * y)
+        self._xy = prefix(x * y)
+
+    def correlation(self, start: int, end: int) -> Optional[float]:
+        """Korrelation im Fenster [start, end).
+
+        Args:
+            start: Erster Frame (inklusiv)
+            end: Letzter Frame (exklusiv)
+
+        Returns:
+            Korrelationskoeffizient, NaN bei konstantem Verlauf, None bei < 2 Frames
+        """
+        end = min(end, self.length)
+        n = end - start
+        if n < 2:
+            return None
+
+        sx = self._x[end] - self._x[start]
+        sy = self._y[end] - self._y[start]
+        cov = (self._xy[end] - self._xy[start]) - sx * sy / n
+        var_x = (self._xx[end] - self._xx[start]) - sx * sx / n
+        var_y = (self._yy[end] - self._yy[start]) - sy * sy / n
+
+        if var_x <= 0 or var_y <= 0:
+            return float('nan')
+        return float(cov / np.sqrt(var_x * var_y))
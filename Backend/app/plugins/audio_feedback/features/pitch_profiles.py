@@ -0,0 +1,141 @@
+# Pitch Profiles - Tonhöhen-Suchbereiche pro Instrument für YIN
+#
+# YIN sucht standardmäßig zwischen C2 und C7. fmin bestimmt die maximale
+# Verzögerung (Lag) und damit den Rechenaufwand; ein zu weiter Bereich
+# begünstigt außerdem Oktavfehler. Ein Profil engt den Bereich auf den
+# Tonumfang des Instruments ein und wählt eine dazu passende Frame-Länge.
+# Unbekannte Instrumente (und Klavier/Schlagzeug) nutzen den weiten Bereich.
+
+import math
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+import librosa
+
+from .quality import AnalysisQuality, min_yin_frame_length
+
+@dataclass(frozen=True)
+class PitchProfile:
+    """Tonhöhen-Suchbereich eines Instruments.
+
+    Attributes:
+        name: Name des Profils (z.B. 'violine')
+        fmin: Tiefster erwarteter Ton als Notenname (z.B. 'G3')
+        fmax: Höchster erwarteter Ton als Notenname (z.B. 'E7')
+        frame_length: YIN-Frame-Länge bei 22050 Hz
+    """
+    name: str
+    fmin: str
+    fmax: str
+    frame_length: int = 2048
+
+    @property
+    def fmin_hz(self) -> float:
+        return float(librosa.note_to_hz(self.fmin))
+
+    @property
+    def fmax_hz(self) -> float:
+        return float(librosa.note_to_hz(self.fmax))
+
+    def to_dict(self) -> Dict[str, object]:
+        """Profil als Dict (z.B. für das Analyse-Ergebnis)."""
+        return {"name": self.name, "fmin": self.fmin, "fmax": self.fmax, "frame_length": self.frame_length}
+
+PITCH_PROFILES: Dict[str, PitchProfile] = {profile.name: profile for profile in [
+    # Streicher
+    PitchProfile('violine', 'G3', 'E7', 1024),
+    PitchProfile('viola', 'C3', 'E6', 1024),
+    PitchProfile('cello', 'C2', 'C6', 2048),
+    PitchProfile('kontrabass', 'E1', 'G4', 2048),
+    # Zupfinstrumente
+    PitchProfile('gitarre', 'E2', 'E6', 2048),
+    PitchProfile('e-bass', 'E1', 'G4', 2048),
+    # Holzbläser
+    PitchProfile('floete', 'C4', 'D7', 1024),
+    PitchProfile('blockfloete', 'C4', 'D7', 1024),
+    PitchProfile('oboe', 'A#3', 'A6', 1024),
+    PitchProfile('klarinette', 'D3', 'C7', 1024),
+    PitchProfile('fagott', 'A#1', 'E5', 2048),
+    PitchProfile('saxophon', 'G#2', 'C6', 1024),
+    # Blechbläser
+    PitchProfile('trompete', 'F#3', 'D6', 1024),
+    PitchProfile('horn', 'B1', 'F5', 2048),
+    PitchProfile('posaune', 'E2', 'F5', 2048),
+    PitchProfile('tuba', 'D1', 'F4', 2048),
+    # Stimme
+    PitchProfile('gesang', 'E2', 'C6', 2048),
+]}
+
+# Eingaben aus dem Frontend (deutsch/englisch) -> Profilname
+INSTRUMENT_ALIASES: Dict[str, str] = {
+    'violine': 'violine', 'geige': 'violine', 'violin': 'violine',
+    'viola': 'viola', 'bratsche': 'viola',
+    'cello': 'cello', 'violoncello': 'cello',
+    'kontrabass': 'kontrabass', 'double bass': 'kontrabass', 'contrabass': 'kontrabass',
+    'gitarre': 'gitarre', 'guitar': 'gitarre',
+    'e-bass': 'e-bass', 'bassgitarre': 'e-bass', 'bass guitar': 'e-bass',
+    'flöte': 'floete', 'floete': 'floete', 'querflöte': 'floete', 'flute': 'floete',
+    'blockflöte': 'blockfloete', 'blockfloete': 'blockfloete', 'recorder': 'blockfloete',
+    'oboe': 'oboe',
+    'klarinette': 'klarinette', 'clarinet': 'klarinette',
+    'fagott': 'fagott', 'bassoon': 'fagott',
+    'saxophon': 'saxophon', 'saxophone': 'saxophon', 'saxofon': 'saxophon',
+    'trompete': 'trompete', 'trumpet': 'trompete',
+    'horn': 'horn', 'waldhorn': 'horn',
+    'posaune': 'posaune', 'trombone': 'posaune',
+    'tuba': 'tuba',
+    'gesang': 'gesang', 'stimme': 'gesang', 'voice': 'gesang', 'vocals': 'gesang',
+}
+
+def find_pitch_profile(instrument: Optional[str]) -> Optional[PitchProfile]:
+    """Sucht das Profil zu einer Instrument-Angabe.
+
+    Erst exakt, dann als Teilwort (z.B. 'Alt-Saxophon' -> saxophon); längere
+    Aliase haben Vorrang (z.B. 'Blockflöte' vor 'Flöte').
+
+    Args:
+        instrument: Instrument-Angabe aus der Anfrage (z.B. 'Violine')
+
+    Returns:
+        PitchProfile oder None (weiter Standard-Bereich)
+    """
+    text = (instrument or '').strip().lower()
+    if not text:
+        return None
+    if text in INSTRUMENT_ALIASES:
+        return PITCH_PROFILES[INSTRUMENT_ALIASES[text]]
+    for alias in sorted(INSTRUMENT_ALIASES, key=len, reverse=True):
+        if alias in text:
+            return PITCH_PROFILES[INSTRUMENT_ALIASES[alias]]
+    return None
+
+def apply_pitch_profile(quality: AnalysisQuality, profile: Optional[PitchProfile],
+                        sr: int) -> AnalysisQuality:
+    """Überträgt den Suchbereich eines Profils auf die YIN-Parameter einer Stufe.
+
+    Die Hop-Länge der Stufe bleibt erhalten, damit Tonhöhen-Verläufe
+    verschiedener Instrumente auf demselben Zeitraster liegen. Die
+    Frame-Länge wird höchstens so groß wie die der Stufe, mindestens aber
+    so groß, dass die Periode von fmin hineinpasst (librosa.yin).
+
+    Args:
+        quality: Qualitätsstufe
+        profile: Pitch-Profil (None = Stufe unverändert)
+        sr: Analyse-Sample-Rate
+
+    Returns:
+        AnalysisQuality mit angepassten YIN-Parametern
+    """
+    if profile is None:
+        return quality
+
+    fmin, fmax = profile.fmin_hz, min(profile.fmax_hz, sr / 2 * 0.95)
+    frame_length = min(2 ** round(math.log2(profile.frame_length * sr / 22050)), quality.yin_frame_length)
+    frame_length = max(frame_length, min_yin_frame_length(sr, fmin))
+    return replace(
+        quality,
+        yin_fmin=fmin,
+        yin_fmax=fmax,
+        yin_frame_length=frame_length,
+        yin_hop_length=quality.yin_hop
+    )
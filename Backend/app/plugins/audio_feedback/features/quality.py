@@ -0,0 +1,192 @@
+# Analysis Quality - Qualitätsstufen der Analyse (fast / balanced / accurate)
+#
+# Eine Stufe legt einen zusammenpassenden Parametersatz für alle Analyzer und
+# Comparators fest: Analyse-Sample-Rate, STFT-Auflösung, Chroma-Verfahren,
+# YIN-Auflösung und Resampler-Qualität. 'balanced' nutzt die bisherigen
+# Frame-Parameter, berechnet Tonhöhe, Onsets und RMS aber auf der dezimierten
+# Stufe der Signal-Pyramide (11025 Hz) und liefert dort leicht andere Werte;
+# 'accurate' rechnet alles bei voller Rate, 'fast' ist für schnelle Übe-Checks
+# gedacht.
+
+import math
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+
+import librosa
+
+@dataclass(frozen=True)
+class AnalysisQuality:
+    """Parametersatz einer Qualitätsstufe.
+
+    Attributes:
+        name: Name der Stufe ('fast', 'balanced', 'accurate')
+        sample_rate: Analyse-Sample-Rate (None = default_sample_rate der Config)
+        n_fft: FFT-Größe für STFT, Mel/MFCC und RMS
+        hop_length: Hop-Länge aller Frame-Repräsentationen
+        chroma: 'cqt' (chroma_cqt) oder 'stft' (chroma_stft aus dem gecachten Spektrum)
+        yin_frame_length: Frame-Länge für YIN
+        yin_hop_length: Hop-Länge für YIN (None = yin_frame_length // 4)
+        yin_fmin: Untere Grenzfrequenz für YIN in Hz
+        yin_fmax: Obere Grenzfrequenz für YIN in Hz
+        resample_quality: soxr-Qualität beim Resampling ('QQ', 'LQ', 'MQ', 'HQ', 'VHQ')
+        pyramid: Analyzer mit geringerem Bandbreitenbedarf (Tonhöhe, Onsets, RMS)
+            erhalten dezimierte Signale aus der Signal-Pyramide
+    """
+    name: str
+    sample_rate: Optional[int] = None
+    n_fft: int = 2048
+    hop_length: int = 512
+    chroma: str = 'cqt'
+    yin_frame_length: int = 2048
+    yin_hop_length: Optional[int] = None
+    yin_fmin: float = float(librosa.note_to_hz("C2"))
+    yin_fmax: float = float(librosa.note_to_hz("C7"))
+    resample_quality: str = 'HQ'
+    pyramid: bool = True
+
+    @property
+    def yin_hop(self) -> int:
+        """Effektive Hop-Länge von YIN."""
+        return self.yin_hop_length or self.yin_frame_length // 4
+
+    def frame_params(self, n_fft: Optional[int] = None,
+                     hop_length: Optional[int] = None) -> Tuple[int, int]:
+        """Ergänzt fehlende Frame-Parameter um die Werte der Stufe.
+
+        Args:
+            n_fft: FFT-Größe bzw. Frame-Länge (None = Stufe)
+            hop_length: Hop-Länge (None = Stufe)
+
+        Returns:
+            Tuple (n_fft, hop_length)
+        """
+        return n_fft or self.n_fft, hop_length or self.hop_length
+
+    def yin_params(self, fmin: Optional[float] = None, fmax: Optional[float] = None,
+                   frame_length: Optional[int] = None,
+                   hop_length: Optional[int] = None) -> Tuple[float, float, int, int]:
+        """Ergänzt fehlende YIN-Parameter um die Werte der Stufe.
+
+        Wird frame_length explizit gesetzt, gilt ohne hop_length wie bei
+        librosa.yin frame_length // 4.
+
+        Returns:
+            Tuple (fmin, fmax, frame_length, hop_length)
+        """
+        if frame_length is None:
+            frame_length = self.yin_frame_length
+            hop_length = hop_length or self.yin_hop
+        return (
+            float(self.yin_fmin if fmin is None else fmin),
+            float(self.yin_fmax if fmax is None else fmax),
+            frame_length,
+            hop_length or frame_length // 4,
+        )
+
+    def decimated(self, factor: int, sr: int) -> 'AnalysisQuality':
+        """Parametersatz für eine um factor dezimierte Pyramiden-Stufe.
+
+        Frame- und Hop-Längen werden mitskaliert, damit die Frames aller
+        Stufen dieselben Zeitpunkte beschreiben. Die YIN-Frame-Länge bleibt
+        groß genug für die Periode von yin_fmin.
+
+        Args:
+            factor: Dezimationsfaktor (Zweierpotenz)
+            sr: Sample-Rate der vollen Stufe
+
+        Returns:
+            AnalysisQuality der Pyramiden-Stufe
+        """
+        if factor == 1:
+            return self
+        level_sr = sr // factor
+        return replace(
+            self,
+            sample_rate=level_sr,
+            n_fft=self.n_fft // factor,
+            hop_length=self.hop_length // factor,
+            yin_frame_length=max(self.yin_frame_length // factor,
+                                 min_yin_frame_length(level_sr, self.yin_fmin)),
+            yin_hop_length=self.yin_hop // factor
+        )
+
+    @property
+    def cache_token(self) -> str:
+        """Eindeutige Kennung aller Parameter (Teil der Cache-Schlüssel)."""
+        return "|".join(f"{value}" for value in asdict(self).values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Parametersatz als Dict (z.B. für das Analyse-Ergebnis)."""
+        return asdict(self)
+
+def min_yin_frame_length(sr: int, fmin: float) -> int:
+    """Kleinste Zweierpotenz als YIN-Frame, in die die Periode von fmin passt.
+
+    librosa.yin verlangt sr / fmin < frame_length - frame_length // 2 - 1.
+    """
+    required = 2 * (math.ceil(sr / fmin) + 2)
+    return 2 ** math.ceil(math.log2(required))
+
+DEFAULT_QUALITY = 'balanced'
+
+QUALITY_TIERS: Dict[str, AnalysisQuality] = {
+    # Schnelle Übe-Checks: niedrigere Rate, gröbere Frames, Chroma aus dem STFT
+    'fast': AnalysisQuality(
+        name='fast',
+        sample_rate=16000,
+        n_fft=1024,
+        hop_length=512,
+        chroma='stft',
+        yin_frame_length=1024,
+        yin_hop_length=512,
+        yin_fmax=float(librosa.note_to_hz("C6")),
+        resample_quality='QQ',
+    ),
+    # Bisherige Frame-Parameter; Tonhöhe, Onsets und RMS auf dezimiertem Signal
+    'balanced': AnalysisQuality(name='balanced'),
+    # Feinere Zeitauflösung, bester Resampler, alle Features bei voller Rate
+    'accurate': AnalysisQuality(
+        name='accurate',
+        hop_length=256,
+        yin_hop_length=256,
+        resample_quality='VHQ',
+        pyramid=False,
+    ),
+}
+
+def resolve_quality(name: Optional[str] = None,
+                    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                    default: str = DEFAULT_QUALITY) -> AnalysisQuality:
+    """Bestimmt den Parametersatz einer Qualitätsstufe.
+
+    Args:
+        name: Name der Stufe (None = default)
+        overrides: Anpassungen pro Stufe aus der Config (z.B. {'fast': {'hop_length': 1024}});
+            Frequenzen dürfen als Notenname angegeben werden (z.B. 'C2')
+        default: Stufe, wenn name nicht gesetzt ist
+
+    Returns:
+        AnalysisQuality der Stufe
+
+    Raises:
+        ValueError: Bei unbekannter Stufe oder unbekanntem Parameter
+    """
+    name = (name or default).strip().lower()
+    if name not in QUALITY_TIERS:
+        raise ValueError(
+            f"Unbekannte Qualitätsstufe '{name}' (erlaubt: {', '.join(QUALITY_TIERS)})"
+        )
+
+    values = dict((overrides or {}).get(name) or {})
+    allowed = {field.name for field in fields(AnalysisQuality)} - {'name'}
+    unknown = set(values) - allowed
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter für Qualitätsstufe '{name}': {', '.join(sorted(unknown))}")
+    for key in ('yin_fmin', 'yin_fmax'):
+        if isinstance(values.get(key), str):
+            values[key] = float(librosa.note_to_hz(values[key]))
+
+    quality = replace(QUALITY_TIERS[name], **values)
+    if quality.chroma not in ('cqt', 'stft'):
+        raise ValueError(f"Unbekanntes Chroma-Verfahren '{quality.chroma}' (erlaubt: cqt, stft)")
+    return quality
@@ -0,0 +1,210 @@
+# Segment Feature Context - Segment-Sicht auf die Features der Gesamtaufnahme
+#
+# Im Analyse-Modus 'global' werden STFT, Mel/MFCC, Chroma, RMS, Onsets und YIN
+# einmal über die gesamte Aufnahme berechnet. Ein SegmentFeatureContext gibt
+# davon nur Frame-Slices (Views) zurück und beantwortet Statistiken über die
+# Präfixsummen des Eltern-Contexts in O(1).
+
+import librosa
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from .feature_context import FeatureContext
+from .frame_statistics import WindowedCorrelation, WindowStats
+
+class SegmentFeatureContext(FeatureContext):
+    """FeatureContext eines Segments auf Basis der Gesamtaufnahme.
+
+    Frame k eines eigenständig analysierten Segments entspricht (bei
+    zentrierten Frames) dem Eltern-Frame round(start_sample / hop) + k.
+    Frame-Repräsentationen werden daher nicht neu berechnet, sondern aus
+    dem Eltern-Context geschnitten.
+
+    Example:
+        recording = FeatureContext(y, sr)
+        segment = SegmentFeatureContext(recording, 0, 8 * sr)
+        segment.stats('rms').mean()   # O(1) über Präfixsummen
+    """
+
+    def __init__(self, parent: FeatureContext, start_sample: int, end_sample: int,
+                 segment_samples: Optional[int] = None):
+        """Initialisiert den Segment-Context.
+
+        Args:
+            parent: FeatureContext der gesamten Aufnahme
+            start_sample: Erstes Sample des Segments
+            end_sample: Letztes Sample (exklusiv)
+            segment_samples: Nominelle Segment-Länge (kurzes letztes Segment
+                wird für sample-basierte Features mit Nullen aufgefüllt)
+        """
+        y = parent.y[start_sample:end_sample]
+        if segment_samples and len(y) < segment_samples:
+            y = np.pad(y, (0, segment_samples - len(y)), mode='constant')
+
+        super().__init__(y, parent.sr, parent.quality)
+        self.parent = parent
+        self.start_sample = start_sample
+        self.num_samples = end_sample - start_sample
+        self.segment_samples = segment_samples
+
+    def _build_level(self, factor: int) -> 'SegmentFeatureContext':
+        """Stufe als Segment-Sicht auf die dezimierte Gesamtaufnahme."""
+        return SegmentFeatureContext(
+            self.parent._level(factor),
+            self.start_sample // factor,
+            (self.start_sample + self.num_samples) // factor,
+            self.segment_samples // factor if self.segment_samples else None
+        )
+
+    # ------------------------------------------------------------------
+    # Frame-Zuordnung
+    # ------------------------------------------------------------------
+
+    def frame_range(self, hop_length: int, num_frames: int) -> Tuple[int, int]:
+        """Frame-Fenster [start, end) des Segments im Eltern-Verlauf.
+
+        Args:
+            hop_length: Hop-Länge der Repräsentation
+            num_frames: Anzahl Frames des Eltern-Verlaufs
+
+        Returns:
+            Tuple (start_frame, end_frame)
+        """
+        start = int(round(self.start_sample / hop_length))
+        end = start + 1 + self.num_samples // hop_length
+        return min(start, num_frames), min(end, num_frames)
+
+    def _slice(self, frames: np.ndarray, hop_length: Optional[int]) -> np.ndarray:
+        """Schneidet das Segment-Fenster aus einem Eltern-Verlauf (View)."""
+        start, end = self.frame_range(hop_length or self.hop_length, frames.shape[-1])
+        return frames[..., start:end]
+
+    def _hop_length(self, name: str, params: Dict) -> int:
+        """Hop-Länge einer Repräsentation anhand ihrer Parameter."""
+        if name == 'yin':
+            return self.quality.yin_params(**params)[3]
+        return self.quality.frame_params(hop_length=params.get('hop_length'))[1]
+
+    # ------------------------------------------------------------------
+    # Frame-Repräsentationen (Slices der Gesamtaufnahme)
+    # ------------------------------------------------------------------
+
+    def stft_magnitude(self, n_fft: Optional[int] = None,
+                       hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.stft_magnitude(n_fft, hop_length), hop_length)
+
+    def power_spectrogram(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.power_spectrogram(n_fft, hop_length), hop_length)
+
+    def mel_spectrogram(self, n_fft: Optional[int] = None,
+                        hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.mel_spectrogram(n_fft, hop_length), hop_length)
+
+    def mel_db(self, n_fft: Optional[int] = None,
+               hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.mel_db(n_fft, hop_length), hop_length)
+
+    def mfcc(self, n_mfcc: int = 13, n_fft: Optional[int] = None,
+             hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.mfcc(n_mfcc, n_fft, hop_length), hop_length)
+
+    def chroma(self, hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.chroma(hop_length), hop_length)
+
+    def chroma_cqt(self, hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.chroma_cqt(hop_length), hop_length)
+
+    def chroma_stft(self, n_fft: Optional[int] = None,
+                    hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.chroma_stft(n_fft, hop_length), hop_length)
+
+    def spectral_centroid(self, n_fft: Optional[int] = None,
+                          hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.spectral_centroid(n_fft, hop_length), hop_length)
+
+    def spectral_bandwidth(self, n_fft: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.spectral_bandwidth(n_fft, hop_length), hop_length)
+
+    def spectral_rolloff(self, n_fft: Optional[int] = None,
+                         hop_length: Optional[int] = None,
+                         roll_percent: float = 0.85) -> np.ndarray:
+        return self._slice(self.parent.spectral_rolloff(n_fft, hop_length, roll_percent), hop_length)
+
+    def zero_crossing_rate(self, frame_length: Optional[int] = None,
+                           hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.zero_crossing_rate(frame_length, hop_length), hop_length)
+
+    def rms(self, frame_length: Optional[int] = None,
+            hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.rms(frame_length, hop_length), hop_length)
+
+    def onset_envelope(self, hop_length: Optional[int] = None) -> np.ndarray:
+        return self._slice(self.parent.onset_envelope(hop_length), hop_length)
+
+    def onset_frames(self, hop_length: Optional[int] = None) -> np.ndarray:
+        """Onsets der Gesamtaufnahme innerhalb des Segments (segment-relativ)."""
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        frames = self.parent.onset_frames(hop_length)
+        start, end = self.frame_range(hop_length, len(self.parent.onset_envelope(hop_length)))
+        return frames[(frames >= start) & (frames < end)] - start
+
+    def yin(self, fmin: Optional[float] = None, fmax: Optional[float] = None,
+            frame_length: Optional[int] = None, hop_length: Optional[int] = None) -> np.ndarray:
+        pitches = self.parent.yin(fmin, fmax, frame_length, hop_length)
+        return self._slice(pitches, self.quality.yin_params(fmin, fmax, frame_length, hop_length)[3])
+
+    def tempo(self, hop_length: Optional[int] = None) -> float:
+        """Lokales Tempo aus den Beats der Gesamtaufnahme im Segment.
+
+        Beat-Tracking auf 8 s Ausschnitten ist teuer und instabil. Stattdessen
+        wird einmal global getrackt und das Tempo aus den Beat-Abständen im
+        Segment bestimmt (Fallback: globales Tempo).
+        """
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        global_tempo, beats = self.parent.beat_track(hop_length)
+        start, end = self.frame_range(hop_length, len(self.parent.onset_envelope(hop_length)))
+        local_beats = beats[(beats >= start) & (beats < end)]
+        if len(local_beats) < 2:
+            return global_tempo
+
+        intervals = np.diff(librosa.frames_to_time(local_beats, sr=self.sr, hop_length=hop_length))
+        return float(60.0 / np.median(intervals))
+
+    def beat_track(self, hop_length: Optional[int] = None) -> Tuple[float, np.ndarray]:
+        hop_length = self.quality.frame_params(hop_length=hop_length)[1]
+        _, beats = self.parent.beat_track(hop_length)
+        start, end = self.frame_range(hop_length, len(self.parent.onset_envelope(hop_length)))
+        return self.tempo(hop_length), beats[(beats >= start) & (beats < end)] - start
+
+    # ------------------------------------------------------------------
+    # Statistiken über Präfixsummen der Gesamtaufnahme
+    # ------------------------------------------------------------------
+
+    def stats(self, name: str, only_positive: bool = False, **params) -> WindowStats:
+        """Statistik des Segments in O(1) aus den Eltern-Präfixsummen."""
+        prefix = self.parent.prefix_statistics(name, only_positive, **params)
+        start, end = self.frame_range(self._hop_length(name, params), prefix.length)
+        return prefix.window(start, end)
+
+    def correlation(self, other: FeatureContext, name: str, **params) -> Optional[float]:
+        """Korrelation in O(1), wenn beide Segmente am selben Frame beginnen."""
+        if not isinstance(other, SegmentFeatureContext):
+            return super().correlation(other, name, **params)
+
+        hop_length = self._hop_length(name, params)
+        x_full = getattr(self.parent, name)(**params)
+        y_full = getattr(other.parent, name)(**params)
+        start, end = self.frame_range(hop_length, len(x_full))
+        other_start, other_end = other.frame_range(hop_length, len(y_full))
+        if start != other_start:
+            return super().correlation(other, name, **params)
+
+        key = ('windowed_correlation', id(other.parent), name, tuple(sorted(params.items())))
+        windowed = self.parent._memoize(key, lambda: WindowedCorrelation(x_full, y_full))
+        return windowed.correlation(start, min(end, other_end))
+
+    def __repr__(self):
+        return (f"SegmentFeatureContext(start={self.start_sample}, samples={self.num_samples}, "
+                f"sr={self.sr})")
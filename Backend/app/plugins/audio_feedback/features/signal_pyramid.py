@@ -0,0 +1,63 @@
+# Signal Pyramid - Dezimierte Stufen eines Signals für Analyzer mit geringerer Bandbreite
+#
+# Tonhöhe (YIN), Onsets und RMS-Verläufe kommen mit 11025 Hz oder weniger aus;
+# nur spektrale Features (Centroid, Rolloff, Bandwidth) und MFCC werten das
+# volle Band aus. Die Feature-Contexts bauen deshalb bei Bedarf eine Pyramide
+# halbierter Sample-Raten auf: jede Stufe entsteht mit genau einer Tiefpass-
+# gefilterten Dezimation aus der vorherigen und wird im Context gecacht.
+# Frame- und Hop-Längen werden mitskaliert (AnalysisQuality.decimated), so
+# dass die Frames aller Stufen auf demselben Zeitraster liegen.
+
+import librosa
+import numpy as np
+from typing import Optional
+
+from .quality import AnalysisQuality
+
+# Anteil der Nyquist-Frequenz, bis zu dem der Resampler das Band erhält
+_PASSBAND = 0.95
+
+def pyramid_factor(quality: AnalysisQuality, sr: int, rate: Optional[int]) -> int:
+    """Größter Dezimationsfaktor, dessen Stufe noch mindestens rate Hz hat.
+
+    Es wird nur halbiert, solange Sample-Rate, Frame- und Hop-Längen ohne
+    Rest teilbar sind und der YIN-Suchbereich unter der Nyquist-Frequenz
+    der Stufe bleibt.
+
+    Args:
+        quality: Qualitätsstufe des Signals (pyramid=False -> immer 1)
+        sr: Sample-Rate des Signals
+        rate: Benötigte Mindest-Sample-Rate (None = volle Rate)
+
+    Returns:
+        Dezimationsfaktor (Zweierpotenz, 1 = volle Rate)
+    """
+    if rate is None or not quality.pyramid:
+        return 1
+
+    lengths = (quality.n_fft, quality.hop_length, quality.yin_frame_length, quality.yin_hop)
+    factor = 1
+    while True:
+        next_factor = factor * 2
+        level_sr = sr / next_factor
+        if level_sr < rate or sr % next_factor or any(length % next_factor for length in lengths):
+            return factor
+        if quality.yin_fmax >= level_sr / 2 * _PASSBAND:
+            return factor
+        factor = next_factor
+
+def decimate(y: np.ndarray, sr: int, quality: AnalysisQuality) -> np.ndarray:
+    """Halbiert die Sample-Rate eines Signals (Anti-Aliasing-Tiefpass + Dezimation).
+
+    Args:
+        y: Signal oder Signal-Matrix (Zeit auf der letzten Achse)
+        sr: Sample-Rate des Signals (gerade)
+        quality: Qualitätsstufe (bestimmt den soxr-Resampler)
+
+    Returns:
+        Signal mit sr // 2
+    """
+    return librosa.resample(
+        y, orig_sr=sr, target_sr=sr // 2,
+        res_type=f"soxr_{quality.resample_quality.lower()}", axis=-1
+    )
@@ -34,18 +34,77 @@ class BaseReportGenerator(ABC):
         """
         pass
     
-    @abstractmethod
     def generate_report(self, segment_results: List[Dict[str, Any]]) -> str:
         """Generiert den Musik-Analyse-Report.
         
+        Setzt Kopf, einen Abschnitt pro Segment und Abschluss zusammen.
+        Dieselben Abschnitte werden beim Streaming einzeln gesendet.
+        
         Args:
             segment_results: Liste der Segment-Analyse-Ergebnisse
             
         Returns:
             Formatierter Report als String
         """
+        parts = [self.render_header()]
+        parts.extend(
+            self.render_segment(idx, segment)
+            for idx, segment in enumerate(segment_results, 1)
+        )
+        parts.append(self.render_footer())
+        return "\n".join(parts)
+    
+    def render_header(self) -> str:
+        """Rendert den Report-Kopf.
+        
+        Returns:
+            Kopfzeilen des Reports
+        """
+        return ""
+    
+    @abstractmethod
+    def render_segment(self, idx: int, segment: Dict[str, Any]) -> str:
+        """Rendert den Report-Abschnitt eines Segments.
+        
+        Args:
+            idx: Segment-Nummer (1-basiert)
+            segment: Segment-Analyse-Ergebnis
+            
+        Returns:
+            Formatierter Abschnitt als String
+        """
         pass
     
+    def render_footer(self) -> str:
+        """Rendert den Report-Abschluss.
+        
+        Returns:
+            Abschlusszeilen des Reports
+        """
+        return ""
+    
+    def _segment_notes(self, segment: Dict[str, Any]) -> List[str]:
+        """Hinweise zu stillen oder gekürzten Segmenten (siehe Stille-Erkennung).
+        
+        Args:
+            segment: Segment-Analyse-Ergebnis
+            
+        Returns:
+            Hinweiszeilen (leer bei normal analysierten Segmenten)
+        """
+        silence = segment.get('silence') or {}
+        notes = []
+        if segment.get('skipped'):
+            notes.append("Hinweis: Referenz und Schüler-Aufnahme sind in diesem Segment still "
+                         "(nicht analysiert).")
+        elif silence.get('referenz'):
+            notes.append("Hinweis: Die Referenz ist in diesem Segment still.")
+        elif silence.get('schueler'):
+            notes.append("Hinweis: Die Schüler-Aufnahme ist in diesem Segment still.")
+        if segment.get('trimmed'):
+            notes.append("Hinweis: Kürzeres letztes Segment, analysiert bis zum Ende des Spiels.")
+        return notes
+    
     def _is_feature_enabled(self, feature_name: str) -> bool:
         """Prüft ob ein Feature aktiviert ist.
         
@@ -92,62 +92,81 @@ class DetailedReportGenerator(BaseReportGenerator):
             'energy_envelope_correlation': 'Energie-Korrelation'
         }
     
-    def generate_report(self, segment_results: List[Dict[str, Any]]) -> str:
-        """Generiert detaillierten Musik-Analyse-Report.
+    def render_header(self) -> str:
+        """Rendert den Report-Kopf.
         
-        Args:
-            segment_results: Liste der Segment-Analyse-Ergebnisse
-            
         Returns:
-            Formatierter Report mit Box-Design
+            Kopfzeilen des Reports
         """
         lines = ["\n" + "="*70]
         lines.append("MUSIK-ANALYSE-REPORT (DETAILLIERT)")
         lines.append("="*70 + "\n")
+        return "\n".join(lines)
+    
+    def render_segment(self, idx: int, segment: Dict[str, Any]) -> str:
+        """Rendert den Report-Abschnitt eines Segments im Box-Design.
         
-        for idx, segment in enumerate(segment_results, 1):
-            lines.append(f"\n{'─'*70}")
-            lines.append(f"Segment {idx}  |  Zeit: {segment['schueler_start']:.1f}s - {segment['schueler_end']:.1f}s")
-            lines.append('─'*70 + "\n")
-            
-            analysis = segment.get('analysis', {})
-            
-            # Gruppiere Features nach Kategorien
-            tempo_features = self._extract_category_features(analysis, ['tempo', 'onset_count', 'rhythm'])
-            pitch_features = self._extract_category_features(analysis, ['pitch', 'key', 'chord', 'vibrato'])
-            dynamics_features = self._extract_category_features(analysis, ['rms', 'dynamic', 'silence', 'attack'])
-            timbre_features = self._extract_category_features(analysis, ['centroid', 'bandwidth', 'timbre', 'mfcc'])
-            comparison_features = self._extract_comparison_features(analysis)
-            
-            # Formatiere jede Kategorie
-            if tempo_features and self._is_category_enabled('tempo_rhythm'):
-                lines.append("┌─ TEMPO & RHYTHMUS")
-                lines.extend(self._format_features_with_context(tempo_features))
-                lines.append("")
-            
-            if pitch_features and self._is_category_enabled('pitch_harmony'):
-                lines.append("┌─ TONHÖHE & HARMONIE")
-                lines.extend(self._format_features_with_context(pitch_features))
-                lines.append("")
-            
-            if dynamics_features and self._is_category_enabled('dynamics'):
-                lines.append("┌─ LAUTSTÄRKE & AUSDRUCK")
-                lines.extend(self._format_features_with_context(dynamics_features))
-                lines.append("")
-            
-            if timbre_features and self._is_category_enabled('timbre'):
-                lines.append("┌─ KLANGFARBE")
-                lines.extend(self._format_features_with_context(timbre_features))
-                lines.append("")
+        Args:
+            idx: Segment-Nummer (1-basiert)
+            segment: Segment-Analyse-Ergebnis
             
-            if comparison_features and self.config.get('include_comparisons', True):
-                lines.append("┌─ VERGLEICH REFERENZ ↔ SCHÜLER")
-                lines.extend(self._format_comparison_with_interpretation(comparison_features))
-                lines.append("")
+        Returns:
+            Formatierter Abschnitt
+        """
+        lines = [f"\n{'─'*70}"]
+        lines.append(f"Segment {idx}  |  Zeit: {segment['schueler_start']:.1f}s - {segment['schueler_end']:.1f}s")
+        lines.append('─'*70 + "\n")
+        
+        notes = self._segment_notes(segment)
+        if notes:
+            lines.extend(notes)
+            lines.append("")
+        
+        analysis = segment.get('analysis', {})
+        
+        # Gruppiere Features nach Kategorien
+        tempo_features = self._extract_category_features(analysis, ['tempo', 'onset_count', 'rhythm'])
+        pitch_features = self._extract_category_features(analysis, ['pitch', 'key', 'chord', 'vibrato'])
+        dynamics_features = self._extract_category_features(analysis, ['rms', 'dynamic', 'silence', 'attack'])
+        timbre_features = self._extract_category_features(analysis, ['centroid', 'bandwidth', 'timbre', 'mfcc'])
+        comparison_features = self._extract_comparison_features(analysis)
+        
+        # Formatiere jede Kategorie
+        if tempo_features and self._is_category_enabled('tempo_rhythm'):
+            lines.append("┌─ TEMPO & RHYTHMUS")
+            lines.extend(self._format_features_with_context(tempo_features))
+            lines.append("")
+        
+        if pitch_features and self._is_category_enabled('pitch_harmony'):
+            lines.append("┌─ TONHÖHE & HARMONIE")
+            lines.extend(self._format_features_with_context(pitch_features))
+            lines.append("")
+        
+        if dynamics_features and self._is_category_enabled('dynamics'):
+            lines.append("┌─ LAUTSTÄRKE & AUSDRUCK")
+            lines.extend(self._format_features_with_context(dynamics_features))
+            lines.append("")
+        
+        if timbre_features and self._is_category_enabled('timbre'):
+            lines.append("┌─ KLANGFARBE")
+            lines.extend(self._format_features_with_context(timbre_features))
+            lines.append("")
+        
+        if comparison_features and self.config.get('include_comparisons', True):
+            lines.append("┌─ VERGLEICH REFERENZ ↔ SCHÜLER")
+            lines.extend(self._format_comparison_with_interpretation(comparison_features))
+            lines.append("")
         
-        lines.append("="*70)
         return "\n".join(lines)
     
+    def render_footer(self) -> str:
+        """Rendert den Report-Abschluss.
+        
+        Returns:
+            Abschlusszeile des Reports
+        """
+        return "="*70
+    
     def _is_category_enabled(self, category: str) -> bool:
         """Prüft ob eine Kategorie aktiviert ist."""
         category_order = self.config.get('category_order', [])
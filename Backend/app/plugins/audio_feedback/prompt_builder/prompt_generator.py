@@ -100,6 +100,17 @@ class PromptGenerator(BasePromptBuilder):
             "report_variant": self.report_variant
         }
     
+    def render_segment_report(self, segment_result: Dict[str, Any]) -> str:
+        """Rendert den Report-Abschnitt eines einzelnen Segments (für Streaming).
+        
+        Args:
+            segment_result: Segment-Analyse-Ergebnis (mit 'segment'-Nummer)
+            
+        Returns:
+            Report-Abschnitt wie im Gesamt-Report
+        """
+        return self.report_generator.render_segment(segment_result['segment'], segment_result)
+    
     def _build_pedagogical_system_prompt(
         self,
         language: str,
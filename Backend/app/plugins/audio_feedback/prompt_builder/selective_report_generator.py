@@ -103,14 +103,11 @@ class SelectiveReportGenerator(BaseReportGenerator):
             'energy_envelope_correlation': 'Energie-Korrelation'
         }
     
-    def generate_report(self, segment_results: List[Dict[str, Any]]) -> str:
-        """Generiert Report mit ausgewählten Features.
+    def render_header(self) -> str:
+        """Rendert den Report-Kopf mit Info über aktive Features.
         
-        Args:
-            segment_results: Liste der Segment-Analyse-Ergebnisse
-            
         Returns:
-            Formatierter Report mit nur aktivierten Features
+            Kopfzeilen des Reports
         """
         # Info über aktive Features
         active_features = self.config.get('enabled_features', None)
@@ -126,47 +123,71 @@ class SelectiveReportGenerator(BaseReportGenerator):
             lines.append("  " + ", ".join(active_features))
             lines.append("")
         
-        for idx, segment in enumerate(segment_results, 1):
-            lines.append(f"\n{'─'*70}")
-            lines.append(f"Segment {idx}  |  Zeit: {segment['schueler_start']:.1f}s - {segment['schueler_end']:.1f}s")
-            lines.append('─'*70 + "\n")
-            
-            analysis = segment.get('analysis', {})
-            
-            # Gruppiere Features nach Kategorien (mit Feature-Filter)
-            tempo_features = self._extract_category_features(analysis, ['tempo', 'onset_count', 'rhythm'])
-            pitch_features = self._extract_category_features(analysis, ['pitch', 'key', 'chord', 'vibrato'])
-            dynamics_features = self._extract_category_features(analysis, ['rms', 'dynamic', 'silence', 'attack'])
-            timbre_features = self._extract_category_features(analysis, ['centroid', 'bandwidth', 'timbre', 'mfcc'])
-            comparison_features = self._extract_comparison_features(analysis)
-            
-            # Formatiere nur Kategorien mit aktivierten Features
-            if tempo_features:
-                lines.append("┌─ TEMPO & RHYTHMUS")
-                lines.extend(self._format_features_with_context(tempo_features))
-                lines.append("")
-            
-            if pitch_features:
-                lines.append("┌─ TONHÖHE & HARMONIE")
-                lines.extend(self._format_features_with_context(pitch_features))
-                lines.append("")
-            
-            if dynamics_features:
-                lines.append("┌─ LAUTSTÄRKE & AUSDRUCK")
-                lines.extend(self._format_features_with_context(dynamics_features))
-                lines.append("")
-            
-            if timbre_features:
-                lines.append("┌─ KLANGFARBE")
-                lines.extend(self._format_features_with_context(timbre_features))
-                lines.append("")
+        return "\n".join(lines)
+    
+    def render_segment(self, idx: int, segment: Dict[str, Any]) -> str:
+        """Rendert den Report-Abschnitt eines Segments mit ausgewählten Features.
+        
+        Args:
+            idx: Segment-Nummer (1-basiert)
+            segment: Segment-Analyse-Ergebnis
             
-            if comparison_features and self.config.get('include_comparisons', True):
-                lines.append("┌─ VERGLEICH REFERENZ ↔ SCHÜLER")
-                lines.extend(self._format_comparison_features(comparison_features))
-                lines.append("")
+        Returns:
+            Formatierter Abschnitt mit nur aktivierten Features
+        """
+        lines = [f"\n{'─'*70}"]
+        lines.append(f"Segment {idx}  |  Zeit: {segment['schueler_start']:.1f}s - {segment['schueler_end']:.1f}s")
+        lines.append('─'*70 + "\n")
         
-        lines.append("="*70)
+        notes = self._segment_notes(segment)
+        if notes:
+            lines.extend(notes)
+            lines.append("")
+        
+        analysis = segment.get('analysis', {})
+        
+        # Gruppiere Features nach Kategorien (mit Feature-Filter)
+        tempo_features = self._extract_category_features(analysis, ['tempo', 'onset_count', 'rhythm'])
+        pitch_features = self._extract_category_features(analysis, ['pitch', 'key', 'chord', 'vibrato'])
+        dynamics_features = self._extract_category_features(analysis, ['rms', 'dynamic', 'silence', 'attack'])
+        timbre_features = self._extract_category_features(analysis, ['centroid', 'bandwidth', 'timbre', 'mfcc'])
+        comparison_features = self._extract_comparison_features(analysis)
+        
+        # Formatiere nur Kategorien mit aktivierten Features
+        if tempo_features:
+            lines.append("┌─ TEMPO & RHYTHMUS")
+            lines.extend(self._format_features_with_context(tempo_features))
+            lines.append("")
+        
+        if pitch_features:
+            lines.append("┌─ TONHÖHE & HARMONIE")
+            lines.extend(self._format_features_with_context(pitch_features))
+            lines.append("")
+        
+        if dynamics_features:
+            lines.append("┌─ LAUTSTÄRKE & AUSDRUCK")
+            lines.extend(self._format_features_with_context(dynamics_features))
+            lines.append("")
+        
+        if timbre_features:
+            lines.append("┌─ KLANGFARBE")
+            lines.extend(self._format_features_with_context(timbre_features))
+            lines.append("")
+        
+        if comparison_features and self.config.get('include_comparisons', True):
+            lines.append("┌─ VERGLEICH REFERENZ ↔ SCHÜLER")
+            lines.extend(self._format_comparison_features(comparison_features))
+            lines.append("")
+        
+        return "\n".join(lines)
+    
+    def render_footer(self) -> str:
+        """Rendert den Report-Abschluss.
+        
+        Returns:
+            Abschlusszeilen des Reports
+        """
+        lines = ["="*70]
         lines.append(f"\nHinweis: Dieser Report enthält nur ausgewählte Features.")
         lines.append("="*70)
         return "\n".join(lines)
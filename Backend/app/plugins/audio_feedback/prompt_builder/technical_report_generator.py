@@ -35,41 +35,63 @@ class TechnicalReportGenerator(BaseReportGenerator):
         # Bei technischem Report: Feature-Namen = Key-Namen
         self.feature_contexts = {}
     
-    def generate_report(self, segment_results: List[Dict[str, Any]]) -> str:
-        """Generiert technischen Feature-Extraktion-Report.
+    def render_header(self) -> str:
+        """Rendert den Report-Kopf.
         
-        Args:
-            segment_results: Liste der Segment-Analyse-Ergebnisse
-            
         Returns:
-            Kompakter Report mit rohen Feature-Daten
+            Kopfzeilen des Reports
         """
         lines = ["\n" + "="*70]
         lines.append("FEATURE EXTRACTION REPORT")
         lines.append("="*70 + "\n")
+        return "\n".join(lines)
+    
+    def render_segment(self, idx: int, segment: Dict[str, Any]) -> str:
+        """Rendert den Report-Abschnitt eines Segments mit rohen Feature-Daten.
         
-        for idx, segment in enumerate(segment_results, 1):
-            lines.append(f"SEGMENT {idx}")
-            lines.append(f"Time Range: {segment['schueler_start']:.2f}s - {segment['schueler_end']:.2f}s")
-            lines.append("-" * 40)
-            
-            analysis = segment.get('analysis', {})
-            
-            # Gruppiere nach Feature-Typen
-            feature_groups = self._group_features_by_type(analysis)
+        Args:
+            idx: Segment-Nummer (1-basiert)
+            segment: Segment-Analyse-Ergebnis
             
-            for group_name, features in feature_groups.items():
-                if not features:
-                    continue
-                
-                lines.append(f"\n{group_name.upper()}:")
-                lines.extend(self._format_technical_features(features))
+        Returns:
+            Kompakter Abschnitt
+        """
+        lines = [f"SEGMENT {idx}"]
+        lines.append(f"Time Range: {segment['schueler_start']:.2f}s - {segment['schueler_end']:.2f}s")
+        lines.append("-" * 40)
+        
+        silence = segment.get('silence') or {}
+        if segment.get('skipped'):
+            lines.append("SKIPPED: silent in both recordings")
+        elif silence.get('referenz') or silence.get('schueler'):
+            silent_roles = [role for role in ('referenz', 'schueler') if silence.get(role)]
+            lines.append(f"SILENT: {', '.join(silent_roles)}")
+        if segment.get('trimmed'):
+            lines.append("TRIMMED: analyzed up to the last active sample (no padding)")
+        
+        analysis = segment.get('analysis', {})
+        
+        # Gruppiere nach Feature-Typen
+        feature_groups = self._group_features_by_type(analysis)
+        
+        for group_name, features in feature_groups.items():
+            if not features:
+                continue
             
-            lines.append("\n")
+            lines.append(f"\n{group_name.upper()}:")
+            lines.extend(self._format_technical_features(features))
         
-        lines.append("="*70)
+        lines.append("\n")
         return "\n".join(lines)
     
+    def render_footer(self) -> str:
+        """Rendert den Report-Abschluss.
+        
+        Returns:
+            Abschlusszeile des Reports
+        """
+        return "="*70
+    
     def _group_features_by_type(self, analysis: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Gruppiert Features nach technischen Kategorien."""
         groups = {
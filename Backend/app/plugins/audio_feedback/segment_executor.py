@@ -0,0 +1,293 @@
+# Segment Executor - Parallele Segment-Analyse in einem persistenten Prozess-Pool
+#
+# Die dekodierten Aufnahmen werden einmal in multiprocessing.shared_memory
+# kopiert. Worker mappen die Arrays nur (kein Pickling der Audiodaten) und
+# analysieren ihr Segment-Paar auf Views. Liegt eine Aufnahme bereits als
+# gemappte PCM-Datei vor, mappen die Worker direkt diese Datei (keine Kopie).
+# Mehrere Segment-Paare pro Task werden im Worker gestapelt analysiert.
+# Die Ergebnisse werden in Segment-Reihenfolge zusammengeführt.
+
+import json
+import math
+import mmap
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+class SharedAudioBuffer:
+    """Audio-Array in einem Shared-Memory-Block oder einer gemappten .npy-Datei.
+
+    Der erzeugende Prozess besitzt den Block und gibt ihn mit release()
+    frei. Worker greifen über spec und attach() darauf zu.
+    """
+
+    def __init__(self, shm: Optional[shared_memory.SharedMemory], shape: Tuple[int, ...], dtype: str,
+                 path: Optional[str] = None):
+        """Initialisiert den Buffer (siehe create()).
+
+        Args:
+            shm: Shared-Memory-Block (None bei gemappter Datei)
+            shape: Form des Arrays
+            dtype: Datentyp des Arrays
+            path: Pfad der gemappten .npy-Datei (statt Shared Memory)
+        """
+        self._shm = shm
+        self.shape = shape
+        self.dtype = dtype
+        self.path = path
+
+    @classmethod
+    def create(cls, audio: np.ndarray) -> 'SharedAudioBuffer':
+        """Stellt ein Array für Worker bereit.
+
+        Vollständig gemappte .npy-Dateien (np.load mit mmap_mode) werden
+        per Pfad weitergegeben, alle anderen Arrays in einen neuen
+        Shared-Memory-Block kopiert.
+
+        Args:
+            audio: Dekodiertes Audio-Array
+
+        Returns:
+            SharedAudioBuffer mit Zugriff auf die Daten
+        """
+        if isinstance(audio, np.memmap) and isinstance(audio.base, mmap.mmap) and audio.filename:
+            return cls(None, audio.shape, audio.dtype.str, path=audio.filename)
+
+        audio = np.ascontiguousarray(audio)
+        shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+        buffer = np.ndarray(audio.shape, dtype=audio.dtype, buffer=shm.buf)
+        buffer[:] = audio
+        del buffer
+        return cls(shm, audio.shape, audio.dtype.str)
+
+    @property
+    def spec(self) -> Dict[str, Any]:
+        """Picklebare Beschreibung für Worker-Prozesse."""
+        if self.path is not None:
+            return {'path': self.path, 'shape': self.shape, 'dtype': self.dtype}
+        return {'name': self._shm.name, 'shape': self.shape, 'dtype': self.dtype}
+
+    @staticmethod
+    def attach(spec: Dict[str, Any]) -> Tuple[Optional[shared_memory.SharedMemory], np.ndarray]:
+        """Mappt einen bestehenden Block bzw. eine .npy-Datei als Array (ohne Kopie).
+
+        Args:
+            spec: Beschreibung aus SharedAudioBuffer.spec
+
+        Returns:
+            Tuple von (SharedMemory oder None, Array-View)
+        """
+        if 'path' in spec:
+            audio = np.load(spec['path'], mmap_mode='r')
+            if audio.shape != tuple(spec['shape']):
+                raise ValueError(f"PCM-Datei wurde verändert: {spec['path']}")
+            return None, audio
+
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        audio = np.ndarray(tuple(spec['shape']), dtype=np.dtype(spec['dtype']), buffer=shm.buf)
+        return shm, audio
+
+    def release(self):
+        """Gibt den Block frei (close + unlink)."""
+        if self._shm is None:
+            return
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+# Pipelines pro Worker-Prozess (eine pro Konfiguration, über Tasks hinweg wiederverwendet)
+_WORKER_PIPELINES: Dict[str, Any] = {}
+
+def _get_worker_pipeline(pipeline_config: Dict[str, Any]):
+    """Holt oder erstellt die Pipeline im Worker-Prozess."""
+    from .audio_feedback_pipeline import AudioFeedbackPipeline
+
+    key = json.dumps(pipeline_config, sort_keys=True, default=str)
+    if key not in _WORKER_PIPELINES:
+        _WORKER_PIPELINES[key] = AudioFeedbackPipeline(**pipeline_config)
+    return _WORKER_PIPELINES[key]
+
+def _analyze_segment_pair(pipeline_config: Dict[str, Any],
+                          ref_spec: Dict[str, Any], sch_spec: Dict[str, Any],
+                          task: Dict[str, Any]) -> Tuple[Dict, Dict, Dict]:
+    """Worker-Task: analysiert ein Segment-Paar auf Shared-Memory-Views.
+
+    Args:
+        pipeline_config: Konfiguration der Pipeline (AudioFeedbackPipeline.get_config)
+        ref_spec: Shared-Memory-Beschreibung der Referenz
+        sch_spec: Shared-Memory-Beschreibung des Schülers
+        task: Segment-Paar (ref_segment, sch_segment) mit bereits bekannten Teilen
+
+    Returns:
+        Tuple von (ref_features, sch_features, comparison)
+    """
+    pipeline = _get_worker_pipeline(pipeline_config)
+    ref_shm, ref_audio = SharedAudioBuffer.attach(ref_spec)
+    sch_shm, sch_audio = SharedAudioBuffer.attach(sch_spec)
+    try:
+        return pipeline.analyze_parts(
+            (pipeline.get_segment_view(ref_audio, task['ref_segment']), pipeline.target_sr),
+            (pipeline.get_segment_view(sch_audio, task['sch_segment']), pipeline.target_sr),
+            ref_features=task['ref_features'],
+            sch_features=task['sch_features'],
+            comparison=task['comparison'],
+            identical=task['identical'],
+            known_parts=task['known_parts']
+        )
+    finally:
+        # Views müssen vor close() freigegeben sein
+        del ref_audio, sch_audio
+        for shm in (ref_shm, sch_shm):
+            if shm is not None:
+                shm.close()
+
+def _analyze_segment_batch(pipeline_config: Dict[str, Any],
+                           ref_spec: Dict[str, Any], sch_spec: Dict[str, Any],
+                           tasks: List[Dict[str, Any]]) -> List[Tuple[Dict, Dict, Dict]]:
+    """Worker-Task: analysiert mehrere Segment-Paare gestapelt (BatchFeatureContext).
+
+    Args:
+        pipeline_config: Konfiguration der Pipeline (AudioFeedbackPipeline.get_config)
+        ref_spec: Shared-Memory-Beschreibung der Referenz
+        sch_spec: Shared-Memory-Beschreibung des Schülers
+        tasks: Segment-Paare (ref_segment, sch_segment) mit bereits bekannten Teilen
+
+    Returns:
+        (ref_features, sch_features, comparison) pro Task in Reihenfolge
+    """
+    pipeline = _get_worker_pipeline(pipeline_config)
+    ref_shm, ref_audio = SharedAudioBuffer.attach(ref_spec)
+    sch_shm, sch_audio = SharedAudioBuffer.attach(sch_spec)
+    try:
+        return pipeline.analyze_task_batch(tasks, ref_audio, sch_audio)
+    finally:
+        del ref_audio, sch_audio
+        for shm in (ref_shm, sch_shm):
+            if shm is not None:
+                shm.close()
+
+class SegmentExecutor:
+    """Persistenter Prozess-Pool für die Segment-Analyse.
+
+    Der Pool wird beim ersten Einsatz gestartet (spawn, damit Worker keine
+    Threads/Locks des Flask-Prozesses erben) und bleibt bis shutdown() aktiv.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        """Initialisiert den Executor.
+
+        Args:
+            max_workers: Anzahl Worker-Prozesse (<= 1 = seriell im Aufrufer)
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True wenn parallel analysiert wird."""
+        return self.max_workers > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Startet den Pool bei Bedarf."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                print(f"⚙️ Segment-Analyse: Prozess-Pool mit {self.max_workers} Workern gestartet")
+            return self._executor
+
+    def analyze_segments(self, pipeline_config: Dict[str, Any],
+                         ref_audio: np.ndarray, sch_audio: np.ndarray,
+                         tasks: List[Dict[str, Any]],
+                         on_task_done: Optional[Callable[[int, Tuple[Dict, Dict, Dict]], None]] = None,
+                         batch_size: int = 1
+                         ) -> List[Tuple[Dict, Dict, Dict]]:
+        """Analysiert Segment-Paare parallel.
+
+        Args:
+            pipeline_config: Konfiguration der Pipeline (AudioFeedbackPipeline.get_config)
+            ref_audio: Dekodierte Referenz-Aufnahme
+            sch_audio: Dekodierte Schüler-Aufnahme
+            tasks: Segment-Paare mit ref_segment, sch_segment und bereits
+                bekannten Teilen (ref_features, sch_features, comparison, identical)
+            on_task_done: Optionaler Callback (Task-Position, Ergebnis) nach jedem
+                fertigen Task; eine Exception darin bricht die restlichen Tasks ab.
+                Der Abbruch gilt pro Worker-Task: bereits laufende Batches werden
+                noch zu Ende gerechnet (und verworfen), bevor die Methode zurückkehrt
+            batch_size: Maximale Anzahl Segment-Paare pro Worker-Task (gestapelte
+                Analyse); wird so begrenzt, dass alle Worker ausgelastet sind
+
+        Returns:
+            (ref_features, sch_features, comparison) pro Task in Reihenfolge
+        """
+        executor = self._get_executor()
+        ref_buffer = SharedAudioBuffer.create(ref_audio)
+        sch_buffer = SharedAudioBuffer.create(sch_audio)
+
+        # Aufeinanderfolgende Tasks bündeln, aber mindestens einen Batch pro Worker bilden
+        chunk_size = max(1, min(batch_size, math.ceil(len(tasks) / self.max_workers)))
+        chunks = [list(range(start, min(start + chunk_size, len(tasks))))
+                  for start in range(0, len(tasks), chunk_size)]
+
+        futures = []
+        try:
+            futures = [
+                executor.submit(
+                    _analyze_segment_pair,
+                    pipeline_config,
+                    ref_buffer.spec,
+                    sch_buffer.spec,
+                    tasks[chunk[0]]
+                ) if len(chunk) == 1 else executor.submit(
+                    _analyze_segment_batch,
+                    pipeline_config,
+                    ref_buffer.spec,
+                    sch_buffer.spec,
+                    [tasks[position] for position in chunk]
+                )
+                for chunk in chunks
+            ]
+            results = {}
+            chunk_by_future = {future: chunk for future, chunk in zip(futures, chunks)}
+            for future in as_completed(futures):
+                chunk = chunk_by_future[future]
+                chunk_results = future.result()
+                if len(chunk) == 1:
+                    chunk_results = [chunk_results]
+                for position, parts in zip(chunk, chunk_results):
+                    results[position] = parts
+                    if on_task_done is not None:
+                        on_task_done(position, parts)
+            return [results[i] for i in range(len(tasks))]
+        except BrokenProcessPool:
+            # Abgestürzten Pool verwerfen, der nächste Aufruf startet einen neuen
+            with self._lock:
+                self._executor = None
+            raise
+        except BaseException:
+            # Noch nicht gestartete Tasks verwerfen (z.B. bei Job-Abbruch); laufende
+            # Tasks abwarten, damit sie den Audio-Buffer nicht nach release() mappen
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+        finally:
+            ref_buffer.release()
+            sch_buffer.release()
+
+    def shutdown(self):
+        """Beendet den Prozess-Pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
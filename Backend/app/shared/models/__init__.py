@@ -1,4 +1,5 @@
 # Shared Models
 from .session import Session
+from .job import Job
 
-__all__ = ['Session']
+__all__ = ['Session', 'Job']
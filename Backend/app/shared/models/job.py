@@ -0,0 +1,181 @@
+# Job Model - Repräsentiert einen asynchronen Analyse-Job
+
+from datetime import datetime
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.exceptions import JobCancelledException
+
+class Job:
+    """Repräsentiert einen asynchronen Job mit Status und Fortschritt.
+
+    Zwischenergebnisse (Fortschritt, fertige Segmente, Endzustand) werden
+    als nummerierte Events protokolliert, damit SSE-Clients sie live und
+    nach einem Reconnect ab ihrer Last-Event-ID erhalten.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id: str, session_id: str, kind: str):
+        """Initialisiert einen neuen Job.
+
+        Args:
+            job_id: Eindeutige Job-ID
+            session_id: Session, zu der der Job gehört
+            kind: Art des Jobs (z.B. 'audio-feedback')
+        """
+        self.job_id = job_id
+        self.session_id = session_id
+        self.kind = kind
+        self.status = self.QUEUED
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.progress_done = 0
+        self.progress_total = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.future = None  # concurrent.futures.Future des Worker-Pools
+
+        self._events: List[Dict[str, Any]] = []
+        self._cancel_event = threading.Event()
+        self._lock = threading.Condition()
+
+    @property
+    def is_finished(self) -> bool:
+        """True wenn der Job abgeschlossen, fehlgeschlagen oder abgebrochen ist."""
+        return self.status in (self.COMPLETED, self.FAILED, self.CANCELLED)
+
+    @property
+    def is_cancelled(self) -> bool:
+        """True wenn ein Abbruch angefordert wurde."""
+        return self._cancel_event.is_set()
+
+    def start(self):
+        """Markiert den Job als laufend (wird vom Worker aufgerufen)."""
+        with self._lock:
+            self.status = self.RUNNING
+            self._append_event(self.RUNNING, {"jobId": self.job_id})
+
+    def set_progress(self, done: int, total: int):
+        """Aktualisiert den Fortschritt (wird vom Job selbst aufgerufen).
+
+        Args:
+            done: Anzahl erledigter Schritte (z.B. Segmente)
+            total: Gesamtanzahl Schritte
+
+        Raises:
+            JobCancelledException: Wenn der Job abgebrochen wurde
+        """
+        self.check_cancelled()
+        with self._lock:
+            self.progress_done = done
+            self.progress_total = total
+        self.publish("progress", {"done": done, "total": total})
+
+    def check_cancelled(self):
+        """Bricht den laufenden Job ab, falls ein Abbruch angefordert wurde.
+
+        Raises:
+            JobCancelledException: Wenn der Job abgebrochen wurde
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelledException(f"Job {self.job_id} wurde abgebrochen")
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        """Protokolliert ein Event und weckt wartende SSE-Clients.
+
+        Args:
+            event: Event-Typ (z.B. 'segment')
+            data: Nutzdaten
+        """
+        with self._lock:
+            self._append_event(event, data)
+
+    def _append_event(self, event: str, data: Dict[str, Any]):
+        """Hängt ein Event an (Lock muss gehalten werden)."""
+        self._events.append({"id": len(self._events) + 1, "event": event, "data": data})
+        self._lock.notify_all()
+
+    def wait_for_events(self, after_id: int = 0, timeout: float = 15.0) -> List[Dict[str, Any]]:
+        """Gibt Events nach after_id zurück und wartet, falls noch keine vorliegen.
+
+        Args:
+            after_id: ID des zuletzt empfangenen Events (0 = alle)
+            timeout: Maximale Wartezeit in Sekunden
+
+        Returns:
+            List[Dict]: Neue Events (leer bei Timeout oder beendetem Job)
+        """
+        with self._lock:
+            if len(self._events) <= after_id and not self.is_finished:
+                self._lock.wait(timeout)
+            return self._events[after_id:]
+
+    def cancel(self):
+        """Fordert den Abbruch an (kooperativ, greift beim nächsten Fortschritt)."""
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            # Noch nicht gestartet -> sofort abgebrochen
+            self.finish(self.CANCELLED)
+
+    def cancel_if_queued(self) -> bool:
+        """Bricht den Job ab, falls er noch nicht gestartet wurde.
+
+        Returns:
+            bool: True wenn der Job abgebrochen wurde (lief noch nicht)
+        """
+        if self.future is not None and self.future.cancel():
+            self._cancel_event.set()
+            self.finish(self.CANCELLED)
+            return True
+        return False
+
+    def finish(self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Setzt den Endzustand des Jobs.
+
+        Args:
+            status: COMPLETED, FAILED oder CANCELLED
+            result: Ergebnis bei Erfolg
+            error: Fehlermeldung bei Fehler
+        """
+        data = {"jobId": self.job_id}
+        if result is not None:
+            data["result"] = result
+        if error:
+            data["error"] = error
+
+        # Status und End-Event atomar, damit SSE-Clients das End-Event nie verpassen
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = datetime.now()
+            self._append_event(status, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialisiert den Job für die API.
+
+        Returns:
+            Dict: Status, Fortschritt und ggf. Ergebnis/Fehler
+        """
+        with self._lock:
+            data = {
+                "jobId": self.job_id,
+                "status": self.status,
+                "progress": {
+                    "done": self.progress_done,
+                    "total": self.progress_total
+                }
+            }
+            if self.status == self.COMPLETED:
+                data["result"] = self.result
+            if self.error:
+                data["error"] = self.error
+        return data
+
+    def __repr__(self):
+        return f"Job(id={self.job_id}, session={self.session_id}, status={self.status})"
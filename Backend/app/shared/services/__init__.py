@@ -2,5 +2,7 @@
 from .session_service import SessionService
 from .storage_service import StorageService
 from .audio_service import AudioService
+from .feature_store_service import FeatureStoreService
+from .job_service import JobService
 
-__all__ = ['SessionService', 'StorageService', 'AudioService']
+__all__ = ['SessionService', 'StorageService', 'AudioService', 'FeatureStoreService', 'JobService']
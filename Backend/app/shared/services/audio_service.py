@@ -1,36 +1,483 @@
 # Audio Service - Basis-Service für Audio-Operationen
 
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+import audioread
 import librosa
 import soundfile as sf
+import soxr
 import numpy as np
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import Any, Dict, Iterable, Iterator, Tuple, List, Optional
+
+from app.core.exceptions import InvalidFileFormatException
 
 class AudioService:
     """Basis-Service für Audio-Operationen (wiederverwendbar für alle Tools)."""
     
-    def __init__(self, target_sr: int = 22050):
+    # Formate, die libsndfile direkt liest (ohne Subprozess)
+    SOUNDFILE_FORMATS = {'wav', 'flac', 'ogg'}
+    # Formate, die ffmpeg direkt in Ziel-SR und mono dekodiert (kein Python-Resampling)
+    FFMPEG_FORMATS = {'mp3', 'mp4', 'm4a', 'aac'}
+    
+    def __init__(self, target_sr: int = 22050, stream_block_sec: float = 10.0,
+                 resample_quality: str = 'HQ'):
         """Initialisiert den Audio Service.
         
         Args:
             target_sr: Ziel-Sample-Rate für Audio-Verarbeitung (Standard: 22050 Hz)
+            stream_block_sec: Blockgröße der Streaming-Dekodierung in Sekunden
+                (bestimmt den Spitzen-Speicherbedarf, nicht die Dateilänge)
+            resample_quality: soxr-Qualität beim Resampling ('QQ', 'LQ', 'MQ', 'HQ', 'VHQ')
         """
         self.target_sr = target_sr
+        self.stream_block_sec = stream_block_sec
+        self.resample_quality = resample_quality.upper()
+        self.ffmpeg_available = shutil.which('ffmpeg') is not None
+    
+    def get_pcm_path(self, file_path: Path, sr: Optional[int] = None,
+                     offset: float = 0.0, duration: Optional[float] = None) -> Path:
+        """Gibt den Pfad der kanonischen PCM-Datei zu einer Aufnahme zurück.
+        
+        Die dekodierte Fassung (mono, float32, Ziel-SR) liegt als .npy neben
+        dem Original. Der Name beginnt bewusst nicht mit '<rolle>.', damit
+        die Rollen-Erkennung der Routes (z.B. 'referenz.') sie ignoriert.
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            sr: Sample-Rate (None = Ziel-SR verwenden)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden (None = bis zum Ende)
+            
+        Returns:
+            Path: Pfad zur PCM-Datei (z.B. 'referenz_pcm_22050.npy' bzw.
+            'referenz_pcm_22050_0-60s.npy' mit Analyse-Fenster und
+            'referenz_pcm_16000_qq.npy' bei anderer Resampler-Qualität als HQ)
+        """
+        target = sr if sr is not None else self.target_sr
+        file_path = Path(file_path)
+        window = ""
+        if offset or duration:
+            window = f"_{offset:g}-{duration:g}s" if duration else f"_{offset:g}-s"
+        resampler = "" if self.resample_quality == 'HQ' else f"_{self.resample_quality.lower()}"
+        return file_path.with_name(f"{file_path.stem}_pcm_{target}{resampler}{window}.npy")
+    
+    def has_pcm(self, file_path: Path, sr: Optional[int] = None,
+                offset: float = 0.0, duration: Optional[float] = None) -> bool:
+        """Prüft ob eine aktuelle PCM-Datei zur Aufnahme existiert.
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            sr: Sample-Rate (None = Ziel-SR verwenden)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden
+            
+        Returns:
+            bool: True wenn die PCM-Datei existiert und nicht älter als das Original ist
+        """
+        pcm_path = self.get_pcm_path(file_path, sr, offset, duration)
+        try:
+            return pcm_path.stat().st_mtime >= Path(file_path).stat().st_mtime
+        except OSError:
+            return False
+    
+    def store_pcm(self, file_path: Path, audio_data: np.ndarray, sr: Optional[int] = None,
+                  offset: float = 0.0, duration: Optional[float] = None) -> Optional[Path]:
+        """Speichert dekodiertes Audio als kanonische PCM-Datei neben dem Original.
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            audio_data: Dekodierte Audio-Daten (mono)
+            sr: Sample-Rate der Daten (None = Ziel-SR)
+            offset: Start des Analyse-Fensters der Daten in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden
+            
+        Returns:
+            Optional[Path]: Pfad zur PCM-Datei oder None wenn nicht schreibbar
+        """
+        return self.store_pcm_blocks(file_path, [audio_data], sr, offset, duration)
+    
+    def store_pcm_blocks(self, file_path: Path, blocks: Iterable[np.ndarray],
+                         sr: Optional[int] = None, offset: float = 0.0,
+                         duration: Optional[float] = None) -> Optional[Path]:
+        """Schreibt Audio-Blöcke als kanonische PCM-Datei (.npy) neben das Original.
+        
+        Die Blöcke werden zuerst roh in eine temporäre Datei geschrieben
+        und danach hinter den .npy-Header kopiert, sodass nie mehr als ein
+        Block im Speicher liegt. Das Ergebnis wird atomar (os.replace)
+        veröffentlicht, parallele Jobs mappen nie eine halb geschriebene Datei.
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            blocks: Mono-Blöcke in Reihenfolge (z.B. aus stream_audio)
+            sr: Sample-Rate der Daten (None = Ziel-SR)
+            offset: Start des Analyse-Fensters der Daten in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden
+            
+        Returns:
+            Optional[Path]: Pfad zur PCM-Datei oder None wenn nicht schreibbar
+        """
+        pcm_path = self.get_pcm_path(file_path, sr, offset, duration)
+        if self.has_pcm(file_path, sr, offset, duration):
+            return pcm_path
+        
+        tmp_id = uuid.uuid4().hex
+        raw_path = pcm_path.with_name(f".{pcm_path.stem}.{tmp_id}.raw")
+        tmp_path = pcm_path.with_name(f".{pcm_path.stem}.{tmp_id}.tmp.npy")
+        try:
+            num_samples = 0
+            with open(raw_path, 'wb') as raw:
+                for block in blocks:
+                    block = np.ascontiguousarray(block, dtype='<f4')
+                    raw.write(block.tobytes())
+                    num_samples += len(block)
+            
+            with open(tmp_path, 'wb') as out, open(raw_path, 'rb') as raw:
+                np.lib.format.write_array_header_1_0(
+                    out, {'descr': '<f4', 'fortran_order': False, 'shape': (num_samples,)}
+                )
+                shutil.copyfileobj(raw, out, 1024 * 1024)
+            os.replace(tmp_path, pcm_path)
+        except OSError as e:
+            print(f"⚠️ PCM-Datei konnte nicht geschrieben werden ({pcm_path.name}): {e}")
+            return None
+        finally:
+            for path in (raw_path, tmp_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        return pcm_path
     
-    def load_audio(self, file_path: Path, sr: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    def stream_audio(self, file_path: Path, sr: Optional[int] = None,
+                     block_samples: Optional[int] = None, offset: float = 0.0,
+                     duration: Optional[float] = None) -> Iterator[np.ndarray]:
+        """Dekodiert eine Aufnahme blockweise (mono, float32, Ziel-SR).
+        
+        Dekodiert wird je nach Format (siehe _use_ffmpeg): MP3/MP4 über eine
+        ffmpeg-Pipe, die direkt Ziel-SR und mono liefert, WAV/FLAC/OGG per
+        soundfile.blocks ohne Subprozess. Resampelt wird nur, wenn die
+        Quell-Rate abweicht (als Stream über soxr). Der Speicherbedarf ist
+        damit proportional zur Blockgröße statt zur Dateilänge. Samples
+        außerhalb des Analyse-Fensters (offset/duration) werden nicht dekodiert.
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            sr: Sample-Rate (None = Ziel-SR verwenden)
+            block_samples: Samples pro Block (None = stream_block_sec)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden (None = bis zum Ende)
+            
+        Yields:
+            np.ndarray: Blöcke fester Größe (der letzte ggf. kürzer)
+            
+        Raises:
+            RuntimeError: Wenn die Datei nicht dekodiert werden kann
+        """
+        target = sr if sr is not None else self.target_sr
+        block = block_samples or max(int(self.stream_block_sec * target), 1)
+        
+        native_sr = None
+        if not self._use_ffmpeg(file_path):
+            try:
+                native_sr = sf.info(str(file_path)).samplerate
+            except RuntimeError:
+                if not self.ffmpeg_available:
+                    raise
+        
+        if native_sr is None:
+            # ffmpeg dekodiert und resampelt selbst
+            native_sr = target
+            blocks = self._read_blocks_ffmpeg(file_path, target, block, offset, duration)
+        else:
+            blocks = self._read_blocks_soundfile(file_path, block, native_sr, offset, duration)
+        
+        # Resampling nur bei abweichender Rate
+        if native_sr != target:
+            blocks = self._resample_blocks(blocks, native_sr, target)
+        
+        blocks = self._rebuffer(blocks, block)
+        if duration:
+            # Resampler-Nachlauf auf exakte Fensterlänge begrenzen
+            blocks = self._limit_samples(blocks, int(round(duration * target)))
+        yield from blocks
+    
+    def _use_ffmpeg(self, file_path: Path) -> bool:
+        """True wenn die Datei über die ffmpeg-Pipe dekodiert werden soll."""
+        return self.ffmpeg_available and Path(file_path).suffix.lstrip('.').lower() in self.FFMPEG_FORMATS
+    
+    def _read_blocks_soundfile(self, file_path: Path, block_samples: int, native_sr: int,
+                               offset: float = 0.0, duration: Optional[float] = None) -> Iterator[np.ndarray]:
+        """Liest Mono-Blöcke über libsndfile (Mehrkanal wird gemittelt wie in librosa)."""
+        start = int(round(offset * native_sr))
+        frames = int(round(duration * native_sr)) if duration else -1
+        for block in sf.blocks(str(file_path), blocksize=block_samples, start=start, frames=frames,
+                               dtype='float32', always_2d=True):
+            yield block.mean(axis=1, dtype=np.float32)
+    
+    def _read_blocks_ffmpeg(self, file_path: Path, sr: int, block_samples: int,
+                            offset: float = 0.0, duration: Optional[float] = None) -> Iterator[np.ndarray]:
+        """Liest Mono-Blöcke (float32, sr) aus einer ffmpeg-Pipe."""
+        command = ['ffmpeg', '-nostdin', '-v', 'error']
+        if offset:
+            command += ['-ss', f"{offset:g}"]
+        command += ['-i', str(file_path)]
+        if duration:
+            command += ['-t', f"{duration:g}"]
+        # Nur die Audiospur dekodieren (MP4-Video wird übersprungen)
+        command += ['-vn', '-sn', '-dn', '-f', 'f32le', '-ac', '1', '-ar', str(sr), '-']
+        # Fehlermeldungen in eine Datei statt in eine Pipe: bei beschädigten Dateien
+        # schreibt ffmpeg eine Zeile pro Frame und würde bei vollem Pipe-Puffer
+        # blockieren, während hier auf stdout gewartet wird
+        stderr = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        except OSError as e:
+            stderr.close()
+            raise RuntimeError(f"ffmpeg nicht verfügbar: {e}") from e
+        
+        try:
+            bytes_per_block = block_samples * 4
+            while True:
+                chunk = process.stdout.read(bytes_per_block)
+                if not chunk:
+                    break
+                yield np.frombuffer(chunk[:len(chunk) - len(chunk) % 4], dtype='<f4')
+            
+            if process.wait() != 0:
+                # Nur das Ende der Meldungen (eine Zeile pro defektem Frame möglich)
+                stderr.seek(max(stderr.seek(0, os.SEEK_END) - 2000, 0))
+                raise RuntimeError(
+                    f"ffmpeg konnte {Path(file_path).name} nicht dekodieren: "
+                    f"{stderr.read().decode(errors='replace').strip()}"
+                )
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            stderr.close()
+    
+    @property
+    def _res_type(self) -> str:
+        """librosa-Resampler passend zu resample_quality (Fallback-Pfad)."""
+        return f"soxr_{self.resample_quality.lower()}"
+    
+    def _resample_blocks(self, blocks: Iterable[np.ndarray], in_sr: int, out_sr: int) -> Iterator[np.ndarray]:
+        """Resampelt einen Block-Stream (soxr, gleiche Qualität wie librosa 'soxr_<quality>')."""
+        resampler = soxr.ResampleStream(in_sr, out_sr, 1, dtype='float32', quality=self.resample_quality)
+        for block in blocks:
+            out = resampler.resample_chunk(block)
+            if len(out):
+                yield out
+        tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+        if len(tail):
+            yield tail
+    
+    def _limit_samples(self, blocks: Iterable[np.ndarray], max_samples: int) -> Iterator[np.ndarray]:
+        """Beendet einen Block-Stream nach max_samples Samples."""
+        remaining = max_samples
+        for block in blocks:
+            if remaining <= 0:
+                break
+            yield block[:remaining]
+            remaining -= len(block)
+    
+    def _rebuffer(self, blocks: Iterable[np.ndarray], block_samples: int) -> Iterator[np.ndarray]:
+        """Fasst einen Block-Stream zu Blöcken fester Größe zusammen."""
+        pending: List[np.ndarray] = []
+        pending_len = 0
+        for block in blocks:
+            pending.append(block)
+            pending_len += len(block)
+            while pending_len >= block_samples:
+                joined = np.concatenate(pending) if len(pending) > 1 else pending[0]
+                yield joined[:block_samples]
+                rest = joined[block_samples:]
+                pending = [rest] if len(rest) else []
+                pending_len = len(rest)
+        if pending_len:
+            yield np.concatenate(pending) if len(pending) > 1 else pending[0]
+    
+    def load_audio(self, file_path: Path, sr: Optional[int] = None,
+                   offset: float = 0.0, duration: Optional[float] = None,
+                   persist: bool = True) -> Tuple[np.ndarray, int]:
         """Lädt eine Audio-Datei.
         
+        Jede Datei wird nur einmal dekodiert: blockweise (stream_audio)
+        direkt in die kanonische PCM-Datei, alle weiteren Aufrufe mappen
+        diese read-only (np.load mit mmap_mode='r'). Nur wenn die Datei
+        nicht geschrieben werden kann, wird vollständig im Speicher dekodiert.
+        
         Args:
             file_path: Pfad zur Audio-Datei
             sr: Sample-Rate (None = Ziel-SR verwenden)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden (None = bis zum Ende)
+            persist: False = ohne PCM-Datei direkt lesen (z.B. für kurze
+                Segment-WAVs, die bereits in Ziel-SR und mono vorliegen)
             
         Returns:
-            Tuple[np.ndarray, int]: Audio-Daten und Sample-Rate
+            Tuple[np.ndarray, int]: Audio-Daten (read-only) und Sample-Rate
         """
         target = sr if sr is not None else self.target_sr
-        y, sr = librosa.load(str(file_path), sr=target)
+        duration = duration or None
+        if not persist:
+            return self.read_audio(file_path, target, offset, duration), target
+        
+        pcm_path = self.get_pcm_path(file_path, target, offset, duration)
+        
+        if not self.has_pcm(file_path, target, offset, duration):
+            try:
+                blocks = self.stream_audio(file_path, target, offset=offset, duration=duration)
+                self.store_pcm_blocks(file_path, blocks, target, offset, duration)
+            except RuntimeError as e:
+                print(f"⚠️ Streaming-Dekodierung fehlgeschlagen ({Path(file_path).name}), "
+                      f"nutze librosa.load: {e}")
+        
+        if self.has_pcm(file_path, target, offset, duration):
+            return np.load(str(pcm_path), mmap_mode='r'), target
+        
+        y, sr = librosa.load(str(file_path), sr=target, offset=offset, duration=duration,
+                             res_type=self._res_type)
+        self.store_pcm(file_path, y, sr, offset, duration)
         return y, sr
     
+    def read_audio(self, file_path: Path, sr: Optional[int] = None,
+                   offset: float = 0.0, duration: Optional[float] = None) -> np.ndarray:
+        """Dekodiert eine Aufnahme vollständig in den Speicher (ohne PCM-Datei).
+        
+        Liegt eine libsndfile-Datei bereits mono in Ziel-SR vor, wird sie
+        mit einem einzigen soundfile.read gelesen (kein Resampling).
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            sr: Sample-Rate (None = Ziel-SR verwenden)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden
+            
+        Returns:
+            np.ndarray: Audio-Daten (mono, float32)
+        """
+        target = sr if sr is not None else self.target_sr
+        if not self._use_ffmpeg(file_path):
+            try:
+                info = sf.info(str(file_path))
+            except RuntimeError:
+                info = None
+            if info is not None and info.samplerate == target and info.channels == 1:
+                y, _ = sf.read(
+                    str(file_path),
+                    start=int(round(offset * target)),
+                    frames=int(round(duration * target)) if duration else -1,
+                    dtype='float32'
+                )
+                return y
+        
+        try:
+            blocks = list(self.stream_audio(file_path, target, offset=offset, duration=duration))
+            return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+        except RuntimeError as e:
+            print(f"⚠️ Direkte Dekodierung fehlgeschlagen ({Path(file_path).name}), "
+                  f"nutze librosa.load: {e}")
+        y, _ = librosa.load(str(file_path), sr=target, offset=offset, duration=duration,
+                            res_type=self._res_type)
+        return y
+    
+    def probe_audio(self, file_path: Path) -> Dict[str, Any]:
+        """Liest Dauer, Sample-Rate und Kanäle aus dem Datei-Header (ohne Dekodierung).
+        
+        WAV/FLAC/OGG (und MP3 ab libsndfile 1.1) über soundfile, alle
+        anderen Formate über ffprobe; audioread dient als letzter Fallback.
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            
+        Returns:
+            Dict: duration_sec, sample_rate, channels und format
+            
+        Raises:
+            InvalidFileFormatException: Wenn die Datei keine lesbare Audiospur enthält
+        """
+        file_path = Path(file_path)
+        info = self._probe_soundfile(file_path) or self._probe_ffprobe(file_path) or self._probe_audioread(file_path)
+        if not info or not info["duration_sec"] or not info["sample_rate"] or not info["channels"]:
+            raise InvalidFileFormatException(
+                f"Datei ist beschädigt oder enthält keine Audiospur: {file_path.name}"
+            )
+        info["format"] = file_path.suffix.lstrip('.').lower()
+        return info
+    
+    def _probe_soundfile(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Header-Probe über libsndfile (None wenn das Format nicht unterstützt wird)."""
+        try:
+            info = sf.info(str(file_path))
+        except RuntimeError:
+            return None
+        return {
+            "duration_sec": float(info.duration),
+            "sample_rate": int(info.samplerate),
+            "channels": int(info.channels)
+        }
+    
+    def _probe_ffprobe(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Header-Probe über ffprobe (None wenn ffprobe fehlt oder die Datei unlesbar ist)."""
+        command = [
+            'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+            '-show_entries', 'stream=sample_rate,channels,duration:format=duration',
+            '-of', 'json', str(file_path)
+        ]
+        try:
+            output = subprocess.run(command, capture_output=True, timeout=30, check=True).stdout
+            data = json.loads(output or b'{}')
+        except (OSError, subprocess.SubprocessError, ValueError):
+            return None
+        
+        streams = data.get('streams') or []
+        if not streams:
+            return None
+        stream = streams[0]
+        duration = stream.get('duration') or (data.get('format') or {}).get('duration')
+        try:
+            return {
+                "duration_sec": float(duration or 0),
+                "sample_rate": int(stream.get('sample_rate') or 0),
+                "channels": int(stream.get('channels') or 0)
+            }
+        except ValueError:
+            return None
+    
+    def _probe_audioread(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Header-Probe über audioread (Fallback ohne ffprobe)."""
+        try:
+            with audioread.audio_open(str(file_path)) as f:
+                return {
+                    "duration_sec": float(f.duration or 0),
+                    "sample_rate": int(f.samplerate or 0),
+                    "channels": int(f.channels or 0)
+                }
+        except Exception:
+            return None
+    
+    def get_file_duration(self, file_path: Path) -> Optional[float]:
+        """Liest die Dauer einer Audio-Datei aus dem Header (ohne Dekodierung).
+        
+        Args:
+            file_path: Pfad zur Audio-Datei
+            
+        Returns:
+            Optional[float]: Dauer in Sekunden oder None wenn nicht bestimmbar
+        """
+        try:
+            return self.probe_audio(file_path)["duration_sec"]
+        except InvalidFileFormatException as e:
+            print(f"⚠️ {e}")
+            return None
+    
     def save_audio(self, audio_data: np.ndarray, file_path: Path, sr: Optional[int] = None):
         """Speichert Audio-Daten.
         
@@ -42,76 +489,103 @@ class AudioService:
         target = sr if sr is not None else self.target_sr
         sf.write(str(file_path), audio_data, target)
     
-    def segment_audio(self, audio_data: np.ndarray, sr: int, 
-                     segment_length_sec: int = 8) -> List[np.ndarray]:
-        """Segmentiert Audio in gleich große Teile.
+    def get_segment_bounds(self, num_samples: int, sr: int,
+                           segment_length_sec: int = 8) -> List[Tuple[int, int]]:
+        """Berechnet die Sample-Grenzen aller Segmente.
         
         Args:
-            audio_data: Audio-Daten
+            num_samples: Anzahl Samples des Signals
             sr: Sample-Rate
             segment_length_sec: Segment-Länge in Sekunden (Standard: 8)
             
         Returns:
-            List[np.ndarray]: Liste von Audio-Segmenten
+            List[Tuple[int, int]]: (start_sample, end_sample) pro Segment
         """
         segment_samples = segment_length_sec * sr
-        num_segments = int(np.ceil(len(audio_data) / segment_samples))
-        
-        segments = []
-        for i in range(num_segments):
-            start = i * segment_samples
-            end = min(start + segment_samples, len(audio_data))
-            segment = audio_data[start:end]
-            
-            # Padding falls zu kurz
-            if len(segment) < segment_samples:
-                segment = np.pad(
-                    segment, 
-                    (0, segment_samples - len(segment)), 
-                    mode='constant'
-                )
-            segments.append(segment)
+        num_segments = int(np.ceil(num_samples / segment_samples))
         
-        return segments
+        return [
+            (i * segment_samples, min((i + 1) * segment_samples, num_samples))
+            for i in range(num_segments)
+        ]
     
-    def segment_and_save(self, file_path: Path, output_dir: Path, 
-                        segment_length_sec: int = 8,
-                        base_filename: Optional[str] = None) -> List[str]:
-        """Lädt, segmentiert und speichert eine Audio-Datei.
+    def export_segment(self, file_path: Path, output_dir: Path, segment_index: int,
+                       segment_length_sec: int = 8,
+                       base_filename: Optional[str] = None,
+                       offset: float = 0.0,
+                       duration: Optional[float] = None) -> Optional[Path]:
+        """Schreibt ein einzelnes Segment als WAV (z.B. für die Wiedergabe).
+        
+        Segmente werden für die Analyse nicht mehr auf die Festplatte
+        geschrieben. Diese Methode erzeugt eine Segment-Datei erst, wenn
+        sie tatsächlich angefragt wird.
         
         Args:
-            file_path: Pfad zur Eingabe-Datei
-            output_dir: Ausgabe-Verzeichnis für Segmente
+            file_path: Pfad zur Original-Datei
+            output_dir: Session-Verzeichnis (Segmente landen in segments/)
+            segment_index: Index des Segments (0-basiert)
             segment_length_sec: Segment-Länge in Sekunden
-            base_filename: Basis-Name für Segment-Dateien (oder aus file_path)
+            base_filename: Basis-Name für die Segment-Datei (oder aus file_path)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden
             
         Returns:
-            List[str]: Liste der Segment-Dateinamen
+            Optional[Path]: Pfad zur Segment-Datei oder None wenn der Index ungültig ist
         """
-        # Lade Audio
-        audio_data, sr = self.load_audio(file_path)
-        
-        # Segmentiere
-        segments = self.segment_audio(audio_data, sr, segment_length_sec)
-        
-        # Bestimme Basis-Namen
         if base_filename is None:
-            base_filename = file_path.stem  # Dateiname ohne Endung
+            base_filename = file_path.stem
         
-        # Erstelle Segments-Ordner
         segments_dir = output_dir / "segments"
+        segment_path = segments_dir / f"{base_filename}_segment_{segment_index}.wav"
+        if segment_path.exists():
+            return segment_path
+        
+        audio_data, sr = self.load_audio(file_path, offset=offset, duration=duration)
+        bounds = self.get_segment_bounds(len(audio_data), sr, segment_length_sec)
+        if segment_index < 0 or segment_index >= len(bounds):
+            return None
+        
+        # Wie in der Analyse: das letzte Segment ohne Auffüllen mit Stille
+        start, end = bounds[segment_index]
         segments_dir.mkdir(exist_ok=True)
+        self.save_audio(audio_data[start:end], segment_path, sr)
+        return segment_path
+    
+    def export_window(self, file_path: Path, output_dir: Path, filename: str,
+                      start_sample: int, end_sample: int, sr: Optional[int] = None,
+                      offset: float = 0.0, duration: Optional[float] = None) -> Optional[Path]:
+        """Schreibt ein beliebiges Fenster des Analyse-Fensters als WAV.
         
-        # Speichere Segmente
-        segment_filenames = []
-        for i, segment in enumerate(segments):
-            segment_filename = f"{base_filename}_segment_{i}.wav"
-            segment_path = segments_dir / segment_filename
-            self.save_audio(segment, segment_path, sr)
-            segment_filenames.append(segment_filename)
+        Für Schüler-Segmente, die nach der globalen Zuordnung nicht auf dem
+        festen Raster liegen. Start und Ende beziehen sich auf die Samples
+        der Analyse (Sample-Rate sr, ab offset), daher wird mit derselben
+        Sample-Rate und demselben Fenster dekodiert wie in der Analyse.
         
-        print(f"🎵 {len(segments)} Segmente erstellt: {base_filename}")
-        return segment_filenames
+        Args:
+            file_path: Pfad zur Original-Datei
+            output_dir: Session-Verzeichnis (Dateien landen in segments/)
+            filename: Name der Datei in segments/
+            start_sample: Erstes Sample des Fensters
+            end_sample: Sample nach dem Ende des Fensters
+            sr: Sample-Rate der Analyse (None = Ziel-SR verwenden)
+            offset: Start des Analyse-Fensters in Sekunden
+            duration: Maximale Länge des Analyse-Fensters in Sekunden
+        
+        Returns:
+            Optional[Path]: Pfad zur Datei oder None wenn das Fenster ungültig ist
+        """
+        segments_dir = output_dir / "segments"
+        window_path = segments_dir / filename
+        if window_path.exists():
+            return window_path
+        
+        audio_data, sr = self.load_audio(file_path, sr=sr, offset=offset, duration=duration)
+        if start_sample < 0 or end_sample <= start_sample or end_sample > len(audio_data):
+            return None
+        
+        segments_dir.mkdir(exist_ok=True)
+        self.save_audio(audio_data[start_sample:end_sample], window_path, sr)
+        return window_path
     
     def normalize_audio(self, audio_data: np.ndarray) -> np.ndarray:
         """Normalisiert Audio-Lautstärke.
@@ -152,3 +626,64 @@ class AudioService:
         """
         trimmed, _ = librosa.effects.trim(audio_data, top_db=top_db)
         return trimmed
+    
+    def compute_activity(self, audio_data: np.ndarray, sr: int,
+                         block_sec: float = 0.05, top_db: float = 50.0,
+                         floor_db: float = -60.0) -> Tuple[np.ndarray, int]:
+        """RMS-Gate über das gesamte Signal (einmalig, vor der Segment-Analyse).
+        
+        Das Signal wird in nicht überlappende Blöcke geteilt. Ein Block gilt
+        als aktiv, wenn sein Pegel über der lautesten Stelle minus top_db
+        und über floor_db (dBFS) liegt. Lange Aufnahmen werden blockweise
+        gelesen, es entsteht keine Kopie des gesamten Signals.
+        
+        Args:
+            audio_data: Audio-Daten (mono, auch gemappt)
+            sr: Sample-Rate
+            block_sec: Blocklänge in Sekunden
+            top_db: Abstand zum Maximalpegel in dB, ab dem ein Block still ist
+            floor_db: Absolute Schwelle in dBFS (Raumrauschen)
+            
+        Returns:
+            Tuple von (aktiv-Maske pro Block, Blocklänge in Samples)
+        """
+        block = max(1, int(sr * block_sec))
+        num_blocks = int(np.ceil(len(audio_data) / block))
+        if num_blocks == 0:
+            return np.zeros(0, dtype=bool), block
+        
+        power = np.empty(num_blocks)
+        chunk_samples = block * 4096
+        for start in range(0, len(audio_data), chunk_samples):
+            chunk = np.asarray(audio_data[start:start + chunk_samples], dtype=np.float64)
+            offsets = np.arange(0, len(chunk), block)
+            sizes = np.diff(np.append(offsets, len(chunk)))
+            first = start // block
+            power[first:first + len(offsets)] = np.add.reduceat(chunk * chunk, offsets) / sizes
+        
+        level_db = 10.0 * np.log10(np.maximum(power, 1e-20))
+        threshold = max(float(level_db.max()) - top_db, floor_db)
+        return level_db > threshold, block
+    
+    def get_active_range(self, activity: np.ndarray, block: int,
+                         start_sample: int, end_sample: int) -> Optional[Tuple[int, int]]:
+        """Bereich mit aktivem Signal innerhalb eines Segments.
+        
+        Args:
+            activity: Aktiv-Maske pro Block (siehe compute_activity)
+            block: Blocklänge in Samples
+            start_sample: Erstes Sample des Segments
+            end_sample: Letztes Sample des Segments (exklusiv)
+            
+        Returns:
+            Optional[Tuple[int, int]]: (erstes, letztes exklusiv) aktives Sample
+            oder None, wenn das Segment vollständig still ist
+        """
+        first_block = start_sample // block
+        active = np.flatnonzero(activity[first_block:int(np.ceil(end_sample / block))])
+        if len(active) == 0:
+            return None
+        return (
+            max(start_sample, (first_block + int(active[0])) * block),
+            min(end_sample, (first_block + int(active[-1]) + 1) * block)
+        )
@@ -0,0 +1,275 @@
+"""Feature Store Service - Persistenter Speicher für dekodiertes Audio und Features."""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+class FeatureStoreService:
+    """Persistenter, größenbeschränkter Feature-Speicher auf der Festplatte.
+
+    Metadaten liegen in einer SQLite-Datenbank (index.db). Arrays (z.B.
+    dekodiertes PCM) werden als float32-.npy-Blobs abgelegt und per mmap
+    geladen, Feature-Dicts als kompaktes JSON direkt in der Datenbank.
+    Verdrängt wird nach LRU, sobald die Gesamtgröße max_bytes übersteigt.
+    Ein Hintergrund-Thread (Compactor) räumt verwaiste Blobs auf und
+    verkleinert die Datenbank.
+    """
+
+    SCHEMA_VERSION = 1
+    ORPHAN_GRACE_SECONDS = 300
+
+    def __init__(self, base_path: str, max_bytes: int = 2 * 1024 * 1024 * 1024,
+                 compact_interval: int = 3600):
+        """Initialisiert den Feature Store.
+
+        Args:
+            base_path: Verzeichnis des Stores (z.B. Uploads/feature_store)
+            max_bytes: Maximale Gesamtgröße aller Einträge in Bytes
+            compact_interval: Intervall des Compactors in Sekunden (<= 0 = aus)
+        """
+        self.base_path = Path(base_path)
+        self.blob_path = self.base_path / "blobs"
+        self.blob_path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compact_interval = compact_interval
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.base_path / "index.db"), check_same_thread=False)
+        self._init_schema()
+
+        if compact_interval > 0:
+            self._start_compactor()
+
+    def _init_schema(self):
+        """Legt die Tabellen an bzw. verwirft einen Store mit altem Schema."""
+        with self._lock:
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                self._db.execute("DROP TABLE IF EXISTS entries")
+                self._db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    blob TEXT,
+                    value TEXT,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access)")
+            self._db.commit()
+
+    def get_array(self, key: str) -> Optional[np.ndarray]:
+        """Lädt ein Array (read-only, memory-mapped).
+
+        Args:
+            key: Eintrags-Schlüssel
+
+        Returns:
+            Optional[np.ndarray]: Array oder None wenn nicht vorhanden
+        """
+        row = self._touch(key, 'array')
+        if row is None:
+            return None
+
+        blob_file = self.blob_path / row[0]
+        try:
+            return np.load(blob_file, mmap_mode='r')
+        except (OSError, ValueError):
+            # Blob fehlt oder ist beschädigt -> Eintrag verwerfen
+            self.delete(key)
+            return None
+
+    def put_array(self, key: str, array: np.ndarray):
+        """Speichert ein Array als float32-.npy-Blob.
+
+        Args:
+            key: Eintrags-Schlüssel
+            array: Zu speicherndes Array
+        """
+        array = np.ascontiguousarray(array, dtype=np.float32)
+        blob_name = f"{abs(hash(key)) & 0xFFFFFFFFFFFF:012x}_{int(time.time() * 1000)}.npy"
+
+        # Atomar schreiben (temporäre Datei + rename)
+        fd, tmp_name = tempfile.mkstemp(dir=str(self.blob_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_name, self.blob_path / blob_name)
+        except OSError as e:
+            print(f"❌ Feature Store: Blob konnte nicht geschrieben werden: {e}")
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            return
+
+        self._insert(key, 'array', blob_name, None, int(array.nbytes))
+
+    def get_features(self, key: str) -> Optional[Dict[str, Any]]:
+        """Lädt ein Feature-Dict.
+
+        Args:
+            key: Eintrags-Schlüssel
+
+        Returns:
+            Optional[Dict]: Features oder None wenn nicht vorhanden
+        """
+        row = self._touch(key, 'features')
+        if row is None:
+            return None
+        return json.loads(row[1])
+
+    def put_features(self, key: str, features: Dict[str, Any]):
+        """Speichert ein Feature-Dict.
+
+        Args:
+            key: Eintrags-Schlüssel
+            features: Features (Skalare, Strings, Listen, numpy-Werte)
+        """
+        value = json.dumps(features, default=self._to_json, separators=(',', ':'))
+        self._insert(key, 'features', None, value, len(value))
+
+    def delete(self, key: str):
+        """Entfernt einen Eintrag samt Blob.
+
+        Args:
+            key: Eintrags-Schlüssel
+        """
+        with self._lock:
+            row = self._db.execute("SELECT blob FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+        if row and row[0]:
+            self._unlink_blob(row[0])
+
+    def get_total_bytes(self) -> int:
+        """Gibt die Gesamtgröße aller Einträge zurück.
+
+        Returns:
+            int: Größe in Bytes
+        """
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def compact(self) -> int:
+        """Verdrängt überzählige Einträge, entfernt verwaiste Blobs und verkleinert die DB.
+
+        Returns:
+            int: Anzahl entfernter Einträge und Blobs
+        """
+        removed = self._evict()
+
+        with self._lock:
+            known = {row[0] for row in self._db.execute("SELECT blob FROM entries WHERE blob IS NOT NULL")}
+            stale_keys = [
+                key for key, blob in self._db.execute("SELECT key, blob FROM entries WHERE blob IS NOT NULL")
+                if not (self.blob_path / blob).exists()
+            ]
+            for key in stale_keys:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            self._db.execute("VACUUM")
+        removed += len(stale_keys)
+
+        # Blobs ohne Eintrag (z.B. nach Absturz während put_array); junge Dateien
+        # überspringen, da sie gerade geschrieben werden könnten
+        cutoff = time.time() - self.ORPHAN_GRACE_SECONDS
+        for blob_file in self.blob_path.iterdir():
+            if blob_file.name not in known and blob_file.stat().st_mtime < cutoff:
+                self._unlink_blob(blob_file.name)
+                removed += 1
+
+        return removed
+
+    def close(self):
+        """Schließt die Datenbank-Verbindung."""
+        with self._lock:
+            self._db.close()
+
+    def _touch(self, key: str, kind: str) -> Optional[tuple]:
+        """Liest einen Eintrag und aktualisiert last_access (LRU)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT blob, value FROM entries WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+        return row
+
+    def _insert(self, key: str, kind: str, blob: Optional[str], value: Optional[str], size: int):
+        """Legt einen Eintrag an (ersetzt einen vorhandenen) und verdrängt bei Bedarf."""
+        with self._lock:
+            old = self._db.execute("SELECT blob FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, blob, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, blob, value, size, time.time())
+            )
+            self._db.commit()
+        if old and old[0] and old[0] != blob:
+            self._unlink_blob(old[0])
+        self._evict()
+
+    def _evict(self) -> int:
+        """Entfernt die am längsten ungenutzten Einträge bis max_bytes eingehalten wird."""
+        evicted = []
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for key, blob, size in self._db.execute(
+                "SELECT key, blob, size FROM entries ORDER BY last_access ASC"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                evicted.append(blob)
+                total -= size
+            self._db.commit()
+
+        for blob in evicted:
+            if blob:
+                self._unlink_blob(blob)
+        return len(evicted)
+
+    def _unlink_blob(self, blob: str):
+        try:
+            (self.blob_path / blob).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Feature Store: Blob {blob} konnte nicht gelöscht werden: {e}")
+
+    @staticmethod
+    def _to_json(value: Any) -> Any:
+        """Konvertiert numpy-Werte für json.dumps."""
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+    def _start_compactor(self):
+        """Startet den Compactor-Thread."""
+        def compact_loop():
+            while True:
+                time.sleep(self.compact_interval)
+                try:
+                    removed = self.compact()
+                    if removed > 0:
+                        print(f"🧹 Feature Store: {removed} Einträge/Blobs entfernt")
+                except Exception as e:
+                    print(f"❌ Feature Store Compactor Fehler: {e}")
+
+        thread = threading.Thread(target=compact_loop, daemon=True, name="FeatureStoreCompactor")
+        thread.start()
+        print(f"🚀 Feature Store gestartet: {self.base_path} "
+              f"(max {self.max_bytes // (1024 * 1024)} MB, Compactor: {self.compact_interval}s)")
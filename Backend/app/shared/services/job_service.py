@@ -0,0 +1,133 @@
+"""Job Service - Führt Analysen asynchron in einem begrenzten Worker-Pool aus."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+import threading
+import traceback
+import uuid
+
+from app.shared.models.job import Job
+from app.core.exceptions import JobNotFoundException, JobCancelledException
+
+class JobService:
+    """Verwaltet asynchrone Jobs thread-safe.
+
+    Jobs gehören zu einer Session und werden beim Beenden der Session
+    abgebrochen und entfernt (siehe SessionService.add_cleanup_listener).
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """Initialisiert den Job Service.
+
+        Args:
+            max_workers: Maximale Anzahl gleichzeitig laufender Jobs
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AnalysisJob")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+        print(f"🚀 Job Service gestartet ({max_workers} Worker)")
+
+    def submit(self, session_id: str, kind: str, func: Callable[[Job], Dict[str, Any]]) -> Job:
+        """Reiht einen Job ein.
+
+        Args:
+            session_id: Session, zu der der Job gehört
+            kind: Art des Jobs (z.B. 'audio-feedback')
+            func: Auszuführende Funktion; erhält den Job (für Fortschritt und
+                Abbruch) und gibt das Ergebnis-Dict zurück
+
+        Returns:
+            Job: Neu erstellter Job (Status 'queued')
+        """
+        job = Job(uuid.uuid4().hex, session_id, kind)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+        job.future = self._executor.submit(self._run, job, func)
+        print(f"📋 Job eingereiht: {job.job_id} ({kind}, Session: {session_id})")
+        return job
+
+    def get_job(self, job_id: str, session_id: str) -> Job:
+        """Holt einen Job einer Session.
+
+        Args:
+            job_id: Job-ID
+            session_id: Session-ID (Jobs anderer Sessions sind nicht sichtbar)
+
+        Returns:
+            Job: Der gefundene Job
+
+        Raises:
+            JobNotFoundException: Wenn der Job nicht existiert
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if not job or job.session_id != session_id:
+            raise JobNotFoundException(f"Job {job_id} nicht gefunden")
+        return job
+
+    def get_session_jobs(self, session_id: str) -> List[Job]:
+        """Gibt alle Jobs einer Session zurück.
+
+        Args:
+            session_id: Session-ID
+
+        Returns:
+            List[Job]: Jobs der Session
+        """
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_id == session_id]
+
+    def purge_session(self, session_id: str) -> int:
+        """Bricht alle Jobs einer Session ab und entfernt sie.
+
+        Args:
+            session_id: Session-ID
+
+        Returns:
+            int: Anzahl entfernter Jobs
+        """
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.session_id == session_id]
+            for job in jobs:
+                del self._jobs[job.job_id]
+
+        for job in jobs:
+            if not job.is_finished:
+                job.cancel()
+
+        if jobs:
+            print(f"🗑️ {len(jobs)} Job(s) entfernt (Session: {session_id})")
+        return len(jobs)
+
+    def shutdown(self):
+        """Bricht alle Jobs ab und beendet den Worker-Pool."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, func: Callable[[Job], Dict[str, Any]]):
+        """Führt einen Job im Worker-Thread aus."""
+        if job.is_cancelled:
+            job.finish(Job.CANCELLED)
+            return
+
+        job.start()
+        try:
+            result = func(job)
+            job.finish(Job.COMPLETED, result=result)
+            print(f"✅ Job abgeschlossen: {job.job_id}")
+        except JobCancelledException:
+            job.finish(Job.CANCELLED)
+            print(f"🛑 Job abgebrochen: {job.job_id}")
+        except Exception as e:
+            print(f"❌ Job fehlgeschlagen: {job.job_id}: {e}")
+            traceback.print_exc()
+            job.finish(Job.FAILED, error=str(e))
@@ -1,6 +1,6 @@
 """Session Service - Verwaltet User-Sessions mit automatischem Cleanup."""
 
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, List
 from pathlib import Path
 import threading
 import time
@@ -28,6 +28,9 @@ class SessionService:
         self._sessions: Dict[str, Session] = {}
         self._lock = threading.Lock()
         
+        # Callbacks beim Beenden einer Session (z.B. Jobs abbrechen)
+        self._cleanup_listeners: List[Callable[[str], None]] = []
+        
         # Starte Garbage Collector
         self._start_gc()
     
@@ -75,6 +78,14 @@ class SessionService:
         
         return session
     
+    def add_cleanup_listener(self, listener: Callable[[str], None]):
+        """Registriert einen Callback, der beim Beenden einer Session aufgerufen wird.
+        
+        Args:
+            listener: Funktion, die die Session-ID erhält
+        """
+        self._cleanup_listeners.append(listener)
+    
     def end_session(self, session_id: str) -> bool:
         """Beendet eine Session und räumt auf.
         
@@ -88,6 +99,11 @@ class SessionService:
             session = self._sessions.pop(session_id, None)
         
         if session:
+            for listener in self._cleanup_listeners:
+                try:
+                    listener(session_id)
+                except Exception as e:
+                    print(f"❌ Session-Cleanup Fehler: {e}")
             session.cleanup()
             print(f"🗑️ Session beendet: {session_id}")
             return True
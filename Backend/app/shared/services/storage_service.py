@@ -1,7 +1,8 @@
 """Storage Service - Verwaltet Dateispeicherung und Session-Ordner."""
 
+import hashlib
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 
@@ -11,6 +12,7 @@ class StorageService:
     """Verwaltet Dateispeicherung und -zugriff."""
     
     ALLOWED_EXTENSIONS = {'mp3', 'wav', 'mp4', 'midi', 'mid'}
+    CHUNK_SIZE = 1024 * 1024  # 1 MB
     
     def __init__(self, base_path: str):
         """Initialisiert den Storage Service.
@@ -20,6 +22,9 @@ class StorageService:
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        
+        # SHA-256 pro (session_id, Dateiname), beim Speichern berechnet
+        self._file_hashes: Dict[Tuple[str, str], str] = {}
     
     def save_file(self, file: FileStorage, session_id: str, 
                   filename: Optional[str] = None, 
@@ -58,13 +63,49 @@ class StorageService:
         session_dir = self.base_path / session_id
         session_dir.mkdir(exist_ok=True)
         
-        # Speichere Datei
+        # Speichere Datei (gestreamt, SHA-256 wird dabei mitberechnet)
         file_path = session_dir / target_filename
-        file.save(str(file_path))
+        sha256 = hashlib.sha256()
+        with open(file_path, 'wb') as out:
+            while True:
+                chunk = file.stream.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                out.write(chunk)
+        
+        self._file_hashes[(session_id, target_filename)] = sha256.hexdigest()
         
         print(f"💾 Datei gespeichert: {target_filename} (Session: {session_id})")
         return file_path
     
+    def get_file_hash(self, session_id: str, filename: str) -> Optional[str]:
+        """Gibt den SHA-256 des Dateiinhalts zurück.
+        
+        Args:
+            session_id: Session-ID
+            filename: Dateiname
+            
+        Returns:
+            Optional[str]: Hex-Digest oder None wenn die Datei nicht existiert
+        """
+        key = (session_id, filename)
+        if key in self._file_hashes:
+            return self._file_hashes[key]
+        
+        file_path = self.get_file_path(session_id, filename)
+        if not file_path:
+            return None
+        
+        # Fallback für Dateien, die nicht über save_file gespeichert wurden
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                sha256.update(chunk)
+        
+        self._file_hashes[key] = sha256.hexdigest()
+        return self._file_hashes[key]
+    
     def get_file_path(self, session_id: str, filename: str) -> Optional[Path]:
         """Gibt den Pfad zu einer Datei zurück.
         
@@ -105,6 +146,7 @@ class StorageService:
             bool: True wenn erfolgreich gelöscht
         """
         file_path = self.base_path / session_id / filename
+        self._file_hashes.pop((session_id, filename), None)
         if file_path.exists():
             file_path.unlink()
             print(f"🗑️ Datei gelöscht: {filename} (Session: {session_id})")
@@ -127,11 +169,26 @@ class StorageService:
                 # Überspringen wenn exclude_pattern matched
                 if exclude_pattern and file_path.match(exclude_pattern):
                     continue
+                self._file_hashes.pop((session_id, file_path.name), None)
                 try:
                     file_path.unlink()
                 except Exception as e:
                     print(f"⚠️ Fehler beim Löschen von {file_path.name}: {e}")
     
+    def forget_session(self, session_id: str) -> int:
+        """Verwirft die gemerkten Datei-Hashes einer beendeten Session.
+        
+        Args:
+            session_id: Session-ID
+            
+        Returns:
+            int: Anzahl entfernter Einträge
+        """
+        keys = [key for key in list(self._file_hashes) if key[0] == session_id]
+        for key in keys:
+            self._file_hashes.pop(key, None)
+        return len(keys)
+    
     def _is_allowed_file(self, filename: str) -> bool:
         """Prüft ob Dateiformat erlaubt ist.
         
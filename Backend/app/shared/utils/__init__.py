@@ -1 +1,4 @@
 # Shared Utils
+from .sse import format_sse_event, format_sse_comment, sse_response, to_jsonable
+
+__all__ = ['format_sse_event', 'format_sse_comment', 'sse_response', 'to_jsonable']
@@ -0,0 +1,86 @@
+# SSE Utils - Hilfsfunktionen für Server-Sent Events
+#
+# Formatiert Events nach dem text/event-stream-Format und erstellt
+# Streaming-Responses, die von Proxies (Caddy/nginx) nicht gepuffert werden.
+
+import json
+import math
+from typing import Any, Iterable, Optional
+
+from flask import Response, stream_with_context
+
+# Intervall für Keep-Alive-Kommentare (verhindert Proxy-Timeouts)
+KEEPALIVE_INTERVAL_SEC = 15
+
+def to_jsonable(value: Any) -> Any:
+    """Konvertiert Analyse-Werte in JSON-kompatible Typen.
+
+    numpy-Skalare/-Arrays werden zu Python-Typen, NaN/Inf zu None
+    (JSON.parse im Browser akzeptiert kein NaN).
+
+    Args:
+        value: Beliebiger Wert (Dict, Liste, Skalar, numpy-Typ)
+
+    Returns:
+        JSON-serialisierbarer Wert
+    """
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, 'tolist'):
+        # numpy-Skalare und -Arrays
+        return to_jsonable(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def format_sse_event(data: Any, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """Formatiert ein Server-Sent Event.
+
+    Args:
+        data: Nutzdaten (werden als JSON serialisiert)
+        event: Optionaler Event-Typ
+        event_id: Optionale Event-ID (für Last-Event-ID bei Reconnect)
+
+    Returns:
+        str: Event im text/event-stream-Format
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    payload = json.dumps(to_jsonable(data), ensure_ascii=False)
+    for line in payload.splitlines() or [""]:
+        lines.append(f"data: {line}")
+    return "\n".join(lines) + "\n\n"
+
+def format_sse_comment(comment: str = "keep-alive") -> str:
+    """Formatiert einen SSE-Kommentar (z.B. als Keep-Alive).
+
+    Args:
+        comment: Kommentartext
+
+    Returns:
+        str: Kommentarzeile im text/event-stream-Format
+    """
+    return f": {comment}\n\n"
+
+def sse_response(events: Iterable[str]) -> Response:
+    """Erstellt eine Streaming-Response für Server-Sent Events.
+
+    Args:
+        events: Generator mit bereits formatierten Events
+
+    Returns:
+        Response: Flask Response (text/event-stream)
+    """
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
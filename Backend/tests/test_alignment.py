@@ -0,0 +1,67 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features.alignment import (  # noqa: E402
+    align_recordings, segment_means, segment_similarity
+)
+from app.plugins.audio_feedback.features.dtw import DTWSettings  # noqa: E402
+
+
+def note_sequence(notes, frames_per_note):
+    """Chroma-ähnliche Features: pro Note ein aktiver Halbton plus Onset am Notenanfang."""
+    columns = []
+    for note in notes:
+        for frame in range(frames_per_note):
+            column = np.zeros(13, dtype=np.float32)
+            column[note % 12] = 1.0
+            column[12] = 1.0 if frame == 0 else 0.0
+            columns.append(column)
+    return np.stack(columns, axis=1)
+
+
+class AlignmentTests(unittest.TestCase):
+    def setUp(self):
+        self.notes = [0, 4, 7, 5, 2, 9, 11, 3]
+        self.ref = note_sequence(self.notes, 5)
+
+    def test_time_map_finds_late_start(self):
+        # Schüler beginnt 10 Frames (2 s) später
+        sch = np.concatenate([np.zeros((13, 10), dtype=np.float32), self.ref], axis=1)
+        time_map = align_recordings(self.ref, sch, 0.2, DTWSettings('multiscale', band_sec=4.0))
+        mapped = time_map.to_schueler(np.array([0.0, 2.0, 5.0]))
+        np.testing.assert_allclose(mapped, [2.0, 4.0, 7.0], atol=0.21)
+        self.assertAlmostEqual(time_map.summary()["start_offset_sec"], 2.0, delta=0.21)
+
+    def test_time_map_follows_slower_tempo(self):
+        sch = note_sequence(self.notes, 10)
+        time_map = align_recordings(self.ref, sch, 0.2, DTWSettings('sakoe_chiba', band_sec=8.0))
+        starts = np.arange(1, len(self.notes)) * 1.0
+        np.testing.assert_allclose(time_map.to_schueler(starts), starts * 2, atol=0.21)
+
+    def test_segment_means_match_slices(self):
+        features = np.random.default_rng(0).random((13, 40))
+        bounds = np.array([[0.0, 2.0], [1.0, 3.0], [7.4, 8.0]])
+        expected = [features[:, 0:10].mean(axis=1), features[:, 5:15].mean(axis=1),
+                    features[:, 37:40].mean(axis=1)]
+        np.testing.assert_allclose(segment_means(features, 0.2, bounds), expected)
+
+    def test_similarity_matrix_pairs_matching_segments(self):
+        sch = note_sequence(self.notes[::-1], 5)
+        bounds = np.array([[i * 1.0, (i + 1) * 1.0] for i in range(len(self.notes))])
+        similarity = segment_similarity(self.ref, sch, 0.2, bounds, bounds)
+        self.assertEqual(similarity.shape, (len(self.notes), len(self.notes)))
+        np.testing.assert_array_equal(
+            np.argmax(similarity, axis=1), np.arange(len(self.notes))[::-1]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.shared.services.audio_service import AudioService  # noqa: E402
+
+# (offset, duration) in Sekunden; das letzte Fenster reicht über das Dateiende hinaus
+WINDOWS = [(0.0, None), (0.5, 1.0), (1.25, None), (2.5, 1.0)]
+
+
+def make_signal(sr, seconds=3.0, channels=1):
+    """Sinus mit Rauschen, pro Kanal leicht unterschiedlich."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    columns = [
+        0.5 * np.sin(2 * np.pi * (220.0 + 110.0 * ch) * t) + 0.05 * rng.standard_normal(len(t))
+        for ch in range(channels)
+    ]
+    return np.stack(columns, axis=1).astype(np.float32)
+
+
+class StreamDecodingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name)
+        # Kleine Blöcke, damit Rebuffering und Fenster-Begrenzung greifen
+        self.service = AudioService(target_sr=22050, stream_block_sec=0.1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_wav(self, name, sr, channels):
+        file_path = self.path / name
+        sf.write(str(file_path), make_signal(sr, channels=channels), sr)
+        return file_path
+
+    def assert_matches_librosa(self, file_path, offset, duration):
+        expected, _ = librosa.load(str(file_path), sr=22050, offset=offset, duration=duration,
+                                   res_type='soxr_hq')
+        blocks = list(self.service.stream_audio(file_path, offset=offset, duration=duration))
+        block_samples = int(0.1 * 22050)
+        self.assertTrue(all(len(block) == block_samples for block in blocks[:-1]))
+        decoded = np.concatenate(blocks)
+        self.assertEqual(len(decoded), len(expected))
+        np.testing.assert_allclose(decoded, expected, atol=1e-4)
+
+    def test_stream_matches_librosa_with_resampling(self):
+        file_path = self.write_wav("stereo.wav", 44100, channels=2)
+        for offset, duration in WINDOWS:
+            with self.subTest(offset=offset, duration=duration):
+                self.assert_matches_librosa(file_path, offset, duration)
+
+    def test_stream_matches_librosa_at_target_rate(self):
+        file_path = self.write_wav("mono.wav", 22050, channels=1)
+        for offset, duration in WINDOWS:
+            with self.subTest(offset=offset, duration=duration):
+                self.assert_matches_librosa(file_path, offset, duration)
+
+    def test_load_audio_maps_window_pcm(self):
+        file_path = self.write_wav("stereo.wav", 44100, channels=2)
+        expected, _ = librosa.load(str(file_path), sr=22050, offset=0.5, duration=1.0,
+                                   res_type='soxr_hq')
+        audio, sr = self.service.load_audio(file_path, offset=0.5, duration=1.0)
+        self.assertEqual(sr, 22050)
+        self.assertTrue(self.service.has_pcm(file_path, offset=0.5, duration=1.0))
+        np.testing.assert_allclose(audio, expected, atol=1e-4)
+
+    @unittest.skipUnless(shutil.which('ffmpeg'), "ffmpeg nicht installiert")
+    def test_ffmpeg_pipe_matches_soundfile(self):
+        file_path = self.write_wav("mono.wav", 22050, channels=1)
+        for offset, duration in WINDOWS:
+            with self.subTest(offset=offset, duration=duration):
+                expected = np.concatenate(list(self.service._read_blocks_soundfile(
+                    file_path, 2205, 22050, offset, duration
+                )))
+                decoded = np.concatenate(list(self.service._read_blocks_ffmpeg(
+                    file_path, 22050, 2205, offset, duration
+                )))
+                self.assertLessEqual(abs(len(decoded) - len(expected)), 1)
+                length = min(len(decoded), len(expected))
+                np.testing.assert_allclose(decoded[:length], expected[:length], atol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features import (  # noqa: E402
+    KEY_NAMES, CHORD_NAMES, best_chord_indices, threshold_attack_frames,
+    autocorrelation, first_local_maximum, successive_frame_distances
+)
+
+
+def chord_loop(chroma):
+    """Frühere Implementierung aus PitchAnalyzer._analyze_chord_histogram."""
+    major_template = np.array([1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0])
+    minor_template = np.array([1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0])
+    sequence = []
+    for frame_idx in range(chroma.shape[1]):
+        chroma_frame = chroma[:, frame_idx]
+        best_corr = -1
+        best_chord = "Unknown"
+        for root in range(12):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr_major = np.corrcoef(chroma_frame, np.roll(major_template, root))[0, 1]
+                corr_minor = np.corrcoef(chroma_frame, np.roll(minor_template, root))[0, 1]
+            if corr_major > best_corr:
+                best_corr = corr_major
+                best_chord = KEY_NAMES[root] + "_major"
+            if corr_minor > best_corr:
+                best_corr = corr_minor
+                best_chord = KEY_NAMES[root] + "_minor"
+        sequence.append(best_chord)
+    return sequence
+
+
+def attack_loop(rms, threshold_value):
+    """Frühere Implementierung aus DynamicsAnalyzer._analyze_attack_time (in Frames)."""
+    frames = []
+    for i in range(len(rms) - 1):
+        if rms[i] < threshold_value and rms[i + 1] >= threshold_value:
+            peak_idx = i + 1
+            while peak_idx < len(rms) - 1 and rms[peak_idx + 1] > rms[peak_idx]:
+                peak_idx += 1
+            frames.append(peak_idx - i)
+    return frames
+
+
+class AudioKernelTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_chords_match_loop(self):
+        chroma = self.rng.random((12, 300))
+        chroma[:, 10] = 0.5  # konstanter Frame -> "Unknown"
+        names = CHORD_NAMES + ["Unknown"]
+        vectorized = [names[idx] for idx in best_chord_indices(chroma)]
+        self.assertEqual(vectorized, chord_loop(chroma))
+        self.assertEqual(vectorized[10], "Unknown")
+
+    def test_attack_frames_match_loop(self):
+        rms = np.abs(np.sin(np.linspace(0, 20, 400))) + 0.05 * self.rng.random(400)
+        threshold = 0.2 * rms.max()
+        np.testing.assert_array_equal(threshold_attack_frames(rms, threshold), attack_loop(rms, threshold))
+        self.assertEqual(len(threshold_attack_frames(np.ones(1), 0.5)), 0)
+
+    def test_autocorrelation_matches_correlate(self):
+        values = self.rng.normal(size=257)
+        expected = np.correlate(values, values, mode='full')[len(values) - 1:]
+        np.testing.assert_allclose(autocorrelation(values), expected, atol=1e-9)
+
+        vibrato = np.sin(2 * np.pi * np.arange(1000) / 25)
+        vibrato -= vibrato.mean()
+        full = np.correlate(vibrato, vibrato, mode='full')[len(vibrato) - 1:]
+        loop_peaks = [i for i in range(1, len(full) - 1) if full[i] > full[i - 1] and full[i] > full[i + 1]]
+        self.assertEqual(first_local_maximum(autocorrelation(vibrato)), loop_peaks[0])
+        self.assertEqual(loop_peaks[0], 25)
+        self.assertEqual(first_local_maximum(np.arange(5)), -1)
+
+    def test_frame_distances_match_loop(self):
+        mfccs = self.rng.normal(size=(13, 50))
+        expected = [np.linalg.norm(mfccs[:, i + 1] - mfccs[:, i]) for i in range(mfccs.shape[1] - 1)]
+        np.testing.assert_allclose(successive_frame_distances(mfccs), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features.dtw import (  # noqa: E402
+    DTW_MODES, DTWSettings, dtw_align, dtw_window, resolve_dtw_settings, window_cells
+)
+
+
+def full_dtw(X, Y, open_begin=False):
+    """Referenz: unbeschränktes DTW in float64 (Schritte wie librosa)."""
+    cost = np.sqrt(((X[:, :, None] - Y[:, None, :]) ** 2).sum(axis=0))
+    n, m = cost.shape
+    D = np.full((n + 1, m + 1), np.inf)
+    D[0, 0] = 0.0
+    if open_begin:
+        D[0, :] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            D[i, j] = cost[i - 1, j - 1] + min(D[i - 1, j - 1], D[i - 1, j], D[i, j - 1])
+    return D[n, m], cost
+
+
+class DTWTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(4, 40)).astype(np.float32)
+        self.Y = rng.normal(size=(4, 55)).astype(np.float32)
+
+    def test_full_matches_reference(self):
+        expected, cost = full_dtw(self.X, self.Y)
+        distance, path = dtw_align(self.X, self.Y, DTWSettings('full'), return_path=True)
+        self.assertAlmostEqual(distance, expected, places=3)
+        self.assertEqual(tuple(path[0]), (0, 0))
+        self.assertEqual(tuple(path[-1]), (39, 54))
+        self.assertAlmostEqual(cost[path[:, 0], path[:, 1]].sum(), expected, places=3)
+
+    def test_constrained_modes_are_upper_bounds(self):
+        expected, cost = full_dtw(self.X, self.Y)
+        for mode in DTW_MODES:
+            for radius in (0, 2, 8):
+                distance, path = dtw_align(self.X, self.Y, DTWSettings(mode), radius, return_path=True)
+                self.assertTrue(np.isfinite(distance))
+                self.assertGreaterEqual(distance, expected - 1e-3)
+                self.assertAlmostEqual(cost[path[:, 0], path[:, 1]].sum(), distance, places=3)
+
+    def test_band_finds_warped_optimum(self):
+        t = np.linspace(0, 12, 150)
+        X = np.stack([np.sin(t), np.cos(2 * t)]).astype(np.float32)
+        Y = np.stack([np.sin(t * 0.9), np.cos(1.8 * t)]).astype(np.float32)
+        expected, _ = full_dtw(X, Y)
+        for mode in ('sakoe_chiba', 'multiscale'):
+            distance, _ = dtw_align(X, Y, DTWSettings(mode), radius=20)
+            self.assertAlmostEqual(distance, expected, places=3)
+
+    def test_open_begin_skips_lead_in(self):
+        # Y beginnt mit 10 Frames Vorlauf, danach folgt X
+        Y = np.concatenate([np.full((4, 10), 5.0, dtype=np.float32), self.X], axis=1)
+        expected, cost = full_dtw(self.X, Y, open_begin=True)
+        for mode in ('full', 'sakoe_chiba', 'multiscale'):
+            distance, path = dtw_align(self.X, Y, DTWSettings(mode), radius=12, return_path=True,
+                                       open_begin=True)
+            self.assertAlmostEqual(distance, expected, places=3)
+            self.assertEqual(tuple(path[0]), (0, 10))
+            self.assertEqual(tuple(path[-1]), (39, 49))
+            self.assertAlmostEqual(cost[path[:, 0], path[:, 1]].sum(), distance, places=3)
+
+    def test_max_cells_bound(self):
+        lo, hi = dtw_window(self.X, self.Y, DTWSettings('full', max_cells=400), radius=30)
+        self.assertLessEqual(window_cells(lo, hi), 400)
+        lo, hi = dtw_window(self.X, self.Y, DTWSettings('full', max_cells=1), radius=30)
+        self.assertLessEqual(window_cells(lo, hi), 40 + 55)
+
+    def test_resolve_settings(self):
+        self.assertEqual(resolve_dtw_settings({'mode': 'itakura', 'band_sec': None}).mode, 'itakura')
+        with self.assertRaises(ValueError):
+            resolve_dtw_settings({'mode': 'fast'})
+        with self.assertRaises(ValueError):
+            resolve_dtw_settings({'radius': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
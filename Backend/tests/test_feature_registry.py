@@ -0,0 +1,60 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features import FEATURE_REGISTRY  # noqa: E402
+from app.plugins.audio_feedback.features.feature_registry import ANALYZER, COMPARATOR  # noqa: E402
+
+
+class FeatureRegistryTests(unittest.TestCase):
+    def test_none_resolves_to_full_plan(self):
+        plan = FEATURE_REGISTRY.resolve(None)
+        self.assertTrue(plan.is_full)
+        self.assertIsNone(plan.steps_for(ANALYZER, 'pitch'))
+        self.assertTrue(plan.includes(COMPARATOR, 'feature'))
+
+    def test_selective_config_skips_chroma_and_vibrato(self):
+        plan = FEATURE_REGISTRY.resolve([
+            'tempo', 'onset_count', 'rhythm_std_interval', 'dtw_distance',
+            'pitch_contour_correlation', 'dynamic_range_db', 'mean_attack_time',
+        ])
+        self.assertFalse(plan.is_full)
+        self.assertEqual(plan.steps_for(ANALYZER, 'tempo'), {'tempo', 'onset_count', 'rhythm_stability'})
+        self.assertEqual(plan.steps_for(ANALYZER, 'dynamics'), {'dynamics', 'attack_time'})
+        self.assertEqual(plan.steps_for(COMPARATOR, 'temporal'), {'dtw', 'pitch_contour'})
+        self.assertFalse(plan.includes(ANALYZER, 'pitch'))
+        self.assertFalse(plan.includes(ANALYZER, 'spectral'))
+        self.assertFalse(plan.includes(COMPARATOR, 'feature'))
+        self.assertNotIn('chroma', plan.intermediates)
+
+    def test_unknown_features_are_ignored(self):
+        plan = FEATURE_REGISTRY.resolve(['tempo', 'does_not_exist'])
+        self.assertEqual(plan.analyzer_steps, {'tempo': {'tempo'}})
+        self.assertEqual(plan.comparator_steps, {})
+
+    def test_split_separates_yin_steps(self):
+        base, pitch = FEATURE_REGISTRY.split(FEATURE_REGISTRY.resolve(None), 'yin')
+        self.assertEqual(pitch.steps_for(ANALYZER, 'pitch'), {'pitch', 'vibrato'})
+        self.assertEqual(pitch.steps_for(COMPARATOR, 'temporal'), {'pitch_contour'})
+        self.assertFalse(pitch.includes(ANALYZER, 'tempo'))
+        self.assertEqual(base.steps_for(ANALYZER, 'pitch'), {'chroma_key', 'chord_histogram'})
+        self.assertEqual(base.steps_for(COMPARATOR, 'temporal'), {'dtw', 'rms'})
+        self.assertFalse(base.features & pitch.features)
+        self.assertEqual(base.features | pitch.features, set(FEATURE_REGISTRY.names()))
+
+    def test_ordered_restores_step_order(self):
+        merged = {'estimated_key': 'C', 'tempo': 120.0, 'vibrato_strength': 0.1,
+                  'unregistered': 1, 'mean_pitch': 440.0, 'max_pitch': 450.0}
+        self.assertEqual(
+            list(FEATURE_REGISTRY.ordered(merged)),
+            ['tempo', 'mean_pitch', 'max_pitch', 'estimated_key', 'vibrato_strength', 'unregistered']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.shared.services.feature_store_service import FeatureStoreService  # noqa: E402
+
+
+class FeatureStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "feature_store"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_survive_reopen(self):
+        audio = np.linspace(-1, 1, 1000, dtype=np.float32)
+        store = FeatureStoreService(str(self.path), compact_interval=0)
+        store.put_array("audio|abc", audio)
+        store.put_features("features|abc|0", {"tempo": np.float64(120.0), "key": "C major"})
+        store.close()
+
+        store = FeatureStoreService(str(self.path), compact_interval=0)
+        loaded = store.get_array("audio|abc")
+        np.testing.assert_array_equal(loaded, audio)
+        self.assertFalse(loaded.flags.writeable)
+        self.assertEqual(store.get_features("features|abc|0"), {"tempo": 120.0, "key": "C major"})
+        self.assertIsNone(store.get_features("features|missing"))
+        store.close()
+
+    def test_lru_eviction_by_size(self):
+        block = np.zeros(1000, dtype=np.float32)  # 4000 Bytes
+        store = FeatureStoreService(str(self.path), max_bytes=10000, compact_interval=0)
+        store.put_array("a", block)
+        store.put_array("b", block)
+        store.get_array("a")  # a ist jetzt zuletzt genutzt
+        store.put_array("c", block)
+
+        self.assertIsNotNone(store.get_array("a"))
+        self.assertIsNone(store.get_array("b"))
+        self.assertIsNotNone(store.get_array("c"))
+        self.assertLessEqual(store.get_total_bytes(), 10000)
+        self.assertEqual(len(list(store.blob_path.glob("*.npy"))), 2)
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
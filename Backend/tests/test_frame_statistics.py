@@ -0,0 +1,52 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features import PrefixStatistics, WindowedCorrelation  # noqa: E402
+
+
+class FrameStatisticsTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.series = rng.normal(size=500)
+        self.matrix = rng.normal(size=(13, 500))
+
+    def test_window_matches_numpy(self):
+        prefix = PrefixStatistics(self.series)
+        for start, end in [(0, 500), (17, 18), (100, 444), (3, 259)]:
+            window = prefix.window(start, end)
+            values = self.series[start:end]
+            self.assertAlmostEqual(window.mean(), np.mean(values))
+            self.assertAlmostEqual(window.std(), np.std(values))
+            self.assertEqual(window.min(), np.min(values))
+            self.assertEqual(window.max(), np.max(values))
+
+    def test_matrix_rows_and_valid_mask(self):
+        window = PrefixStatistics(self.matrix).window(50, 300)
+        np.testing.assert_allclose(window.mean(), np.mean(self.matrix[:, 50:300], axis=1))
+        np.testing.assert_allclose(window.var(), np.var(self.matrix[:, 50:300], axis=1), atol=1e-10)
+
+        window = PrefixStatistics(self.series, valid=self.series > 0).window(20, 400)
+        values = self.series[20:400]
+        values = values[values > 0]
+        self.assertEqual(window.count, len(values))
+        self.assertAlmostEqual(window.mean(), np.mean(values))
+        self.assertEqual(window.min(), np.min(values))
+
+    def test_windowed_correlation(self):
+        other = self.series[:450] * 0.5 + np.linspace(0, 1, 450)
+        windowed = WindowedCorrelation(self.series, other)
+        expected = np.corrcoef(self.series[40:300], other[40:300])[0, 1]
+        self.assertAlmostEqual(windowed.correlation(40, 300), expected)
+        self.assertIsNone(windowed.correlation(10, 11))
+
+
+if __name__ == '__main__':
+    unittest.main()
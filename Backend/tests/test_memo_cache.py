@@ -0,0 +1,58 @@
+import unittest
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features.feature_context import MemoCache  # noqa: E402
+
+
+class MemoCacheTests(unittest.TestCase):
+    def test_concurrent_requests_compute_once(self):
+        cache = MemoCache()
+        calls = []
+        lock = threading.Lock()
+
+        def compute():
+            with lock:
+                calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: cache.get('stft', compute), range(16)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(len(cache), 1)
+
+    def test_nested_keys_do_not_block(self):
+        cache = MemoCache()
+
+        def mfcc():
+            return cache.get('mel', lambda: 2) * 3
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(cache.get, 'mfcc', mfcc),
+                       executor.submit(cache.get, 'mel', lambda: 2)]
+            self.assertEqual([future.result(timeout=5) for future in futures], [6, 2])
+
+    def test_failed_compute_is_retried(self):
+        cache = MemoCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            cache.get('yin', fail)
+        self.assertEqual(cache.get('yin', lambda: 1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features.pitch_profiles import (  # noqa: E402
+    PITCH_PROFILES, find_pitch_profile, apply_pitch_profile
+)
+from app.plugins.audio_feedback.features.quality import QUALITY_TIERS  # noqa: E402
+
+
+class PitchProfileTests(unittest.TestCase):
+    def test_find_profile(self):
+        self.assertEqual(find_pitch_profile('Violine').name, 'violine')
+        self.assertEqual(find_pitch_profile(' Geige ').name, 'violine')
+        self.assertEqual(find_pitch_profile('Alt-Saxophon').name, 'saxophon')
+        self.assertEqual(find_pitch_profile('Blockflöte').name, 'blockfloete')
+        self.assertIsNone(find_pitch_profile('Klavier'))
+        self.assertIsNone(find_pitch_profile('keine Angabe'))
+        self.assertIsNone(find_pitch_profile(None))
+
+    def test_apply_profile_keeps_hop(self):
+        balanced = QUALITY_TIERS['balanced']
+        self.assertIs(apply_pitch_profile(balanced, None, 22050), balanced)
+
+        violin = apply_pitch_profile(balanced, PITCH_PROFILES['violine'], 22050)
+        self.assertEqual(violin.yin_params()[2:], (1024, 512))
+        self.assertAlmostEqual(violin.yin_fmin, 196.0, places=0)
+        self.assertEqual(violin.hop_length, balanced.hop_length)
+
+    def test_frame_fits_lowest_period(self):
+        fast = QUALITY_TIERS['fast']
+        bass = apply_pitch_profile(fast, PITCH_PROFILES['kontrabass'], 16000)
+        frame_length = bass.yin_params()[2]
+        self.assertLessEqual(frame_length, fast.yin_frame_length)
+        self.assertLess(16000 / bass.yin_fmin, frame_length - frame_length // 2 - 1)
+
+        flute = apply_pitch_profile(fast, PITCH_PROFILES['floete'], 16000)
+        self.assertLess(flute.yin_fmax, 8000)
+        self.assertEqual(flute.yin_params()[3], fast.yin_hop)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.plugins.audio_feedback.features.quality import (  # noqa: E402
+    QUALITY_TIERS, resolve_quality
+)
+from app.plugins.audio_feedback.features.signal_pyramid import pyramid_factor  # noqa: E402
+
+
+class QualityTierTests(unittest.TestCase):
+    def test_default_is_balanced(self):
+        quality = resolve_quality()
+        self.assertEqual(quality, QUALITY_TIERS['balanced'])
+        self.assertEqual(quality.frame_params(), (2048, 512))
+        self.assertEqual(quality.yin_params()[2:], (2048, 512))
+
+    def test_overrides_and_note_names(self):
+        quality = resolve_quality('FAST', {'fast': {'hop_length': 256, 'yin_fmax': 'A4'}})
+        self.assertEqual(quality.name, 'fast')
+        self.assertEqual(quality.hop_length, 256)
+        self.assertAlmostEqual(quality.yin_fmax, 440.0, places=3)
+        self.assertEqual(quality.chroma, 'stft')
+        self.assertNotEqual(quality.cache_token, QUALITY_TIERS['fast'].cache_token)
+
+    def test_explicit_frame_length_keeps_librosa_hop(self):
+        quality = QUALITY_TIERS['fast']
+        self.assertEqual(quality.yin_params()[2:], (1024, 512))
+        self.assertEqual(quality.yin_params(frame_length=2048)[2:], (2048, 512))
+        self.assertEqual(quality.frame_params(1024, None), (1024, 512))
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            resolve_quality('ultra')
+        with self.assertRaises(ValueError):
+            resolve_quality('fast', {'fast': {'hop': 256}})
+        with self.assertRaises(ValueError):
+            resolve_quality('fast', {'fast': {'chroma': 'cens'}})
+
+    def test_pyramid_factor(self):
+        balanced = QUALITY_TIERS['balanced']
+        self.assertEqual(pyramid_factor(balanced, 22050, 11025), 2)
+        self.assertEqual(pyramid_factor(balanced, 44100, 11025), 4)
+        self.assertEqual(pyramid_factor(balanced, 22050, None), 1)
+        self.assertEqual(pyramid_factor(QUALITY_TIERS['fast'], 16000, 11025), 1)
+        self.assertEqual(pyramid_factor(QUALITY_TIERS['accurate'], 22050, 11025), 1)
+        # YIN-Bereich über der Nyquist-Frequenz der Stufe -> keine Dezimation
+        wide = resolve_quality('balanced', {'balanced': {'yin_fmax': 'A8'}})
+        self.assertEqual(pyramid_factor(wide, 22050, 11025), 1)
+
+    def test_decimated_keeps_time_grid(self):
+        balanced = QUALITY_TIERS['balanced']
+        level = balanced.decimated(2, 22050)
+        self.assertEqual(level.frame_params(), (1024, 256))
+        self.assertEqual(level.yin_params()[2:], (1024, 256))
+        self.assertEqual(level.hop_length / 11025, balanced.hop_length / 22050)
+        self.assertIs(balanced.decimated(1, 22050), balanced)
+
+
+if __name__ == '__main__':
+    unittest.main()
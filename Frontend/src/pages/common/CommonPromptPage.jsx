@@ -8,6 +8,9 @@ export default function PromptPage({ onBack, toolType = 'audio' }) {
   const [formData, setFormData] = useState(null);
   const [uploadData, setUploadData] = useState(null);
   const [showPromptModal, setShowPromptModal] = useState(false);
+  const [progress, setProgress] = useState(null);
+  const [liveSections, setLiveSections] = useState({});
+  const [analysisWindow, setAnalysisWindow] = useState(null);
 
   useEffect(() => {
     // Load all data and start generation automatically
@@ -59,6 +62,8 @@ export default function PromptPage({ onBack, toolType = 'audio' }) {
       console.error('Feedback generation error:', error);
     } finally {
       setIsGenerating(false);
+      setProgress(null);
+      setLiveSections({});
     }
   };
 
@@ -87,11 +92,28 @@ export default function PromptPage({ onBack, toolType = 'audio' }) {
       body: JSON.stringify({ ...requestData, ...(sessionId ? { sessionId } : {}) }),
     });
 
-    const result = await response.json();
+    const submitted = await response.json();
 
-    if (response.ok && result.success) {
+    if (!response.ok || !submitted.success) {
+      setError(submitted.error || 'Fehler bei der Feedback-Generierung');
+      return;
+    }
+
+    // Analyse läuft als Job im Backend - Segmente live per SSE empfangen
+    // (Fallback: Status abfragen, falls der Stream nicht verfügbar ist)
+    const jobSessionId = sessionId || submitted.sessionId;
+    let result;
+    try {
+      result = await streamAnalysisJob(submitted.jobId, jobSessionId);
+    } catch (streamError) {
+      console.warn('SSE nicht verfügbar, wechsle auf Polling:', streamError);
+      result = await pollAnalysisJob(submitted.jobId, jobSessionId);
+    }
+
+    if (result.success) {
       setGeneratedPrompt(result.system_prompt);
       setAnalysisData(result.analysis_data);
+      setAnalysisWindow(result.truncated ? result.analysis_window : null);
       if (result.sessionId) {
         localStorage.setItem('sessionId', result.sessionId);
       }
@@ -100,6 +122,74 @@ export default function PromptPage({ onBack, toolType = 'audio' }) {
     }
   };
 
+  const streamAnalysisJob = (jobId, sessionId) => new Promise((resolve, reject) => {
+    if (typeof EventSource === 'undefined') {
+      reject(new Error('EventSource nicht unterstützt'));
+      return;
+    }
+
+    const params = new URLSearchParams({ sessionId: sessionId || '' });
+    const source = new EventSource(`/api/tools/audio-feedback/jobs/${jobId}/events?${params}`);
+    let finished = false;
+
+    const finish = (value) => {
+      finished = true;
+      source.close();
+      resolve(value);
+    };
+
+    source.addEventListener('progress', (event) => {
+      setProgress(JSON.parse(event.data));
+    });
+    source.addEventListener('segment', (event) => {
+      const data = JSON.parse(event.data);
+      setLiveSections(prev => ({ ...prev, [data.segment]: data.report_section }));
+    });
+    source.addEventListener('completed', (event) => {
+      const data = JSON.parse(event.data);
+      finish({ success: true, ...data.result });
+    });
+    source.addEventListener('failed', (event) => {
+      const data = JSON.parse(event.data);
+      finish({ success: false, error: data.error || 'Fehler bei der Feedback-Generierung' });
+    });
+    source.addEventListener('cancelled', () => {
+      finish({ success: false, error: 'Die Analyse wurde abgebrochen' });
+    });
+    source.onerror = () => {
+      // EventSource verbindet sich selbst neu; erst bei endgültigem Abbruch auf Polling wechseln
+      if (!finished && source.readyState === EventSource.CLOSED) {
+        reject(new Error('SSE-Verbindung fehlgeschlagen'));
+      }
+    };
+  });
+
+  const pollAnalysisJob = async (jobId, sessionId) => {
+    const pollInterval = 1000;
+
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, pollInterval));
+
+      const response = await fetch(`/api/tools/audio-feedback/jobs/${jobId}`, {
+        headers: sessionId ? { 'X-Session-ID': sessionId } : {}
+      });
+      const job = await response.json();
+
+      if (!response.ok || !job.success) {
+        return { success: false, error: job.error || 'Analyse-Job nicht gefunden' };
+      }
+
+      setProgress(job.progress);
+
+      if (job.status === 'completed') {
+        return { success: true, ...job.result };
+      }
+      if (job.status === 'failed' || job.status === 'cancelled') {
+        return { success: false, error: job.error || 'Die Analyse wurde abgebrochen' };
+      }
+    }
+  };
+
   const generateMidiFeedback = async (formData, uploadData) => {
     const requestData = {
       referenzFile: uploadData.file_map?.referenz,
@@ -407,6 +497,27 @@ export default function PromptPage({ onBack, toolType = 'audio' }) {
               <p style={{ color: 'var(--font-color)', margin: '0', opacity: 0.8 }}>
                 Deine Musik wird analysiert, um einen persönlichen Feedback-Prompt für eine KI zu erstellen.
               </p>
+              {progress && progress.total > 0 && (
+                <p style={{ color: 'var(--font-color)', margin: '10px 0 0 0', opacity: 0.8 }}>
+                  Segment {progress.done} von {progress.total} analysiert
+                </p>
+              )}
+              {Object.keys(liveSections).length > 0 && (
+                <pre style={{
+                  color: 'var(--font-color)',
+                  textAlign: 'left',
+                  whiteSpace: 'pre-wrap',
+                  maxHeight: '300px',
+                  overflowY: 'auto',
+                  marginTop: '20px',
+                  opacity: 0.8
+                }}>
+                  {Object.keys(liveSections)
+                    .sort((a, b) => Number(a) - Number(b))
+                    .map(segment => liveSections[segment])
+                    .join('\n')}
+                </pre>
+              )}
             </div>
           ) : error ? (
             <div style={{ 
@@ -444,6 +555,12 @@ export default function PromptPage({ onBack, toolType = 'audio' }) {
                 <h3 style={{ color: 'var(--font-color)', margin: '0 0 15px 0', fontSize: '20px' }}>
                   🎉 Dein personalisiertes Feedback ist vorbereitet!
                 </h3>
+                {analysisWindow && (
+                  <p style={{ color: 'var(--font-color)', margin: '0', opacity: 0.8 }}>
+                    ✂️ Lange Aufnahmen wurden gekürzt: analysiert wurden jeweils höchstens{' '}
+                    {analysisWindow.referenz.max_duration_sec} Sekunden.
+                  </p>
+                )}
               </div>
 
               {/* Action Buttons nebeneinander */}